@@ -0,0 +1,321 @@
+# backend/benchmarks/bench_routes.py
+"""Route-level benchmarks for the FastAPI app.
+
+Drives main.app in-process through an ASGI client, against the in-memory
+storage backend and a stubbed SMTP server, and reports latency percentiles,
+throughput and allocations for every route.
+
+Run from the backend folder:
+
+    python -m benchmarks.bench_routes --dataset 10000 --concurrency 32
+    python -m benchmarks.bench_routes --output results.json --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_routes --baseline benchmarks/baseline.json
+
+The command exits with status 1 when a route regresses past --tolerance
+against the baseline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import smtplib
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List
+
+# Configure the app for local benchmarking before anything imports it
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("NOTIFICATION_EMAIL", "bench@example.com")
+os.environ.setdefault("EMAIL_PASSWORD", "bench")
+
+import httpx
+
+
+class StubSMTP:
+    """Accepts every message without touching the network"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def send_message(self, msg):
+        pass
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+POSITIONS = ["President", "Vice President", "Secretary", "Treasurer", "Sports Officer"]
+FACULTIES = ["Science", "Engineering", "Business", "Humanities", "Education"]
+PARTIES = [("bdp", "Botswana Democratic Party"), ("udc", "Umbrella for Democratic Change"), ("ind", "Independent")]
+STATUSES = ["pending", "pending", "approved", "rejected"]
+
+
+def application_payload(index: int) -> Dict:
+    party, party_name = PARTIES[index % len(PARTIES)]
+    return {
+        'studentId': f"bench{index:06d}",
+        'studentName': f"Student {index}",
+        'email': f"bench{index:06d}@example.com",
+        'position': POSITIONS[index % len(POSITIONS)],
+        'party': party,
+        'partyName': party_name,
+        'manifesto': "I will improve student welfare and campus life. " * 20,
+        'qualifications': "Class representative, debate club chair. " * 5,
+        'achievements': "Dean's list, community volunteer. " * 5,
+        'campaignPromise': "A student voice in every decision.",
+        'yearOfStudy': str(1 + index % 4),
+        'faculty': FACULTIES[index % len(FACULTIES)],
+    }
+
+
+def seed(db, size: int) -> Dict[str, List[str]]:
+    """Fill the store with `size` applications, their users and notifications"""
+    now = datetime.now(timezone.utc)
+    ids = {'applications': [], 'pending': [], 'notifications': []}
+    batch = db.batch()
+    staged = 0
+
+    def stage(collection, doc_id, data):
+        nonlocal batch, staged
+        batch.set(db.collection(collection).document(doc_id), data)
+        staged += 1
+        if staged >= 450:
+            batch.commit()
+            batch = db.batch()
+            staged = 0
+
+    for index in range(size):
+        payload = application_payload(index)
+        application_id = f"app{index:06d}"
+        created_at = now - timedelta(seconds=size - index)
+        status = STATUSES[index % len(STATUSES)]
+        stage('users', payload['studentId'], {'studentId': payload['studentId'], 'role': 'student'})
+        stage('candidate_applications', application_id, {
+            'id': application_id,
+            'student_id': payload['studentId'],
+            'student_name': payload['studentName'],
+            'email': payload['email'],
+            'position': payload['position'],
+            'party': payload['party'],
+            'party_name': payload['partyName'],
+            'manifesto': payload['manifesto'],
+            'qualifications': payload['qualifications'],
+            'achievements': payload['achievements'],
+            'campaign_promise': payload['campaignPromise'],
+            'status': status,
+            'year_of_study': payload['yearOfStudy'],
+            'faculty': payload['faculty'],
+            'reviewed_at': None,
+            'reviewed_by': None,
+            'rejection_reason': None,
+            'created_at': created_at,
+            'updated_at': created_at,
+        })
+        notification_id = f"notif{index:06d}"
+        stage('notifications', notification_id, {
+            'id': notification_id,
+            'user_id': payload['studentId'],
+            'user_type': 'student',
+            'title': 'Application Submitted',
+            'message': f"Your application for {payload['position']} has been received and is under review.",
+            'type': 'application_submitted',
+            'related_application_id': application_id,
+            'created_at': created_at,
+            'is_read': False,
+        })
+        ids['applications'].append(application_id)
+        ids['notifications'].append(notification_id)
+        if status == 'pending':
+            ids['pending'].append(application_id)
+
+    batch.commit()
+    return ids
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def measure(name: str, make_request: Callable[[int], Awaitable[httpx.Response]],
+                  requests: int, concurrency: int, alloc_samples: int) -> Dict:
+    """Time `requests` calls at the given concurrency, then sample allocations sequentially"""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await make_request(index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*[one(next(counter)) for _ in range(requests)])
+    wall = time.perf_counter() - wall_started
+
+    # Allocation pass runs separately so tracing does not skew latency numbers
+    allocated = []
+    tracemalloc.start()
+    try:
+        for index in range(requests, requests + alloc_samples):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await make_request(index)
+            _, peak = tracemalloc.get_traced_memory()
+            allocated.append(peak - before)
+    finally:
+        tracemalloc.stop()
+
+    result = {
+        'requests': requests,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+        'throughput_rps': round(requests / wall, 1),
+        'peak_alloc_kb': round(statistics.mean(allocated) / 1024, 1) if allocated else None,
+    }
+    print(f"{name:<28} p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+          f"p99 {result['p99_ms']:>8.2f}ms  {result['throughput_rps']:>8.1f} req/s  "
+          f"{result['peak_alloc_kb'] or 0:>8.1f} KiB  errors {errors}")
+    return result
+
+
+async def run(args) -> Dict:
+    import main
+    from firebase.firestore import get_db
+    from utils.lifespan import lifespan
+
+    smtplib.SMTP = StubSMTP
+    db = get_db()
+    seed_started = time.perf_counter()
+    ids = seed(db, args.dataset)
+    print(f"Seeded {args.dataset} applications in {time.perf_counter() - seed_started:.1f}s")
+
+    rng = random.Random(args.seed)
+    requests = args.requests
+    samples = args.alloc_samples
+    # Targets for routes that change state are drawn without reuse
+    needed = requests + samples
+    pending = rng.sample(ids['pending'], min(len(ids['pending']), 2 * needed))
+    approve_targets, reject_targets = pending[:needed], pending[needed:]
+    read_targets = rng.sample(ids['notifications'], min(len(ids['notifications']), 2 * needed))
+    mark_targets, delete_targets = read_targets[:needed], read_targets[needed:]
+
+    def pick(targets: List[str], index: int) -> str:
+        return targets[index % len(targets)]
+
+    results = {}
+    async with lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            scenarios = [
+                ("list_applications", lambda i: client.get("/api/candidate-applications", params={'limit': args.page_size})),
+                ("list_applications_status", lambda i: client.get("/api/candidate-applications", params={'status': 'pending', 'limit': args.page_size})),
+                ("list_applications_summary", lambda i: client.get("/api/candidate-applications", params={'view': 'summary', 'limit': args.page_size})),
+                ("search_applications", lambda i: client.get("/api/candidate-applications/search", params={'q': 'campus welf', 'faculty': rng.choice(FACULTIES), 'limit': args.page_size})),
+                ("application_stats", lambda i: client.get("/api/candidate-applications/stats")),
+                ("get_application", lambda i: client.get(f"/api/candidate-applications/{rng.choice(ids['applications'])}")),
+                ("get_notifications", lambda i: client.get(f"/api/notifications/bench{rng.randrange(args.dataset):06d}", params={'user_type': 'student'})),
+                ("unread_count", lambda i: client.get(f"/api/notifications/bench{rng.randrange(args.dataset):06d}/unread-count", params={'user_type': 'student'})),
+                ("submit_application", lambda i: client.post("/api/candidate-applications", json=application_payload(args.dataset + i))),
+                ("update_approve", lambda i: client.put(f"/api/candidate-applications/{pick(approve_targets, i)}", json={'status': 'approved', 'reviewed_by': 'bench'})),
+                ("update_reject", lambda i: client.put(f"/api/candidate-applications/{pick(reject_targets, i)}", json={'status': 'rejected', 'reviewed_by': 'bench', 'rejection_reason': 'other'})),
+                ("mark_notification_read", lambda i: client.put(f"/api/notifications/{pick(mark_targets, i)}/read")),
+                ("delete_notification", lambda i: client.delete(f"/api/notifications/{pick(delete_targets, i)}")),
+            ]
+            if args.full_list:
+                scenarios.insert(0, ("list_applications_full", lambda i: client.get("/api/candidate-applications")))
+
+            for name, make_request in scenarios:
+                if args.only and name not in args.only:
+                    continue
+                results[name] = await measure(name, make_request, requests, args.concurrency, samples)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'dataset': args.dataset,
+            'requests': requests,
+            'concurrency': args.concurrency,
+            'page_size': args.page_size,
+            'storage_latency_ms': float(os.getenv("STORAGE_LATENCY_MS", 0)),
+            'application_cache_ttl': float(os.getenv("APPLICATION_CACHE_TTL", 30)),
+        },
+        'results': results,
+    }
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> bool:
+    """Print p95 and throughput against the baseline; return True when anything regressed"""
+    regressed = False
+    print(f"\n{'route':<28} {'p95 base':>10} {'p95 now':>10} {'rps base':>10} {'rps now':>10}")
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            print(f"{name:<28} {'-':>10} {current['p95_ms']:>10.2f} {'-':>10} {current['throughput_rps']:>10.1f}  (new)")
+            continue
+        slower = current['p95_ms'] > previous['p95_ms'] * (1 + tolerance)
+        fewer = current['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance)
+        flag = "  REGRESSION" if slower or fewer else ""
+        regressed = regressed or slower or fewer
+        print(f"{name:<28} {previous['p95_ms']:>10.2f} {current['p95_ms']:>10.2f} "
+              f"{previous['throughput_rps']:>10.1f} {current['throughput_rps']:>10.1f}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the voting API routes in-process")
+    parser.add_argument("--dataset", type=int, default=1000, help="applications to seed (1k-100k)")
+    parser.add_argument("--requests", type=int, default=500, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--page-size", type=int, default=50, help="limit used by the list routes")
+    parser.add_argument("--full-list", action="store_true", help="also benchmark the unpaginated list")
+    parser.add_argument("--alloc-samples", type=int, default=20, help="requests traced for allocations")
+    parser.add_argument("--only", nargs="*", help="route names to run")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="compare against a previous JSON result")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline path")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# backend/benchmarks/bench_serialization.py
+"""Serialization benchmarks for the list endpoints.
+
+Compares, per document, the previous list pipeline (hand-written timestamp
+conversion, a response model per document, FastAPI's response_model
+validation and json encoding) with utils.serialization (document_to_dict
+and a single encode), and reports the gzip size of the encoded body.
+
+Run from the backend folder:
+
+    python -m benchmarks.bench_serialization --documents 5000
+"""
+import argparse
+import gzip
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from models.schemas import ApplicationResponse, NotificationResponse
+from utils.serialization import document_to_dict, dumps, orjson
+
+APPLICATION_FIELDS = tuple(ApplicationResponse.model_fields)
+NOTIFICATION_FIELDS = tuple(NotificationResponse.model_fields)
+
+
+class Snapshot:
+    """Just enough of a Firestore snapshot for the serializers"""
+
+    def __init__(self, doc_id: str, data: Dict):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self) -> Dict:
+        return dict(self._data)
+
+
+def make_applications(count: int) -> List[Snapshot]:
+    now = datetime.now(timezone.utc)
+    return [
+        Snapshot(f"app{i}", {
+            'id': f"app{i}",
+            'student_id': f"s{i}",
+            'student_name': f"Student {i}",
+            'email': f"s{i}@example.com",
+            'position': "President",
+            'party': "party",
+            'party_name': "Party",
+            'status': "pending",
+            'manifesto': "m" * 1500,
+            'qualifications': "q" * 400,
+            'achievements': "a" * 400,
+            'campaign_promise': "c" * 200,
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now - timedelta(minutes=i),
+            'reviewed_at': None,
+            'reviewed_by': None,
+            'rejection_reason': None,
+            'year_of_study': "3",
+            'faculty': "Science",
+        })
+        for i in range(count)
+    ]
+
+
+def make_notifications(count: int) -> List[Snapshot]:
+    now = datetime.now(timezone.utc)
+    return [
+        Snapshot(f"n{i}", {
+            'user_id': "admin",
+            'user_type': "admin",
+            'title': "New Candidate Application",
+            'message': f"Student {i} has applied for President as Party.",
+            'type': "application_submitted",
+            'related_application_id': f"app{i}",
+            'is_read': bool(i % 2),
+            'created_at': now - timedelta(minutes=i),
+        })
+        for i in range(count)
+    ]
+
+
+def legacy_pipeline(model, timestamp_fields):
+    """The per-document model path the list routes used before"""
+    adapter = TypeAdapter(List[model])
+
+    def encode(docs: List[Snapshot]) -> bytes:
+        items = []
+        for doc in docs:
+            data = doc.to_dict()
+            data['id'] = doc.id
+            for field in timestamp_fields:
+                if data.get(field):
+                    data[field] = data[field].replace(tzinfo=None)
+            items.append(model(**data))
+        # response_model: dump, validate again, then serialize for JSON
+        validated = adapter.validate_python([jsonable_encoder(item) for item in items])
+        content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    return encode
+
+
+def fast_pipeline(fields):
+    def encode(docs: List[Snapshot]) -> bytes:
+        return dumps([document_to_dict(doc, fields) for doc in docs])
+
+    return encode
+
+
+def measure(encode: Callable[[List[Snapshot]], bytes], docs: List[Snapshot], repeat: int) -> Dict:
+    encode(docs)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = encode(docs)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        'best_ms': round(best * 1000, 3),
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'us_per_doc': round(best / len(docs) * 1e6, 3),
+        'bytes': len(body),
+        'gzip_bytes': len(gzip.compress(body, compresslevel=5)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list serialization")
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    cases = {
+        'applications': (
+            make_applications(args.documents),
+            legacy_pipeline(ApplicationResponse, ('created_at', 'updated_at', 'reviewed_at')),
+            fast_pipeline(APPLICATION_FIELDS),
+        ),
+        'notifications': (
+            make_notifications(args.documents),
+            legacy_pipeline(NotificationResponse, ('created_at',)),
+            fast_pipeline(NOTIFICATION_FIELDS),
+        ),
+    }
+
+    results = {'documents': args.documents, 'encoder': 'orjson' if orjson else 'json', 'cases': {}}
+    for name, (docs, legacy, fast) in cases.items():
+        before = measure(legacy, docs, args.repeat)
+        after = measure(fast, docs, args.repeat)
+        results['cases'][name] = {
+            'legacy': before,
+            'fast': after,
+            'speedup': round(before['best_ms'] / after['best_ms'], 2) if after['best_ms'] else None,
+        }
+        print(f"{name:14} legacy {before['us_per_doc']:8.2f} us/doc  "
+              f"fast {after['us_per_doc']:8.2f} us/doc  "
+              f"x{results['cases'][name]['speedup']}  "
+              f"{after['bytes']} bytes, {after['gzip_bytes']} gzipped")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
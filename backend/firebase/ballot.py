@@ -0,0 +1,111 @@
+# backend/firebase/ballot.py
+import re
+from typing import Dict, List, Optional
+
+from firebase_admin import firestore
+
+from firebase.markers import BuildMarkers
+
+BALLOT_COLLECTION = 'ballots'
+
+# Application fields copied onto the ballot for each approved candidate
+CANDIDATE_FIELDS = (
+    'student_id', 'student_name', 'party', 'party_name', 'faculty', 'year_of_study', 'campaign_promise'
+)
+
+_UNSAFE = re.compile(r"[^a-z0-9]+")
+
+
+def position_key(position: str) -> str:
+    """Document id of a position's ballot ("Vice President" -> "vice-president")"""
+    return _UNSAFE.sub('-', str(position).strip().lower()).strip('-') or 'unknown'
+
+
+def _candidate(application: Dict) -> Dict:
+    return {field: application.get(field) for field in CANDIDATE_FIELDS}
+
+
+class BallotRoster:
+    """Approved candidates per position, kept ready for the ballot.
+
+    Each position has one document:
+
+        {'position': 'President', 'version': n,
+         'candidates': {application_id: {student_name, party_name, ...}}}
+
+    An approval adds the candidate in the same batch as the decision, and a
+    decision that moves an application out of approved removes it again, so
+    a ballot is one document read instead of a query over users. `version`
+    grows with every change and is what clients and caches compare.
+
+    Approvals made before the roster existed are picked up by the first
+    rebuild, which writes a build marker; until the marker exists, reads
+    rebuild rather than trust documents that later approvals created.
+    """
+
+    def __init__(self, db, markers: BuildMarkers):
+        self.db = db
+        self.markers = markers
+
+    def ballot_ref(self, position: str):
+        return self.db.collection(BALLOT_COLLECTION).document(position_key(position))
+
+    def stage_change(self, writer, application_id: str, application: Dict,
+                     old_status: Optional[str], new_status: Optional[str]) -> bool:
+        """Stage the roster change on a WriteBatch or Transaction; False when the ballot is unaffected"""
+        if (old_status == 'approved') == (new_status == 'approved'):
+            return False
+
+        entry = _candidate(application) if new_status == 'approved' else firestore.DELETE_FIELD
+        writer.set(self.ballot_ref(application.get('position')), {
+            'position': application.get('position'),
+            'candidates': {application_id: entry},
+            'version': firestore.Increment(1),
+            'updated_at': firestore.SERVER_TIMESTAMP
+        }, merge=True)
+        return True
+
+    def read(self, position: Optional[str] = None) -> List[Dict]:
+        """Ballot documents, one per position (or just the given one); backfilled the first time"""
+        if not self.is_built():
+            ballots = self.rebuild()
+            if position is None:
+                return ballots
+            return [ballot for ballot in ballots if position_key(ballot['position']) == position_key(position)]
+
+        if position is not None:
+            doc = self.ballot_ref(position).get()
+            return [doc.to_dict()] if doc.exists else []
+        return [doc.to_dict() for doc in self.db.collection(BALLOT_COLLECTION).stream()]
+
+    def is_built(self) -> bool:
+        return self.markers.is_built(BALLOT_COLLECTION)
+
+    def rebuild(self) -> List[Dict]:
+        """Rewrite every ballot from the approved applications"""
+        rosters: Dict[str, Dict] = {}
+        query = self.db.collection('candidate_applications') \
+            .where('status', '==', 'approved') \
+            .select(['position', *CANDIDATE_FIELDS])
+        for doc in query.stream():
+            application = doc.to_dict() or {}
+            ballot = rosters.setdefault(position_key(application.get('position')), {
+                'position': application.get('position'),
+                'candidates': {}
+            })
+            ballot['candidates'][doc.id] = _candidate(application)
+
+        versions = {doc.id: (doc.to_dict() or {}).get('version', 0)
+                    for doc in self.db.collection(BALLOT_COLLECTION).select(['version']).stream()}
+        batch = self.db.batch()
+        for key, ballot in rosters.items():
+            # Versions keep growing across rebuilds so clients never see one repeat
+            batch.set(self.db.collection(BALLOT_COLLECTION).document(key), {
+                **ballot, 'version': versions.get(key, 0) + 1, 'updated_at': firestore.SERVER_TIMESTAMP
+            })
+        for key in versions.keys() - rosters.keys():
+            batch.delete(self.db.collection(BALLOT_COLLECTION).document(key))
+        batch.commit()
+        if not self.is_built():
+            self.markers.mark_built(BALLOT_COLLECTION)
+        return [doc.to_dict() for doc in self.db.collection(BALLOT_COLLECTION).stream()]
@@ -0,0 +1,389 @@
+# backend/firebase/broadcast.py
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Set
+
+from firebase_admin import firestore
+
+from firebase.ballot import BALLOT_COLLECTION
+from firebase.counters import NotificationCounters
+from firebase.executor import firestore_executor
+from firebase.transactions import run_transaction
+from utils.metrics import firestore_timer, metrics
+from utils.notification_hub import notification_hub
+
+logger = logging.getLogger(__name__)
+
+BROADCASTS_COLLECTION = 'broadcasts'
+
+# Who a broadcast can be addressed to
+AUDIENCES = ('all_students', 'faculty', 'candidates')
+
+# Recipients per batch: a notification and a counter write each, plus the chunk marker
+CHUNK_SIZE = min(int(os.getenv("BROADCAST_CHUNK_SIZE", 249)), 249)
+
+# Chunk commits in flight at once per broadcast
+CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", 8))
+
+# Finished broadcasts whose live progress is kept for /health
+RECENT_PROGRESS = 10
+
+# Seconds between a sender's liveness marks; a sender silent for three is presumed gone
+HEARTBEAT_INTERVAL = float(os.getenv("BROADCAST_HEARTBEAT_INTERVAL", 10))
+
+BROADCAST_NOTIFICATIONS = metrics.counter(
+    "broadcast_notifications_total", "Notifications written by broadcasts"
+)
+
+
+class BroadcastOwned(Exception):
+    """Another live worker is sending the broadcast"""
+
+
+def _worker_id() -> str:
+    # Computed on use, so a forked worker gets its own
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class BroadcastFanout:
+    """Writes one announcement to every recipient of an audience.
+
+    Recipients are resolved once and stored as a plan of chunks under
+    broadcasts/{id}/chunks. Each chunk is one batched write holding its
+    notifications, the recipients' unread counter increments and the
+    chunk's `done` flag, so a chunk lands completely or not at all.
+    Chunks are committed in parallel, CONCURRENCY at a time. After a crash
+    or restart, resume() commits only the chunks that are not done yet.
+
+    Each chunk commits in a transaction that first checks its `done`
+    flag, so even two senders racing over the same chunk notify (and
+    count) each recipient once. To keep a second sender from starting at
+    all, the broadcast records its owning worker, refreshed every
+    HEARTBEAT_INTERVAL; resume() claims it only when it was interrupted or
+    its owner has gone quiet.
+    """
+
+    def __init__(self, db_getter: Callable, counters_getter: Callable[[], NotificationCounters]):
+        self._db = db_getter
+        self._counters = counters_getter
+        self._running: Dict[str, asyncio.Task] = {}
+        self._progress: Dict[str, Dict] = {}
+
+    @property
+    def db(self):
+        return self._db()
+
+    def broadcast_ref(self, broadcast_id: str):
+        return self.db.collection(BROADCASTS_COLLECTION).document(broadcast_id)
+
+    # Audience resolution
+
+    def resolve(self, audience: str, faculty: Optional[str] = None) -> List[str]:
+        """Student ids the audience covers, sorted so chunk plans are stable"""
+        users = self.db.collection('users')
+        recipients: Set[str] = set()
+        if audience == 'all_students':
+            for doc in users.where('role', '==', 'student').select(['studentId']).stream():
+                recipients.add((doc.to_dict() or {}).get('studentId'))
+        elif audience == 'faculty':
+            # Student profiles rarely carry a faculty, so applicants of the faculty are included too
+            for doc in users.where('faculty', '==', faculty).select(['studentId']).stream():
+                recipients.add((doc.to_dict() or {}).get('studentId'))
+            query = self.db.collection('candidate_applications') \
+                .where('faculty', '==', faculty) \
+                .select(['student_id'])
+            for doc in query.stream():
+                recipients.add((doc.to_dict() or {}).get('student_id'))
+        elif audience == 'candidates':
+            for doc in self.db.collection(BALLOT_COLLECTION).stream():
+                for candidate in ((doc.to_dict() or {}).get('candidates') or {}).values():
+                    recipients.add(candidate.get('student_id'))
+        else:
+            raise ValueError(f"Unknown audience: {audience}")
+        recipients.discard(None)
+        recipients.discard('')
+        return sorted(recipients)
+
+    # Planning and sending
+
+    def _plan(self, broadcast_id: str, announcement: Dict, recipients: List[str]) -> int:
+        """Store the broadcast and its chunk plan; returns the number of chunks"""
+        chunks = [recipients[i:i + CHUNK_SIZE] for i in range(0, len(recipients), CHUNK_SIZE)]
+        ref = self.broadcast_ref(broadcast_id)
+        batch = self.db.batch()
+        writes = 1
+        batch.set(ref, {
+            **announcement,
+            'id': broadcast_id,
+            'status': 'sending',
+            'owner': _worker_id(),
+            'heartbeat_at': firestore.SERVER_TIMESTAMP,
+            'recipients': len(recipients),
+            'chunks': len(chunks),
+            'created_at': firestore.SERVER_TIMESTAMP,
+            'completed_at': None,
+        })
+        for index, chunk in enumerate(chunks):
+            if writes == 500:
+                batch.commit()
+                batch = self.db.batch()
+                writes = 0
+            batch.set(ref.collection('chunks').document(f"{index:06d}"), {
+                'index': index,
+                'start': index * CHUNK_SIZE,
+                'size': len(chunk),
+                'recipients': chunk,
+                'done': False,
+            })
+            writes += 1
+        batch.commit()
+        return len(chunks)
+
+    def _pending_chunks(self, broadcast_id: str) -> List[Dict]:
+        query = self.broadcast_ref(broadcast_id).collection('chunks').where('done', '==', False)
+        return sorted((doc.to_dict() for doc in query.stream()), key=lambda chunk: chunk['index'])
+
+    def _commit_chunk(self, broadcast_id: str, announcement: Dict, chunk: Dict) -> List[Dict]:
+        """Write a chunk's notifications unless it is done already; returns what was written"""
+        chunk_ref = self.broadcast_ref(broadcast_id).collection('chunks').document(f"{chunk['index']:06d}")
+        return run_transaction(self.db, lambda transaction: self._stage_chunk(
+            transaction, chunk_ref, broadcast_id, announcement, chunk
+        ))
+
+    def _stage_chunk(self, transaction, chunk_ref, broadcast_id: str, announcement: Dict, chunk: Dict) -> List[Dict]:
+        if (chunk_ref.get(transaction=transaction).to_dict() or {}).get('done'):
+            # Another sender committed it first
+            return []
+
+        notifications = []
+        for offset, recipient in enumerate(chunk['recipients']):
+            notification_id = f"{broadcast_id}-{chunk['start'] + offset:06d}"
+            notification = {
+                'id': notification_id,
+                'user_id': recipient,
+                'user_type': 'student',
+                'title': announcement['title'],
+                'message': announcement['message'],
+                'type': announcement['type'],
+                'related_application_id': None,
+                'broadcast_id': broadcast_id,
+                'is_read': False,
+                'created_at': firestore.SERVER_TIMESTAMP,
+            }
+            transaction.set(self.db.collection('notifications').document(notification_id), notification)
+            self._counters().stage_delta(transaction, recipient, 'student', 1)
+            notifications.append(notification)
+        transaction.update(chunk_ref, {
+            'done': True,
+            'committed_at': firestore.SERVER_TIMESTAMP,
+        })
+        return notifications
+
+    async def _heartbeat(self, broadcast_id: str):
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            try:
+                await firestore_executor.run(self.broadcast_ref(broadcast_id).update, {
+                    'heartbeat_at': firestore.SERVER_TIMESTAMP
+                })
+            except Exception as e:
+                logger.warning("Broadcast %s heartbeat failed: %s", broadcast_id, e)
+
+    async def _send(self, broadcast_id: str, announcement: Dict):
+        progress = self._progress[broadcast_id]
+        chunks = await firestore_executor.run(self._pending_chunks, broadcast_id)
+        progress['chunks_pending'] = len(chunks)
+        slots = asyncio.Semaphore(CONCURRENCY)
+
+        async def send_chunk(chunk: Dict):
+            async with slots:
+                with firestore_timer('notifications', 'broadcast_chunk'):
+                    notifications = await firestore_executor.run(
+                        self._commit_chunk, broadcast_id, announcement, chunk
+                    )
+            committed_at = datetime.utcnow()
+            for notification in notifications:
+                notification_hub.publish(notification['user_id'], notification['user_type'], {
+                    'event': 'created',
+                    'notification': {**notification, 'created_at': committed_at}
+                })
+            progress['sent'] += len(notifications)
+            progress['chunks_pending'] -= 1
+            BROADCAST_NOTIFICATIONS.inc(len(notifications))
+
+        started = time.perf_counter()
+        heartbeat = asyncio.create_task(self._heartbeat(broadcast_id))
+        try:
+            outcomes = await asyncio.gather(*[send_chunk(chunk) for chunk in chunks], return_exceptions=True)
+        finally:
+            heartbeat.cancel()
+        errors = [str(outcome) for outcome in outcomes if isinstance(outcome, Exception)]
+        progress['seconds'] = round(time.perf_counter() - started, 3)
+
+        if errors:
+            progress['status'] = 'interrupted'
+            progress['error'] = errors[0]
+            await firestore_executor.run(self.broadcast_ref(broadcast_id).update, {
+                'status': 'interrupted', 'owner': None, 'error': errors[0]
+            })
+            logger.warning("Broadcast %s left %d chunks unsent: %s", broadcast_id, len(errors), errors[0])
+            return
+
+        progress['status'] = 'completed'
+        await firestore_executor.run(self.broadcast_ref(broadcast_id).update, {
+            'status': 'completed', 'owner': None, 'error': None, 'completed_at': firestore.SERVER_TIMESTAMP
+        })
+        logger.info("Broadcast %s sent %d notifications in %ss", broadcast_id, progress['sent'], progress['seconds'])
+
+    def _launch(self, broadcast_id: str, announcement: Dict, recipients: int, chunks: int):
+        self._progress[broadcast_id] = {
+            'status': 'sending', 'recipients': recipients, 'chunks': chunks,
+            'chunks_pending': None, 'sent': 0, 'error': None,
+        }
+        task = asyncio.create_task(self._send(broadcast_id, announcement), name=f"broadcast-{broadcast_id}")
+        self._running[broadcast_id] = task
+        task.add_done_callback(lambda _: self._running.pop(broadcast_id, None))
+        # Keep live progress for the most recent broadcasts only
+        for finished in [key for key in self._progress if key not in self._running][:-RECENT_PROGRESS]:
+            del self._progress[finished]
+
+    async def start(self, title: str, message: str, audience: str, faculty: Optional[str] = None) -> Dict:
+        """Resolve the audience, store the plan and start sending in the background"""
+        broadcast_id = uuid.uuid4().hex[:20]
+        announcement = {
+            'title': title,
+            'message': message,
+            'type': 'announcement',
+            'audience': audience,
+            'faculty': faculty,
+        }
+        with firestore_timer('users', 'broadcast_resolve'):
+            recipients = await firestore_executor.run(self.resolve, audience, faculty)
+        chunks = await firestore_executor.run(self._plan, broadcast_id, announcement, recipients)
+        self._launch(broadcast_id, announcement, len(recipients), chunks)
+        return {'broadcast_id': broadcast_id, 'recipients': len(recipients), 'chunks': chunks}
+
+    @staticmethod
+    def _owned_elsewhere(broadcast: Dict) -> bool:
+        """True while another worker is sending the broadcast and still marking it alive"""
+        owner = broadcast.get('owner')
+        heartbeat_at = broadcast.get('heartbeat_at')
+        if broadcast.get('status') != 'sending' or not owner or owner == _worker_id() or heartbeat_at is None:
+            return False
+        if heartbeat_at.tzinfo is None:
+            heartbeat_at = heartbeat_at.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - heartbeat_at).total_seconds() < 3 * HEARTBEAT_INTERVAL
+
+    def _claim(self, broadcast_id: str) -> Optional[Dict]:
+        """Take over a broadcast for this worker; None if it does not exist"""
+        ref = self.broadcast_ref(broadcast_id)
+
+        def apply(transaction):
+            snapshot = ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return None
+            broadcast = snapshot.to_dict()
+            if broadcast.get('status') == 'completed':
+                return broadcast
+            if self._owned_elsewhere(broadcast):
+                raise BroadcastOwned(broadcast.get('owner'))
+            transaction.update(ref, {
+                'status': 'sending',
+                'owner': _worker_id(),
+                'heartbeat_at': firestore.SERVER_TIMESTAMP,
+            })
+            return broadcast
+
+        return run_transaction(self.db, apply)
+
+    async def resume(self, broadcast_id: str) -> Optional[Dict]:
+        """Send the chunks of a broadcast that are not done yet; None if it does not exist.
+
+        Raises BroadcastOwned when another live worker is sending it.
+        """
+        if broadcast_id in self._running:
+            return {'broadcast_id': broadcast_id, 'status': 'sending'}
+        broadcast = await firestore_executor.run(self._claim, broadcast_id)
+        if broadcast is None:
+            return None
+        if broadcast.get('status') == 'completed':
+            return {'broadcast_id': broadcast_id, 'status': 'completed'}
+
+        announcement = {field: broadcast.get(field) for field in ('title', 'message', 'type', 'audience', 'faculty')}
+        self._launch(broadcast_id, announcement, broadcast.get('recipients', 0), broadcast.get('chunks', 0))
+        return {'broadcast_id': broadcast_id, 'status': 'sending'}
+
+    async def resume_unfinished(self):
+        """Resume every broadcast a previous process left unfinished"""
+        query = self.db.collection(BROADCASTS_COLLECTION).where('status', 'in', ['sending', 'interrupted'])
+        docs = await firestore_executor.run(lambda: list(query.stream()))
+        for doc in docs:
+            try:
+                await self.resume(doc.id)
+                logger.info("Resuming broadcast %s", doc.id)
+            except BroadcastOwned as e:
+                logger.info("Broadcast %s is being sent by %s", doc.id, e)
+
+    def _done_chunks(self, broadcast_id: str) -> List[int]:
+        """Sizes of the chunks already committed"""
+        query = self.broadcast_ref(broadcast_id).collection('chunks') \
+            .where('done', '==', True) \
+            .select(['size'])
+        return [(doc.to_dict() or {}).get('size', 0) for doc in query.stream()]
+
+    async def status(self, broadcast_id: str) -> Optional[Dict]:
+        """Stored state of a broadcast with its progress; live figures while it runs here"""
+        doc = await firestore_executor.run(self.broadcast_ref(broadcast_id).get)
+        if not doc.exists:
+            return None
+        broadcast = doc.to_dict()
+        done = await firestore_executor.run(self._done_chunks, broadcast_id)
+
+        report = {
+            'broadcast_id': broadcast_id,
+            'title': broadcast.get('title'),
+            'audience': broadcast.get('audience'),
+            'faculty': broadcast.get('faculty'),
+            'status': broadcast.get('status'),
+            'owner': broadcast.get('owner'),
+            'recipients': broadcast.get('recipients', 0),
+            'chunks': broadcast.get('chunks', 0),
+            'chunks_done': len(done),
+            'sent': sum(done),
+            'error': broadcast.get('error'),
+            'created_at': broadcast.get('created_at'),
+            'completed_at': broadcast.get('completed_at'),
+            'running_here': broadcast_id in self._running,
+        }
+        live = self._progress.get(broadcast_id)
+        if live is not None and broadcast_id in self._running:
+            report['status'] = live['status']
+        return report
+
+    async def stop(self):
+        """Cancel broadcasts in flight; their remaining chunks resume on the next start"""
+        running = dict(self._running)
+        for task in running.values():
+            task.cancel()
+        await asyncio.gather(*running.values(), return_exceptions=True)
+        # Release them, so any worker may resume them without waiting for the heartbeat to lapse
+        for broadcast_id in running:
+            try:
+                await firestore_executor.run(self.broadcast_ref(broadcast_id).update, {
+                    'status': 'interrupted', 'owner': None
+                })
+            except Exception as e:
+                logger.warning("Releasing broadcast %s failed: %s", broadcast_id, e)
+
+    def get_stats(self) -> Dict:
+        return {
+            'running': len(self._running),
+            'chunk_size': CHUNK_SIZE,
+            'concurrency': CONCURRENCY,
+            'recent': {broadcast_id: dict(progress) for broadcast_id, progress in self._progress.items()},
+        }
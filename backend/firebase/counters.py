@@ -0,0 +1,191 @@
+# backend/firebase/counters.py
+import itertools
+import os
+import random
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from firebase_admin import firestore
+
+from firebase.markers import BuildMarkers
+from firebase.transactions import run_transaction
+
+COUNTERS_COLLECTION = 'notification_counters'
+
+# Unread notifications read per page while the first build finds their recipients
+RECIPIENT_PAGE_SIZE = 1000
+
+# Users whose counters take enough writes to need spreading over shards.
+# Every submission notifies the shared admin inbox, so it is sharded by default.
+HOT_COUNTER_SHARDS = {
+    'admin': int(os.getenv("ADMIN_COUNTER_SHARDS", 10)),
+}
+
+
+class NotificationCounters:
+    """Per-user unread notification counters.
+
+    Each (user_id, user_type) pair owns one counter document holding an
+    `unread` integer, so reading the badge count costs one document read.
+    Hot users listed in HOT_COUNTER_SHARDS keep the count split across a
+    `shards` subcollection instead, because a single Firestore document only
+    sustains about one write per second.
+
+    Increments only add to what a counter already holds, so the counters
+    are trusted once reconcile() has seeded every user from aggregation
+    queries (the leader does this at startup, once per database). Until
+    then, and for users without a counter, read() answers with an
+    aggregation query and writes nothing. Corrections are made in a
+    transaction that reads the counter and counts the notifications, so
+    an increment committed meanwhile is never overwritten.
+    """
+
+    def __init__(self, db, markers: BuildMarkers):
+        self.db = db
+        self.markers = markers
+
+    @staticmethod
+    def counter_id(user_id: str, user_type: str) -> str:
+        return f"{user_type}__{user_id}"
+
+    @staticmethod
+    def shard_count(user_id: str) -> int:
+        return HOT_COUNTER_SHARDS.get(user_id, 1)
+
+    def counter_ref(self, user_id: str, user_type: str, shard: Optional[int] = None):
+        """Reference to the document a delta should be written to"""
+        doc_ref = self.db.collection(COUNTERS_COLLECTION).document(self.counter_id(user_id, user_type))
+        shards = self.shard_count(user_id)
+        if shards == 1:
+            return doc_ref
+        if shard is None:
+            shard = random.randrange(shards)
+        return doc_ref.collection('shards').document(str(shard))
+
+    def stage_delta(self, writer, user_id: str, user_type: str, delta: int):
+        """Stage an unread-count change on a WriteBatch or Transaction"""
+        writer.set(self.counter_ref(user_id, user_type), {
+            'user_id': user_id,
+            'user_type': user_type,
+            'unread': firestore.Increment(delta),
+        }, merge=True)
+
+    def _counter_refs(self, user_id: str, user_type: str) -> List:
+        """The documents holding a user's count: the counter, or every shard of it"""
+        shards = self.shard_count(user_id)
+        if shards == 1:
+            return [self.counter_ref(user_id, user_type)]
+        return [self.counter_ref(user_id, user_type, shard) for shard in range(shards)]
+
+    def stored(self, user_id: str, user_type: str, transaction=None) -> Optional[int]:
+        """What the counter documents hold, or None when the user has none"""
+        snapshots = [snapshot for snapshot in self.db.get_all(self._counter_refs(user_id, user_type),
+                                                               transaction=transaction)
+                     if snapshot.exists]
+        if not snapshots:
+            return None
+        return sum((snapshot.to_dict() or {}).get('unread', 0) for snapshot in snapshots)
+
+    def read(self, user_id: str, user_type: str) -> int:
+        """Current unread count: one document read, or one per shard for hot users"""
+        # Increments made before the first full build started from nothing
+        total = self.stored(user_id, user_type) if self.is_built() else None
+        if total is None:
+            return self.count_unread(user_id, user_type)
+
+        # Concurrent deletes of already-counted documents can briefly undershoot
+        return max(total, 0)
+
+    def _unread_query(self, user_id: str, user_type: str):
+        return self.db.collection('notifications') \
+            .where('user_id', '==', user_id) \
+            .where('user_type', '==', user_type) \
+            .where('is_read', '==', False)
+
+    def count_unread(self, user_id: str, user_type: str, transaction=None) -> int:
+        """Authoritative count with a server-side aggregation query"""
+        results = self._unread_query(user_id, user_type).count(alias='unread').get(transaction=transaction)
+        return int(results[0][0].value) if results else 0
+
+    def rebuild(self, user_id: str, user_type: str) -> Tuple[Optional[int], int]:
+        """Set a user's counter to the aggregated unread count; returns what it held before and after"""
+        shards = self.shard_count(user_id)
+
+        def apply(transaction):
+            # Reading the counter makes a concurrent increment conflict with this transaction
+            before = self.stored(user_id, user_type, transaction=transaction)
+            count = self.count_unread(user_id, user_type, transaction=transaction)
+            if before == count:
+                return before, count
+            if shards > 1:
+                # Keep a parent document so reconciliation can find sharded counters
+                transaction.set(self.db.collection(COUNTERS_COLLECTION).document(self.counter_id(user_id, user_type)), {
+                    'user_id': user_id,
+                    'user_type': user_type,
+                    'shards': shards,
+                })
+            for shard, doc_ref in enumerate(self._counter_refs(user_id, user_type)):
+                transaction.set(doc_ref, {
+                    'user_id': user_id,
+                    'user_type': user_type,
+                    'unread': count if shard == 0 else 0,
+                })
+            return before, count
+
+        return run_transaction(self.db, apply)
+
+    def _unread_recipients(self) -> Iterator[Tuple[str, str]]:
+        """(user_id, user_type) of every unread notification, read page by page"""
+        query = self.db.collection('notifications') \
+            .where('is_read', '==', False) \
+            .order_by('__name__') \
+            .select(['user_id', 'user_type']) \
+            .limit(RECIPIENT_PAGE_SIZE)
+        page = list(query.stream())
+        while page:
+            for doc in page:
+                data = doc.to_dict() or {}
+                yield data.get('user_id'), data.get('user_type')
+            if len(page) < RECIPIENT_PAGE_SIZE:
+                return
+            page = list(query.start_after(page[-1]).stream())
+
+    def known_users(self, include_notifications: bool = False) -> Set[Tuple[str, str]]:
+        """Every (user_id, user_type) with a counter, and optionally with an unread notification.
+
+        Once the counters are built every unread notification was counted
+        when it was created, so the notifications only need scanning for
+        the first build.
+        """
+        users = set()
+        # Sharded counters may exist only as shard documents, without their parent
+        counters = itertools.chain(
+            self.db.collection(COUNTERS_COLLECTION).select(['user_id', 'user_type']).stream(),
+            self.db.collection_group('shards').select(['user_id', 'user_type']).stream(),
+        )
+        for doc in counters:
+            data = doc.to_dict() or {}
+            if 'user_id' in data and 'user_type' in data:
+                users.add((data['user_id'], data['user_type']))
+
+        if include_notifications:
+            users.update(self._unread_recipients())
+        return users
+
+    def is_built(self) -> bool:
+        return self.markers.is_built(COUNTERS_COLLECTION)
+
+    def reconcile(self) -> Dict:
+        """Rebuild every counter from aggregation queries, reporting the ones that drifted"""
+        built = self.is_built()
+        rebuilt = 0
+        drifted = []
+        for user_id, user_type in self.known_users(include_notifications=not built):
+            if not user_id or not user_type:
+                continue
+            before, after = self.rebuild(user_id, user_type)
+            rebuilt += 1
+            if (before or 0) != after:
+                drifted.append({'user_id': user_id, 'user_type': user_type, 'was': before, 'now': after})
+        if not built:
+            self.markers.mark_built(COUNTERS_COLLECTION)
+        return {'rebuilt': rebuilt, 'drifted': drifted}
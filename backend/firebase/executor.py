@@ -0,0 +1,126 @@
+# backend/firebase/executor.py
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.metrics import metrics, timed_client_call
+
+
+class FirestoreExecutor:
+    """Dedicated, bounded thread pool for blocking Firestore calls.
+
+    The synchronous Firestore client blocks on every RPC, so each call is run
+    here and fully materialized (query results are listed inside the worker)
+    before control returns to the event loop. At most `max_workers` calls run
+    at once and at most `max_pending` more wait for a thread; callers beyond
+    that wait on the event loop without occupying queue slots. The time each
+    call spends waiting for a thread is recorded apart from its Firestore
+    latency.
+    """
+
+    def __init__(self):
+        self.max_workers = int(os.getenv("FIRESTORE_MAX_WORKERS", 16))
+        self.max_pending = int(os.getenv("FIRESTORE_MAX_PENDING", 256))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'in_flight': 0,
+            'queued': 0,
+            'max_queued': 0,
+            'total_queue_wait': 0.0,
+            'max_queue_wait': 0.0,
+        }
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="firestore")
+        return self._pool
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_pending)
+        return self._slots
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run a blocking Firestore call off the event loop and return its result"""
+        async with self.slots:
+            submitted_at = time.perf_counter()
+            with self._lock:
+                self._stats['submitted'] += 1
+                self._stats['queued'] += 1
+                self._stats['max_queued'] = max(self._stats['max_queued'], self._stats['queued'])
+
+            def call():
+                waited = time.perf_counter() - submitted_at
+                with self._lock:
+                    self._stats['queued'] -= 1
+                    self._stats['in_flight'] += 1
+                    self._stats['total_queue_wait'] += waited
+                    self._stats['max_queue_wait'] = max(self._stats['max_queue_wait'], waited)
+                try:
+                    # Inside a firestore_timer, only this part is recorded as the call's latency
+                    return timed_client_call(fn, *args)
+                finally:
+                    with self._lock:
+                        self._stats['in_flight'] -= 1
+
+            # The caller's context (e.g. its request id) carries over into the thread
+            context = contextvars.copy_context()
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(self.pool, context.run, call)
+            except Exception:
+                with self._lock:
+                    self._stats['failed'] += 1
+                raise
+            with self._lock:
+                self._stats['completed'] += 1
+            return result
+
+    def reset_after_fork(self):
+        """Threads and the loop-bound semaphore do not survive fork; start afresh in the child"""
+        self._pool = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        finished = stats['completed'] + stats['failed']
+        return {
+            **stats,
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'avg_queue_wait': round(stats['total_queue_wait'] / finished, 6) if finished else 0.0,
+        }
+
+# Create global instance
+firestore_executor = FirestoreExecutor()
+os.register_at_fork(after_in_child=firestore_executor.reset_after_fork)
+
+metrics.gauge_callback(
+    "firestore_executor_queue_depth", "Firestore calls waiting for an executor thread",
+    lambda: firestore_executor.get_stats()['queued']
+)
+metrics.gauge_callback(
+    "firestore_executor_in_flight", "Firestore calls running on the executor",
+    lambda: firestore_executor.get_stats()['in_flight']
+)
+metrics.gauge_callback(
+    "firestore_executor_queue_wait_seconds_max", "Longest time a Firestore call has waited for a thread",
+    lambda: firestore_executor.get_stats()['max_queue_wait']
+)
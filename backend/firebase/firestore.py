@@ -3,18 +3,35 @@ import firebase_admin
 from firebase_admin import credentials, firestore
 import os
 import json
-from typing import List, Dict, Optional
-import asyncio
+import logging
+import threading
+from typing import AsyncIterator, Callable, Iterable, List, Dict, Optional, Tuple
+import itertools
+from datetime import datetime
+from firebase.counters import NotificationCounters
+from firebase.markers import BuildMarkers
+from firebase.statistics import ApplicationStatistics, summarize
+from firebase.ballot import BallotRoster
+from firebase.retention import NotificationCompactor
+from firebase.broadcast import BroadcastFanout
+from firebase.executor import firestore_executor
+from firebase.memory_client import create_memory_client
+from firebase.transactions import run_transaction
+from utils.notification_hub import notification_hub
+from utils.metrics import firestore_timer
+from utils.serialization import document_to_dict
+
+logger = logging.getLogger(__name__)
 
 # Initialize Firebase Admin SDK
 def initialize_firebase():
     try:
         # Check if already initialized
         firebase_admin.get_app()
-        print("✅ Firebase already initialized")
+        logger.info("Firebase already initialized")
         return True
     except ValueError:
-        print("🔄 Initializing Firebase...")
+        logger.info("Initializing Firebase")
         try:
             # Method 1: Try to use service account key file
             service_account_paths = [
@@ -27,7 +44,7 @@ def initialize_firebase():
                 if os.path.exists(path):
                     cred = credentials.Certificate(path)
                     firebase_admin.initialize_app(cred)
-                    print(f"✅ Firebase initialized with service account file: {path}")
+                    logger.info("Firebase initialized with service account file: %s", path)
                     return True
             
             # Method 2: Try environment variables for service account
@@ -51,121 +68,621 @@ def initialize_firebase():
                 
                 cred = credentials.Certificate(cred_dict)
                 firebase_admin.initialize_app(cred)
-                print("✅ Firebase initialized with environment variables")
+                logger.info("Firebase initialized with environment variables")
                 return True
             
             # Method 3: Use default credentials (if running on Firebase environment)
             try:
                 firebase_admin.initialize_app()
-                print("✅ Firebase initialized with default credentials")
+                logger.info("Firebase initialized with default credentials")
                 return True
             except Exception as default_error:
-                print(f"❌ Default credentials failed: {default_error}")
+                logger.error("Default credentials failed: %s", default_error)
                 raise Exception("Firebase initialization failed. Please add serviceAccountKey.json to backend folder")
                 
         except Exception as e:
-            print(f"❌ Firebase initialization error: {e}")
+            logger.error("Firebase initialization error: %s", e)
             raise Exception(f"Firebase initialization failed: {str(e)}")
 
-# Initialize Firebase
-try:
-    firebase_initialized = initialize_firebase()
-    db = firestore.client()
-    print("✅ Firestore client initialized successfully")
-except Exception as e:
-    print(f"❌ Critical: Firestore initialization failed: {e}")
-    print("💡 Please download serviceAccountKey.json from Firebase Console")
-    print("💡 Go to: Firebase Console > Project Settings > Service Accounts > Generate New Private Key")
-    raise e
+# Which store backs the API: "firestore", or "memory" for local load testing
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firestore")
+
+# Firestore client, created on first use rather than at import
+_db = None
+_db_lock = threading.Lock()
+
+def get_db():
+    """Initialize Firebase and the Firestore client once per process"""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None and STORAGE_BACKEND == "memory":
+                _db = create_memory_client()
+                logger.info("Using in-memory storage backend")
+            elif _db is None:
+                try:
+                    initialize_firebase()
+                    _db = firestore.client()
+                    logger.info("Firestore client initialized successfully")
+                except Exception as e:
+                    logger.critical(
+                        "Firestore initialization failed: %s. Download serviceAccountKey.json from Firebase Console "
+                        "> Project Settings > Service Accounts > Generate New Private Key", e
+                    )
+                    raise e
+    return _db
+
+def _forget_db_after_fork():
+    """gRPC channels do not survive fork; a forked worker creates its own client"""
+    global _db, _db_lock
+    _db = None
+    _db_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_forget_db_after_fork)
+
+# Firestore allows at most 500 writes in a single batch
+MAX_BATCH_WRITES = 500
+
+# Notifications changed per bulk transaction: one write each plus a counter write per recipient
+BULK_NOTIFICATION_CHUNK = MAX_BATCH_WRITES // 2
+
+class WriteSet:
+    """Documents staged for one workflow step, committed in a single WriteBatch.
+    
+    Either every staged write lands or none of them do, and the whole set
+    costs one round trip to Firestore. Given a transaction as `writer`, the
+    writes are staged on it instead and land when the transaction commits.
+    """
+    
+    def __init__(self, db, counters: NotificationCounters, statistics: ApplicationStatistics, ballot: BallotRoster,
+                 writer=None):
+        self.db = db
+        self.counters = counters
+        self.statistics = statistics
+        self.ballot = ballot
+        self._batch = writer if writer is not None else db.batch()
+        self._count = 0
+        self._notifications: List[Dict] = []
+        self._collections = set()
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _staged(self):
+        self._count += 1
+        if self._count > MAX_BATCH_WRITES:
+            raise ValueError(f"A write set cannot hold more than {MAX_BATCH_WRITES} writes")
+    
+    def set(self, collection: str, data: Dict, doc_id: Optional[str] = None, merge: bool = False) -> str:
+        """Stage a document write, allocating an id when none is given"""
+        doc_ref = self.db.collection(collection).document(doc_id)
+        self._staged()
+        self._collections.add(collection)
+        self._batch.set(doc_ref, data, merge=merge)
+        return doc_ref.id
+    
+    def create(self, collection: str, doc_id: str, data: Dict):
+        """Stage a write that fails the whole set if the document already exists"""
+        self._staged()
+        self._collections.add(collection)
+        self._batch.create(self.db.collection(collection).document(doc_id), data)
+    
+    def update(self, collection: str, doc_id: str, data: Dict):
+        """Stage an update of an existing document"""
+        self._staged()
+        self._collections.add(collection)
+        self._batch.update(self.db.collection(collection).document(doc_id), data)
+    
+    def delete(self, collection: str, doc_id: str):
+        """Stage a document delete"""
+        self._staged()
+        self._collections.add(collection)
+        self._batch.delete(self.db.collection(collection).document(doc_id))
+    
+    def create_notification(self, notification_data: Dict) -> str:
+        """Stage a new unread notification and bump the recipient's unread counter"""
+        doc_ref = self.db.collection('notifications').document()
+        notification_data['id'] = doc_ref.id
+        notification_data['created_at'] = firestore.SERVER_TIMESTAMP
+        notification_data['is_read'] = False
+        self.set('notifications', notification_data, doc_id=doc_ref.id)
+        
+        self._staged()
+        self.counters.stage_delta(self._batch, notification_data['user_id'], notification_data['user_type'], 1)
+        self._notifications.append(notification_data)
+        return doc_ref.id
+    
+    def record_status_change(self, application_data: Dict, old_status: Optional[str], new_status: Optional[str]):
+        """Stage the application statistics change for a submission or review"""
+        if self._count >= MAX_BATCH_WRITES:
+            raise ValueError(f"A write set cannot hold more than {MAX_BATCH_WRITES} writes")
+        if self.statistics.stage_change(self._batch, application_data, old_status, new_status):
+            self._count += 1
+    
+    def record_ballot_change(self, application_id: str, application_data: Dict,
+                             old_status: Optional[str], new_status: Optional[str]) -> bool:
+        """Stage adding or removing the candidate on their position's ballot; True if it changed"""
+        if self._count >= MAX_BATCH_WRITES:
+            raise ValueError(f"A write set cannot hold more than {MAX_BATCH_WRITES} writes")
+        if self.ballot.stage_change(self._batch, application_id, application_data, old_status, new_status):
+            self._count += 1
+            self._collections.add('ballots')
+            return True
+        return False
+    
+    async def commit(self):
+        """Commit every staged write atomically, then push new notifications to live clients"""
+        if not self._count:
+            return []
+        with firestore_timer('+'.join(sorted(self._collections)), 'batch_commit'):
+            results = await firestore_executor.run(self._batch.commit)
+        self.publish()
+        return results
+    
+    def publish(self):
+        """Push the staged notifications to live clients once the writes are committed"""
+        committed_at = datetime.utcnow()
+        for notification_data in self._notifications:
+            notification_hub.publish(notification_data['user_id'], notification_data['user_type'], {
+                'event': 'created',
+                'notification': {**notification_data, 'created_at': committed_at}
+            })
+
+def _collection_of(query) -> str:
+    """Collection id a query or collection reference reads from, for metric labels"""
+    parent = getattr(query, '_parent', query)
+    return getattr(parent, 'id', 'unknown')
 
 # Firestore Service Class
 class FirestoreService:
     def __init__(self):
-        self.db = db
+        self._markers: Optional[BuildMarkers] = None
+        self._counters: Optional[NotificationCounters] = None
+        self._statistics: Optional[ApplicationStatistics] = None
+        self._ballot: Optional[BallotRoster] = None
+        self.compactor = NotificationCompactor(get_db, lambda: self.counters)
+        self.broadcasts = BroadcastFanout(get_db, lambda: self.counters)
     
-    async def get_user_notifications(self, user_id: str, user_type: str) -> List[Dict]:
-        """Get notifications for a specific user"""
-        try:
-            # Run the Firestore query in a thread pool since it's blocking
-            loop = asyncio.get_event_loop()
-            docs = await loop.run_in_executor(
-                None,
-                lambda: self.db.collection('notifications')
-                .where('user_id', '==', user_id)
-                .where('user_type', '==', user_type)
-                .order_by('created_at', direction=firestore.Query.DESCENDING)
-                .stream()
-            )
-            
-            notifications = []
-            for doc in docs:
-                notification_data = doc.to_dict()
-                notification_data['id'] = doc.id
-                
-                # Convert Firestore timestamps
-                if 'created_at' in notification_data:
-                    notification_data['created_at'] = notification_data['created_at'].replace(tzinfo=None)
-                if 'read_at' in notification_data and notification_data['read_at']:
-                    notification_data['read_at'] = notification_data['read_at'].replace(tzinfo=None)
-                
-                notifications.append(notification_data)
+    @property
+    def db(self):
+        return get_db()
+    
+    @property
+    def markers(self) -> BuildMarkers:
+        if self._markers is None:
+            self._markers = BuildMarkers(self.db)
+        return self._markers
+    
+    @property
+    def counters(self) -> NotificationCounters:
+        if self._counters is None:
+            self._counters = NotificationCounters(self.db, self.markers)
+        return self._counters
+    
+    @property
+    def statistics(self) -> ApplicationStatistics:
+        if self._statistics is None:
+            self._statistics = ApplicationStatistics(self.db, self.markers)
+        return self._statistics
+    
+    @property
+    def ballot(self) -> BallotRoster:
+        if self._ballot is None:
+            self._ballot = BallotRoster(self.db, self.markers)
+        return self._ballot
+    
+    def write_set(self) -> WriteSet:
+        """Start staging the writes of one workflow step"""
+        return WriteSet(self.db, self.counters, self.statistics, self.ballot)
+    
+    async def review_applications(self, application_ids: List[str],
+                                  stage: Callable[[WriteSet, str, Dict], None]) -> Dict[str, Optional[Dict]]:
+        """Stage and commit decisions on applications in one transaction that reads them first.
+        
+        stage(write_set, application_id, application) is called with each
+        application as read inside the transaction, so the status a decision
+        moves from is the stored one even when reviews race or are retried.
+        Returns every application as read (None when missing); notifications
+        are pushed once the transaction commits.
+        """
+        refs = [self.db.collection('candidate_applications').document(doc_id) for doc_id in application_ids]
+        
+        def apply(transaction):
+            write_set = WriteSet(self.db, self.counters, self.statistics, self.ballot, writer=transaction)
+            applications = dict.fromkeys(application_ids)
+            # Every read happens before the first write is staged
+            snapshots = [snapshot for snapshot in self.db.get_all(refs, transaction=transaction) if snapshot.exists]
+            for snapshot in snapshots:
+                applications[snapshot.id] = snapshot.to_dict()
+                stage(write_set, snapshot.id, applications[snapshot.id])
+            return applications, write_set
+        
+        with firestore_timer('candidate_applications', 'review_transaction'):
+            applications, write_set = await firestore_executor.run(lambda: run_transaction(self.db, apply))
+        write_set.publish()
+        return applications
+    
+    def collection(self, collection: str):
+        """Collection reference for building queries to pass to run_query/stream_query"""
+        return self.db.collection(collection)
+    
+    def new_document_id(self, collection: str) -> str:
+        """Allocate a document id locally, without a round trip"""
+        return self.db.collection(collection).document().id
+    
+    async def get_document(self, collection: str, doc_id: str):
+        """Fetch one document snapshot; check `.exists` on the result"""
+        try:
+            with firestore_timer(collection, 'get'):
+                return await firestore_executor.run(self.db.collection(collection).document(doc_id).get)
             
-            return notifications
+        except Exception as e:
+            logger.error("Error getting %s/%s: %s", collection, doc_id, e)
+            raise e
+    
+    async def run_query(self, query) -> List:
+        """Run a query and return every snapshot, fully read off the event loop"""
+        try:
+            with firestore_timer(_collection_of(query), 'query'):
+                return await firestore_executor.run(lambda: list(query.stream()))
             
         except Exception as e:
-            print(f"Error getting user notifications: {e}")
+            logger.error("Error running query: %s", e)
             raise e
     
-    async def mark_notification_read(self, notification_id: str) -> bool:
-        """Mark a notification as read"""
+    async def stream_query(self, query, chunk_size: int = 100) -> AsyncIterator:
+        """Yield snapshots as Firestore returns them, pulling chunks off the event loop"""
+        docs = query.stream()
+        
+        def next_chunk():
+            return list(itertools.islice(docs, chunk_size))
+        
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: self.db.collection('notifications').document(notification_id).update({
+            while True:
+                with firestore_timer(_collection_of(query), 'stream'):
+                    chunk = await firestore_executor.run(next_chunk)
+                if not chunk:
+                    break
+                for doc in chunk:
+                    yield doc
+        finally:
+            docs.close()
+    
+    async def get_documents(self, collection: str, doc_ids: List[str]) -> Dict[str, Optional[Dict]]:
+        """Fetch many documents in one get_all round trip; missing ids map to None"""
+        try:
+            if not doc_ids:
+                return {}
+            refs = [self.db.collection(collection).document(doc_id) for doc_id in doc_ids]
+            with firestore_timer(collection, 'get_all'):
+                snapshots = await firestore_executor.run(lambda: list(self.db.get_all(refs)))
+            return {
+                snapshot.id: snapshot.to_dict() if snapshot.exists else None
+                for snapshot in snapshots
+            }
+            
+        except Exception as e:
+            logger.error("Error getting %s documents: %s", collection, e)
+            raise e
+    
+    async def create_notification(self, notification_data: Dict) -> str:
+        """Create a single notification"""
+        try:
+            write_set = self.write_set()
+            notification_id = write_set.create_notification(notification_data)
+            await write_set.commit()
+            return notification_id
+            
+        except Exception as e:
+            logger.error("Error creating notification: %s", e)
+            raise e
+    
+    async def get_user_notifications(self, user_id: str, user_type: str,
+                                     fields: Optional[Iterable[str]] = None,
+                                     limit: Optional[int] = None,
+                                     before: Optional[Tuple[datetime, str]] = None) -> List[Dict]:
+        """Get notifications for a specific user, newest first.
+        
+        `limit` caps the page size and `before` is the (created_at, id) of the
+        last notification of the previous page; `fields` trims each result.
+        """
+        try:
+            query = self.db.collection('notifications') \
+                .where('user_id', '==', user_id) \
+                .where('user_type', '==', user_type) \
+                .order_by('created_at', direction=firestore.Query.DESCENDING) \
+                .order_by('__name__', direction=firestore.Query.DESCENDING)
+            if before is not None:
+                query = query.start_after({'created_at': before[0], '__name__': before[1]})
+            if limit:
+                query = query.limit(limit)
+            
+            # Run and read the whole query on the Firestore executor since it's blocking
+            with firestore_timer('notifications', 'query'):
+                docs = await firestore_executor.run(lambda: list(query.stream()))
+            
+            return [document_to_dict(doc, fields) for doc in docs]
+            
+        except Exception as e:
+            logger.error("Error getting user notifications: %s", e)
+            raise e
+    
+    def _change_notification(self, notification_id: str, delete: bool) -> Optional[Dict]:
+        """Mark read or delete a notification, keeping its unread counter in step.
+        
+        Runs in a transaction so the counter is only decremented when this
+        call is the one that takes the notification out of the unread state.
+        Returns the notification as it was before the change, or None if it
+        does not exist.
+        """
+        doc_ref = self.db.collection('notifications').document(notification_id)
+        
+        def apply(transaction):
+            snapshot = doc_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return None
+            
+            notification = snapshot.to_dict()
+            if delete:
+                transaction.delete(doc_ref)
+            elif notification.get('is_read'):
+                return notification
+            else:
+                transaction.update(doc_ref, {
                     'is_read': True,
                     'read_at': firestore.SERVER_TIMESTAMP
                 })
-            )
+            
+            if not notification.get('is_read'):
+                self.counters.stage_delta(transaction, notification['user_id'], notification['user_type'], -1)
+            return notification
+        
+        return run_transaction(self.db, apply)
+    
+    async def mark_notification_read(self, notification_id: str) -> bool:
+        """Mark a notification as read"""
+        try:
+            with firestore_timer('notifications', 'mark_read_transaction'):
+                notification = await firestore_executor.run(
+                    lambda: self._change_notification(notification_id, delete=False)
+                )
+            if notification is None:
+                return False
+            
+            notification_hub.publish(notification['user_id'], notification['user_type'], {
+                'event': 'read',
+                'id': notification_id,
+                'was_unread': not notification.get('is_read')
+            })
             return True
             
         except Exception as e:
-            print(f"Error marking notification as read: {e}")
+            logger.error("Error marking notification as read: %s", e)
+            raise e
+    
+    def _change_notifications(self, notification_ids: List[str], delete: bool) -> List[Dict]:
+        """Mark read or delete a chunk of notifications in one transaction.
+        
+        Unread counters are adjusted once per recipient. Returns the previous
+        state of every notification that existed.
+        """
+        refs = [self.db.collection('notifications').document(notification_id) for notification_id in notification_ids]
+        
+        def apply(transaction):
+            changed = []
+            unread_by_user: Dict[Tuple[str, str], int] = {}
+            for snapshot in self.db.get_all(refs, transaction=transaction):
+                if not snapshot.exists:
+                    continue
+                notification = snapshot.to_dict()
+                notification['id'] = snapshot.id
+                if delete:
+                    transaction.delete(snapshot.reference)
+                elif notification.get('is_read'):
+                    continue
+                else:
+                    transaction.update(snapshot.reference, {
+                        'is_read': True,
+                        'read_at': firestore.SERVER_TIMESTAMP
+                    })
+                
+                if not notification.get('is_read'):
+                    key = (notification['user_id'], notification['user_type'])
+                    unread_by_user[key] = unread_by_user.get(key, 0) + 1
+                changed.append(notification)
+            
+            for (user_id, user_type), count in unread_by_user.items():
+                self.counters.stage_delta(transaction, user_id, user_type, -count)
+            return changed
+        
+        return run_transaction(self.db, apply)
+    
+    async def change_notifications(self, notification_ids: List[str], delete: bool) -> List[Dict]:
+        """Mark read or delete many notifications, in transactions chunked to Firestore's write limit.
+        
+        Returns the notifications that changed; ids that do not exist (or,
+        when marking read, were already read) are left out.
+        """
+        try:
+            changed = []
+            for start in range(0, len(notification_ids), BULK_NOTIFICATION_CHUNK):
+                chunk = notification_ids[start:start + BULK_NOTIFICATION_CHUNK]
+                with firestore_timer('notifications', 'bulk_delete_transaction' if delete else 'bulk_read_transaction'):
+                    changed.extend(await firestore_executor.run(
+                        lambda: self._change_notifications(chunk, delete)
+                    ))
+            
+            for notification in changed:
+                event = {
+                    'event': 'deleted' if delete else 'read',
+                    'id': notification['id'],
+                    'was_unread': not notification.get('is_read')
+                }
+                notification_hub.publish(notification['user_id'], notification['user_type'], event)
+            return changed
+            
+        except Exception as e:
+            logger.error("Error changing notifications in bulk: %s", e)
+            raise e
+    
+    async def mark_all_notifications_read(self, user_id: str, user_type: str) -> int:
+        """Mark every unread notification of a user as read, returning how many changed"""
+        try:
+            query = self.db.collection('notifications') \
+                .where('user_id', '==', user_id) \
+                .where('user_type', '==', user_type) \
+                .where('is_read', '==', False) \
+                .select([]) \
+                .limit(BULK_NOTIFICATION_CHUNK)
+            
+            marked = 0
+            while True:
+                with firestore_timer('notifications', 'query'):
+                    docs = await firestore_executor.run(lambda: list(query.stream()))
+                if not docs:
+                    return marked
+                # Marked notifications drop out of the query, so the next page starts over
+                changed = await self.change_notifications([doc.id for doc in docs], delete=False)
+                marked += len(changed)
+                if len(docs) < BULK_NOTIFICATION_CHUNK or not changed:
+                    return marked
+            
+        except Exception as e:
+            logger.error("Error marking all notifications as read: %s", e)
             raise e
     
     async def get_unread_notifications_count(self, user_id: str, user_type: str) -> int:
         """Get count of unread notifications for a user"""
         try:
-            loop = asyncio.get_event_loop()
-            docs = await loop.run_in_executor(
-                None,
-                lambda: self.db.collection('notifications')
-                .where('user_id', '==', user_id)
-                .where('user_type', '==', user_type)
-                .where('is_read', '==', False)
-                .stream()
-            )
-            
-            count = sum(1 for _ in docs)
-            return count
+            with firestore_timer('notification_counters', 'read'):
+                return await firestore_executor.run(
+                    lambda: self.counters.read(user_id, user_type)
+                )
             
         except Exception as e:
-            print(f"Error counting unread notifications: {e}")
+            logger.error("Error counting unread notifications: %s", e)
             raise e
     
     async def delete_notification(self, notification_id: str) -> bool:
         """Delete a notification"""
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: self.db.collection('notifications').document(notification_id).delete()
-            )
+            with firestore_timer('notifications', 'delete_transaction'):
+                notification = await firestore_executor.run(
+                    lambda: self._change_notification(notification_id, delete=True)
+                )
+            if notification is None:
+                return False
+            
+            notification_hub.publish(notification['user_id'], notification['user_type'], {
+                'event': 'deleted',
+                'id': notification_id,
+                'was_unread': not notification.get('is_read')
+            })
             return True
             
         except Exception as e:
-            print(f"Error deleting notification: {e}")
+            logger.error("Error deleting notification: %s", e)
             raise e
+    
+    async def reconcile_notification_counters(self) -> Dict:
+        """Rebuild every unread counter from aggregation count queries"""
+        try:
+            with firestore_timer('notification_counters', 'reconcile'):
+                result = await firestore_executor.run(self.counters.reconcile)
+            logger.info("Reconciled %d notification counters, %d had drifted", result['rebuilt'], len(result['drifted']))
+            return result
+            
+        except Exception as e:
+            logger.error("Error reconciling notification counters: %s", e)
+            raise e
+
+    async def backfill_aggregates(self) -> List[str]:
+        """Give each incrementally kept aggregate its first full build; returns the ones built now"""
+        built = []
+        if not await firestore_executor.run(self.counters.is_built):
+            await self.reconcile_notification_counters()
+            built.append('notification_counters')
+        if not await firestore_executor.run(self.statistics.is_built):
+            await self.rebuild_application_statistics()
+            built.append('application_statistics')
+        if not await firestore_executor.run(self.ballot.is_built):
+            await self.rebuild_ballots()
+            built.append('ballots')
+        return built
+
+    async def compact_notifications(self) -> Dict:
+        """Delete notifications outside the retention policy, returning what was reclaimed"""
+        try:
+            return await self.compactor.compact()
+            
+        except Exception as e:
+            logger.error("Error compacting notifications: %s", e)
+            raise e
+
+    async def broadcast_notification(self, title: str, message: str, audience: str,
+                                     faculty: Optional[str] = None) -> Dict:
+        """Start sending an announcement to everyone in the audience; returns the plan"""
+        try:
+            return await self.broadcasts.start(title, message, audience, faculty)
+            
+        except Exception as e:
+            logger.error("Error starting broadcast: %s", e)
+            raise e
+
+    async def get_application_statistics(self) -> Dict:
+        """Application counts per status, position, faculty and party from the sharded aggregates"""
+        try:
+            with firestore_timer('application_stats', 'read'):
+                counts = await firestore_executor.run(self.statistics.read)
+                built = await firestore_executor.run(self.statistics.is_built)
+            # Until the first rebuild, applications stored before the shards existed are missing
+            return {**summarize(counts), 'complete': built}
+            
+        except Exception as e:
+            logger.error("Error reading application statistics: %s", e)
+            raise e
+    
+    async def rebuild_application_statistics(self) -> Dict:
+        """Recount the application statistics from scratch"""
+        try:
+            with firestore_timer('application_stats', 'rebuild'):
+                result = await firestore_executor.run(self.statistics.reconcile)
+            logger.info("Rebuilt application statistics", extra={'drifted': result['drifted']})
+            return {'drifted': result['drifted'], 'statistics': summarize(result['statistics'])}
+            
+        except Exception as e:
+            logger.error("Error rebuilding application statistics: %s", e)
+            raise e
+
+    async def get_ballots(self, position: Optional[str] = None) -> List[Dict]:
+        """Ballot documents for every position, or for one position"""
+        try:
+            with firestore_timer('ballots', 'read'):
+                return await firestore_executor.run(self.ballot.read, position)
+            
+        except Exception as e:
+            logger.error("Error reading ballots: %s", e)
+            raise e
+    
+    async def rebuild_ballots(self) -> List[Dict]:
+        """Rewrite every ballot from the approved applications"""
+        try:
+            with firestore_timer('ballots', 'rebuild'):
+                ballots = await firestore_executor.run(self.ballot.rebuild)
+            logger.info("Rebuilt ballots for %d positions", len(ballots))
+            return ballots
+            
+        except Exception as e:
+            logger.error("Error rebuilding ballots: %s", e)
+            raise e
+
+    def reset_clients(self):
+        """Drop helpers bound to the previous Firestore client, e.g. in a forked worker"""
+        self._markers = None
+        self._counters = None
+        self._statistics = None
+        self._ballot = None
 
 # Create and export the service instance
-firestore_service = FirestoreService()
\ No newline at end of file
+firestore_service = FirestoreService()
+os.register_at_fork(after_in_child=firestore_service.reset_clients)
\ No newline at end of file
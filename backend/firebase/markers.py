@@ -0,0 +1,38 @@
+# backend/firebase/markers.py
+from typing import Set
+
+from firebase_admin import firestore
+
+MARKERS_COLLECTION = 'aggregate_builds'
+
+
+class BuildMarkers:
+    """Which incrementally maintained aggregates have had their first full build.
+
+    Counters, statistics and ballots are kept up to date by increments in
+    the same batch as each change, which is only right once they start
+    from a full count of the data written before them. The first complete
+    rebuild of an aggregate writes its marker here; until the marker
+    exists, readers rebuild instead of trusting the increments. Markers are
+    never removed, so each process remembers the ones it has seen.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._built: Set[str] = set()
+
+    def marker_ref(self, name: str):
+        return self.db.collection(MARKERS_COLLECTION).document(name)
+
+    def is_built(self, name: str) -> bool:
+        if name in self._built:
+            return True
+        if self.marker_ref(name).get().exists:
+            self._built.add(name)
+            return True
+        return False
+
+    def mark_built(self, name: str):
+        """Record a completed full build of the aggregate"""
+        self.marker_ref(name).set({'name': name, 'built_at': firestore.SERVER_TIMESTAMP})
+        self._built.add(name)
@@ -0,0 +1,489 @@
+# backend/firebase/memory_client.py
+import copy
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from firebase_admin import firestore
+
+_MISSING = object()
+
+
+class MemoryClient:
+    """In-process stand-in for the Firestore client, for local load and performance testing.
+
+    Implements the subset of the google-cloud-firestore API this backend uses:
+    collections and subcollections, collection group queries, document
+    get/set/update/delete, queries with where/order_by/start_after/limit/select,
+    aggregation counts,
+    get_all, write batches and transactions, plus the SERVER_TIMESTAMP,
+    Increment, ArrayUnion, ArrayRemove and DELETE_FIELD sentinels. Every
+    round trip can sleep for a fixed latency to simulate the network; a
+    transaction's round trips are slept after it releases the lock, so
+    simulated latency never holds up other threads.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._documents: Dict[str, Dict[str, Dict]] = {}
+        self._lock = threading.RLock()
+        # Round trips counted, not slept, by the transaction running on this thread
+        self._deferred = threading.local()
+
+    # Round trips
+
+    def _round_trip(self):
+        if not self.latency:
+            return
+        if getattr(self._deferred, 'count', None) is not None:
+            self._deferred.count += 1
+        else:
+            time.sleep(self.latency)
+
+    # References
+
+    def collection(self, path: str) -> "MemoryCollectionReference":
+        return MemoryCollectionReference(self, path)
+
+    def collection_group(self, collection_id: str) -> "MemoryQuery":
+        """Query every collection named collection_id, at any depth"""
+        return MemoryQuery(self, collection_id, all_descendants=True)
+
+    def document(self, path: str) -> "MemoryDocumentReference":
+        collection_path, doc_id = path.rsplit('/', 1)
+        return MemoryDocumentReference(self, collection_path, doc_id)
+
+    def batch(self) -> "MemoryWriteBatch":
+        return MemoryWriteBatch(self)
+
+    def transaction(self) -> "MemoryWriteBatch":
+        return MemoryWriteBatch(self)
+
+    def run_transaction(self, fn):
+        """Run fn(transaction) atomically; stands in for @firestore.transactional"""
+        outer = getattr(self._deferred, 'count', None)
+        self._deferred.count = 0
+        try:
+            with self._lock:
+                transaction = self.transaction()
+                result = fn(transaction)
+                transaction.commit()
+        finally:
+            round_trips, self._deferred.count = self._deferred.count, outer
+        if outer is not None:
+            self._deferred.count += round_trips
+        elif round_trips:
+            time.sleep(self.latency * round_trips)
+        return result
+
+    def get_all(self, references: Iterable["MemoryDocumentReference"], transaction=None):
+        self._round_trip()
+        with self._lock:
+            return [reference._snapshot() for reference in references]
+
+    def reset(self):
+        with self._lock:
+            self._documents.clear()
+
+    # Storage
+
+    def _collection_docs(self, collection_path: str) -> Dict[str, Dict]:
+        return self._documents.setdefault(collection_path, {})
+
+    def _apply_write(self, kind: str, reference: "MemoryDocumentReference", data: Optional[Dict],
+                     merge: bool, current: Optional[Dict], now: datetime) -> Optional[Dict]:
+        """Return the document as it stands after one write, or None once deleted"""
+        if kind == 'delete':
+            return None
+        if kind == 'create' and current is not None:
+            raise ValueError(f"Document already exists: {reference.path}")
+        if kind == 'update':
+            if current is None:
+                raise KeyError(f"No document to update: {reference.path}")
+            updated = copy.deepcopy(current)
+            for field_path, value in data.items():
+                _set_path(updated, field_path.split('.'), value, now)
+            return updated
+
+        updated = copy.deepcopy(current) if merge and current is not None else {}
+        _merge(updated, data, now)
+        return updated
+
+    def _commit(self, writes: List[tuple]):
+        self._round_trip()
+        with self._lock:
+            # Stage every write first so a failing one leaves nothing applied
+            now = datetime.now(timezone.utc)
+            staged = {}
+            for kind, reference, data, merge in writes:
+                key = (reference._collection_path, reference.id)
+                current = staged[key] if key in staged else self._collection_docs(key[0]).get(key[1])
+                staged[key] = self._apply_write(kind, reference, data, merge, current, now)
+
+            for (collection_path, doc_id), document in staged.items():
+                docs = self._collection_docs(collection_path)
+                if document is None:
+                    docs.pop(doc_id, None)
+                else:
+                    docs[doc_id] = document
+        return []
+
+
+def _resolve(value: Any, current: Any, now: datetime) -> Any:
+    """Apply a Firestore sentinel/transform against the current field value"""
+    if value is firestore.SERVER_TIMESTAMP:
+        return now
+    if isinstance(value, firestore.Increment):
+        base = current if isinstance(current, (int, float)) else 0
+        return base + value.value
+    if isinstance(value, firestore.ArrayUnion):
+        base = list(current) if isinstance(current, list) else []
+        return base + [item for item in value.values if item not in base]
+    if isinstance(value, firestore.ArrayRemove):
+        base = list(current) if isinstance(current, list) else []
+        return [item for item in base if item not in value.values]
+    if isinstance(value, dict):
+        resolved = {}
+        _merge(resolved, value, now)
+        return resolved
+    return copy.deepcopy(value)
+
+
+def _set_path(target: Dict, parts: List[str], value: Any, now: datetime):
+    for part in parts[:-1]:
+        child = target.get(part)
+        if not isinstance(child, dict):
+            child = target[part] = {}
+        target = child
+    if value is firestore.DELETE_FIELD:
+        target.pop(parts[-1], None)
+    else:
+        target[parts[-1]] = _resolve(value, target.get(parts[-1], _MISSING), now)
+
+
+def _merge(target: Dict, data: Dict, now: datetime):
+    for key, value in data.items():
+        if value is firestore.DELETE_FIELD:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value, now)
+        else:
+            target[key] = _resolve(value, target.get(key, _MISSING), now)
+
+
+def _get_path(data: Dict, field_path: str) -> Any:
+    value = data
+    for part in field_path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+class MemoryDocumentSnapshot:
+    def __init__(self, reference: "MemoryDocumentReference", data: Optional[Dict]):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict]:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path: str) -> Any:
+        value = _get_path(self._data or {}, field_path)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+
+class MemoryDocumentReference:
+    def __init__(self, client: MemoryClient, collection_path: str, doc_id: Optional[str] = None):
+        self._client = client
+        self._collection_path = collection_path
+        self.id = doc_id or uuid.uuid4().hex[:20]
+
+    @property
+    def path(self) -> str:
+        return f"{self._collection_path}/{self.id}"
+
+    def collection(self, name: str) -> "MemoryCollectionReference":
+        return MemoryCollectionReference(self._client, f"{self.path}/{name}")
+
+    def _snapshot(self) -> MemoryDocumentSnapshot:
+        data = self._client._collection_docs(self._collection_path).get(self.id)
+        return MemoryDocumentSnapshot(self, copy.deepcopy(data) if data is not None else None)
+
+    def get(self, field_paths=None, transaction=None) -> MemoryDocumentSnapshot:
+        if transaction is None:
+            self._client._round_trip()
+        with self._client._lock:
+            return self._snapshot()
+
+    def set(self, data: Dict, merge: bool = False):
+        return self._client._commit([('set', self, data, merge)])
+
+    def update(self, data: Dict):
+        return self._client._commit([('update', self, data, False)])
+
+    def delete(self):
+        return self._client._commit([('delete', self, None, False)])
+
+
+class MemoryAggregationResult:
+    def __init__(self, alias: str, value: int):
+        self.alias = alias
+        self.value = value
+
+
+class MemoryAggregationQuery:
+    def __init__(self, query: "MemoryQuery", alias: Optional[str]):
+        self._query = query
+        self._alias = alias or 'field_1'
+
+    def get(self, transaction=None):
+        self._query._client._round_trip()
+        return [[MemoryAggregationResult(self._alias, len(self._query._matching()))]]
+
+
+_OPERATORS = {
+    '==': lambda value, operand: value == operand,
+    '!=': lambda value, operand: value != operand,
+    '<': lambda value, operand: value < operand,
+    '<=': lambda value, operand: value <= operand,
+    '>': lambda value, operand: value > operand,
+    '>=': lambda value, operand: value >= operand,
+    'in': lambda value, operand: value in operand,
+    'not-in': lambda value, operand: value not in operand,
+    'array_contains': lambda value, operand: isinstance(value, list) and operand in value,
+    'array_contains_any': lambda value, operand: isinstance(value, list) and any(item in value for item in operand),
+}
+
+
+class MemoryQuery:
+    def __init__(self, client: MemoryClient, collection_path: str, all_descendants: bool = False):
+        self._client = client
+        self._collection_path = collection_path
+        self._all_descendants = all_descendants
+        self._filters: List[tuple] = []
+        self._orders: List[tuple] = []
+        self._limit: Optional[int] = None
+        self._start_after: Optional[List[Any]] = None
+        self._projection: Optional[List[str]] = None
+
+    @property
+    def _parent(self) -> "MemoryCollectionReference":
+        return MemoryCollectionReference(self._client, self._collection_path)
+
+    def _copy(self) -> "MemoryQuery":
+        query = MemoryQuery(self._client, self._collection_path, self._all_descendants)
+        query._filters = list(self._filters)
+        query._orders = list(self._orders)
+        query._limit = self._limit
+        query._start_after = self._start_after
+        query._projection = self._projection
+        return query
+
+    def where(self, field_path: str, op_string: str, value: Any) -> "MemoryQuery":
+        if op_string not in _OPERATORS:
+            raise ValueError(f"Unsupported operator {op_string}")
+        query = self._copy()
+        query._filters.append((field_path, op_string, value))
+        return query
+
+    def order_by(self, field_path: str, direction: str = "ASCENDING") -> "MemoryQuery":
+        query = self._copy()
+        query._orders.append((field_path, direction == firestore.Query.DESCENDING))
+        return query
+
+    def limit(self, count: int) -> "MemoryQuery":
+        query = self._copy()
+        query._limit = count
+        return query
+
+    def select(self, field_paths: Iterable[str]) -> "MemoryQuery":
+        query = self._copy()
+        query._projection = list(field_paths)
+        return query
+
+    def start_after(self, document_fields_or_snapshot) -> "MemoryQuery":
+        query = self._copy()
+        if isinstance(document_fields_or_snapshot, MemoryDocumentSnapshot):
+            snapshot = document_fields_or_snapshot
+            values = [
+                snapshot.id if field == '__name__' else _get_path(snapshot._data or {}, field)
+                for field, _ in query._orders
+            ]
+        elif isinstance(document_fields_or_snapshot, dict):
+            values = [document_fields_or_snapshot[field] for field, _ in query._orders[:len(document_fields_or_snapshot)]]
+        else:
+            values = list(document_fields_or_snapshot)
+        query._start_after = [value.id if isinstance(value, MemoryDocumentReference) else value for value in values]
+        return query
+
+    def count(self, alias: Optional[str] = None) -> MemoryAggregationQuery:
+        return MemoryAggregationQuery(self, alias)
+
+    def _field(self, doc_id: str, data: Dict, field_path: str) -> Any:
+        return doc_id if field_path == '__name__' else _get_path(data, field_path)
+
+    def _sort_key(self, collection_path: str, doc_id: str, data: Dict) -> tuple:
+        return tuple(_SortValue(self._field(doc_id, data, field), descending) for field, descending in self._orders)
+
+    def _documents(self) -> List[tuple]:
+        """(collection_path, doc_id, data) of every document the query ranges over"""
+        with self._client._lock:
+            if not self._all_descendants:
+                return [
+                    (self._collection_path, doc_id, data)
+                    for doc_id, data in self._client._collection_docs(self._collection_path).items()
+                ]
+            return [
+                (collection_path, doc_id, data)
+                for collection_path, docs in self._client._documents.items()
+                if collection_path.rsplit('/', 1)[-1] == self._collection_path
+                for doc_id, data in docs.items()
+            ]
+
+    def _matching(self) -> List[tuple]:
+        matching = []
+        for collection_path, doc_id, data in self._documents():
+            if any(self._field(doc_id, data, field) is _MISSING for field, _ in self._orders):
+                continue
+            if all(
+                (value := self._field(doc_id, data, field)) is not _MISSING and _compare(op, value, operand)
+                for field, op, operand in self._filters
+            ):
+                matching.append((collection_path, doc_id, data))
+
+        if self._orders:
+            matching.sort(key=lambda item: self._sort_key(*item))
+            if self._start_after is not None:
+                cursor = tuple(
+                    _SortValue(value, descending)
+                    for value, (_, descending) in zip(self._start_after, self._orders)
+                )
+                matching = [
+                    item for item in matching
+                    if self._sort_key(*item)[:len(cursor)] > cursor
+                ]
+        return matching
+
+    def stream(self, transaction=None):
+        self._client._round_trip()
+        matching = self._matching()
+        if self._limit is not None:
+            matching = matching[:self._limit]
+
+        for collection_path, doc_id, data in matching:
+            if self._projection is not None:
+                projected = {}
+                for field_path in self._projection:
+                    value = _get_path(data, field_path)
+                    if value is not _MISSING:
+                        _set_path(projected, field_path.split('.'), value, None)
+                data = projected
+            reference = MemoryDocumentReference(self._client, collection_path, doc_id)
+            yield MemoryDocumentSnapshot(reference, copy.deepcopy(data))
+
+    def get(self, transaction=None) -> List[MemoryDocumentSnapshot]:
+        return list(self.stream(transaction=transaction))
+
+
+class MemoryCollectionReference(MemoryQuery):
+    @property
+    def id(self) -> str:
+        return self._collection_path.rsplit('/', 1)[-1]
+
+    def document(self, document_id: Optional[str] = None) -> MemoryDocumentReference:
+        return MemoryDocumentReference(self._client, self._collection_path, document_id)
+
+    def add(self, document_data: Dict, document_id: Optional[str] = None):
+        reference = self.document(document_id)
+        reference.set(document_data)
+        return None, reference
+
+    def list_documents(self) -> List[MemoryDocumentReference]:
+        with self._client._lock:
+            return [self.document(doc_id) for doc_id in self._client._collection_docs(self._collection_path)]
+
+
+class MemoryWriteBatch:
+    """Write batch that also serves as a transaction for MemoryClient.run_transaction"""
+
+    def __init__(self, client: MemoryClient):
+        self._client = client
+        self._writes: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def set(self, reference: MemoryDocumentReference, document_data: Dict, merge: bool = False):
+        self._writes.append(('set', reference, document_data, merge))
+
+    def create(self, reference: MemoryDocumentReference, document_data: Dict):
+        self._writes.append(('create', reference, document_data, False))
+
+    def update(self, reference: MemoryDocumentReference, field_updates: Dict):
+        self._writes.append(('update', reference, field_updates, False))
+
+    def delete(self, reference: MemoryDocumentReference):
+        self._writes.append(('delete', reference, None, False))
+
+    def commit(self):
+        writes, self._writes = self._writes, []
+        return self._client._commit(writes)
+
+
+class _SortValue:
+    """Orders field values the way Firestore does, respecting direction"""
+
+    # Firestore type order: null < booleans < numbers < timestamps < strings < others
+    @staticmethod
+    def _rank(value: Any) -> tuple:
+        if value is None:
+            return (0, 0)
+        if isinstance(value, bool):
+            return (1, value)
+        if isinstance(value, (int, float)):
+            return (2, value)
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return (3, value)
+        if isinstance(value, str):
+            return (4, value)
+        return (5, repr(value))
+
+    def __init__(self, value: Any, descending: bool):
+        self.key = self._rank(value)
+        self.descending = descending
+
+    def __eq__(self, other) -> bool:
+        return self.key == other.key
+
+    def __lt__(self, other) -> bool:
+        return self.key > other.key if self.descending else self.key < other.key
+
+    def __gt__(self, other) -> bool:
+        return other < self
+
+
+def _compare(op: str, value: Any, operand: Any) -> bool:
+    if isinstance(value, datetime) and isinstance(operand, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        if operand.tzinfo is None:
+            operand = operand.replace(tzinfo=timezone.utc)
+    try:
+        return _OPERATORS[op](value, operand)
+    except TypeError:
+        return False
+
+
+def create_memory_client() -> MemoryClient:
+    """Build the local backend, with STORAGE_LATENCY_MS of simulated latency per round trip"""
+    return MemoryClient(latency=float(os.getenv("STORAGE_LATENCY_MS", 0)) / 1000)
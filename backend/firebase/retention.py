@@ -0,0 +1,189 @@
+# backend/firebase/retention.py
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from firebase_admin import firestore
+
+from firebase.counters import NotificationCounters
+from firebase.executor import firestore_executor
+from firebase.transactions import run_transaction
+from utils.metrics import firestore_timer, metrics
+from utils.notification_hub import notification_hub
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATIONS_RECLAIMED = metrics.counter(
+    "notifications_reclaimed_total", "Notifications deleted by the retention policy", ("rule",)
+)
+
+
+class RetentionPolicy:
+    """Which notifications compaction deletes; a zero setting disables its rule"""
+
+    def __init__(self):
+        # Read notifications older than this many days are deleted
+        self.read_ttl_days = float(os.getenv("NOTIFICATION_RETENTION_DAYS", 90))
+        # Each user keeps at most this many notifications, newest first
+        self.max_per_user = int(os.getenv("NOTIFICATION_MAX_PER_USER", 200))
+        # Deletes per batched write (Firestore allows 500 writes, counters included)
+        self.batch_size = min(int(os.getenv("NOTIFICATION_COMPACTION_BATCH", 200)), 250)
+        # Upper bound on deletes per second, so compaction does not starve live traffic
+        self.max_deletes_per_second = float(os.getenv("NOTIFICATION_COMPACTION_RATE", 200))
+
+    def as_dict(self) -> Dict:
+        return {
+            'read_ttl_days': self.read_ttl_days,
+            'max_per_user': self.max_per_user,
+            'batch_size': self.batch_size,
+            'max_deletes_per_second': self.max_deletes_per_second,
+        }
+
+
+class NotificationCompactor:
+    """Enforces the notification retention policy.
+
+    Expired read notifications are found with one ordered query and deleted
+    page by page. For the per-user cap, one projected scan finds the
+    recipients holding more than max_per_user notifications; each of them
+    has their newest notifications skipped with a cursor and the rest
+    deleted. Every page is deleted in one transaction that re-reads the
+    notifications, so one that its owner read or deleted after the page
+    query is not counted twice: the unread counter is decremented only for
+    notifications still unread at deletion. Pages are paced to the
+    policy's delete rate, and connected clients get the usual `deleted`
+    events.
+    """
+
+    def __init__(self, db_getter: Callable, counters_getter: Callable[[], NotificationCounters],
+                 policy: Optional[RetentionPolicy] = None):
+        self._db = db_getter
+        self._counters = counters_getter
+        self.policy = policy or RetentionPolicy()
+        self._lock: Optional[asyncio.Lock] = None
+        self.last_report: Optional[Dict] = None
+
+    @property
+    def db(self):
+        return self._db()
+
+    def _expired_page(self, cutoff: datetime, after) -> List:
+        query = self.db.collection('notifications') \
+            .where('is_read', '==', True) \
+            .where('created_at', '<', cutoff) \
+            .order_by('created_at') \
+            .select(['user_id', 'user_type', 'is_read', 'created_at'])
+        if after is not None:
+            query = query.start_after(after)
+        return list(query.limit(self.policy.batch_size).stream())
+
+    def _over_cap_page(self, user_id: str, user_type: str, after) -> List:
+        """Notifications of one user past the newest max_per_user, one page at a time"""
+        query = self.db.collection('notifications') \
+            .where('user_id', '==', user_id) \
+            .where('user_type', '==', user_type) \
+            .order_by('created_at', direction=firestore.Query.DESCENDING) \
+            .select(['user_id', 'user_type', 'is_read', 'created_at'])
+        if after is None:
+            kept = list(query.limit(self.policy.max_per_user).stream())
+            if len(kept) < self.policy.max_per_user:
+                return []
+            after = kept[-1]
+        return list(query.start_after(after).limit(self.policy.batch_size).stream())
+
+    def _over_cap_recipients(self) -> Set[Tuple[str, str]]:
+        """Every (user_id, user_type) holding more notifications than the cap"""
+        held = Counter()
+        for doc in self.db.collection('notifications').select(['user_id', 'user_type']).stream():
+            data = doc.to_dict() or {}
+            held[(data.get('user_id'), data.get('user_type'))] += 1
+        return {user for user, count in held.items() if count > self.policy.max_per_user}
+
+    def _delete(self, docs: List) -> List[Dict]:
+        """Delete the notifications that still exist, returning them as they were when deleted"""
+        refs = [doc.reference for doc in docs]
+
+        def apply(transaction):
+            deleted = []
+            unread_by_user: Dict[Tuple[str, str], int] = {}
+            for snapshot in self.db.get_all(refs, transaction=transaction):
+                if not snapshot.exists:
+                    continue
+                data = snapshot.to_dict() or {}
+                transaction.delete(snapshot.reference)
+                if not data.get('is_read'):
+                    key = (data.get('user_id'), data.get('user_type'))
+                    unread_by_user[key] = unread_by_user.get(key, 0) + 1
+                deleted.append({**data, 'id': snapshot.id})
+            for (user_id, user_type), count in unread_by_user.items():
+                self._counters().stage_delta(transaction, user_id, user_type, -count)
+            return deleted
+
+        return run_transaction(self.db, apply)
+
+    async def _reclaim(self, rule: str, fetch_page: Callable[[object], List]) -> int:
+        """Delete page after page until fetch_page comes back empty, at a bounded rate"""
+        reclaimed = 0
+        after = None
+        while True:
+            started = time.monotonic()
+            with firestore_timer('notifications', f'compact_{rule}_query'):
+                docs = await firestore_executor.run(fetch_page, after)
+            if not docs:
+                return reclaimed
+
+            with firestore_timer('notifications', 'compact_delete'):
+                deleted = await firestore_executor.run(self._delete, docs)
+            reclaimed += len(deleted)
+            NOTIFICATIONS_RECLAIMED.inc(len(deleted), rule=rule)
+            for notification in deleted:
+                notification_hub.publish(notification.get('user_id'), notification.get('user_type'), {
+                    'event': 'deleted',
+                    'id': notification['id'],
+                    'was_unread': not notification.get('is_read')
+                })
+
+            after = docs[-1]
+            if self.policy.max_deletes_per_second > 0:
+                pause = len(docs) / self.policy.max_deletes_per_second - (time.monotonic() - started)
+                if pause > 0:
+                    await asyncio.sleep(pause)
+
+    async def compact(self) -> Dict:
+        """Apply the retention policy once and report how many documents were reclaimed"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            started = time.perf_counter()
+            report = {'expired': 0, 'over_cap': 0, 'users_capped': 0}
+
+            if self.policy.read_ttl_days > 0:
+                cutoff = datetime.now(timezone.utc) - timedelta(days=self.policy.read_ttl_days)
+                report['expired'] = await self._reclaim('expired', lambda after: self._expired_page(cutoff, after))
+
+            if self.policy.max_per_user > 0:
+                with firestore_timer('notifications', 'compact_recipients_scan'):
+                    users = await firestore_executor.run(self._over_cap_recipients)
+                for user_id, user_type in users:
+                    if not user_id or not user_type:
+                        continue
+                    deleted = await self._reclaim(
+                        'over_cap', lambda after: self._over_cap_page(user_id, user_type, after)
+                    )
+                    if deleted:
+                        report['over_cap'] += deleted
+                        report['users_capped'] += 1
+
+            report['reclaimed'] = report['expired'] + report['over_cap']
+            report['seconds'] = round(time.perf_counter() - started, 3)
+            report['finished_at'] = datetime.now(timezone.utc).isoformat()
+            self.last_report = report
+            logger.info("Notification compaction reclaimed %d documents in %ss", report['reclaimed'], report['seconds'])
+            return report
+
+    def get_stats(self) -> Dict:
+        return {'policy': self.policy.as_dict(), 'last_run': self.last_report}
@@ -0,0 +1,151 @@
+# backend/firebase/statistics.py
+import os
+import random
+from typing import Dict, Optional, Tuple
+
+from firebase_admin import firestore
+
+from firebase.markers import BuildMarkers
+from firebase.transactions import run_transaction
+
+STATS_COLLECTION = 'application_stats'
+
+# Every submission and review touches the statistics, so they are always sharded
+STATS_SHARDS = int(os.getenv("APPLICATION_STATS_SHARDS", 10))
+
+# Application fields broken down by status
+DIMENSIONS = ('position', 'faculty', 'party')
+
+
+def _value(application: Dict, field: str) -> str:
+    return str(application.get(field) or 'unknown')
+
+
+def _add(target: Dict, source: Dict):
+    """Add nested counts from source into target"""
+    for key, value in source.items():
+        if isinstance(value, dict):
+            _add(target.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)):
+            target[key] = target.get(key, 0) + value
+
+
+class ApplicationStatistics:
+    """Application counts per status, overall and per position, faculty and party.
+
+    The counts are kept in STATS_SHARDS documents of the same shape:
+
+        {'by_status': {status: n},
+         'by_position': {position: {status: n}}, 'by_faculty': ..., 'by_party': ...}
+
+    Write paths add increments to one random shard in the same batch as the
+    application change, and a read sums the shards, so a dashboard refresh
+    costs STATS_SHARDS document reads. A rebuild recomputes everything from
+    the applications when the counts drift, in a transaction that also
+    reads the shards, so an increment committed during the scan is not
+    overwritten. Increments are only complete after the first rebuild
+    (recorded as a build marker), which the leader runs at startup; reads
+    never scan the applications themselves.
+    """
+
+    def __init__(self, db, markers: BuildMarkers):
+        self.db = db
+        self.markers = markers
+
+    def shard_ref(self, shard: Optional[int] = None):
+        if shard is None:
+            shard = random.randrange(STATS_SHARDS)
+        return self.db.collection(STATS_COLLECTION).document(f"shard_{shard}")
+
+    @staticmethod
+    def deltas(old_status: Optional[str], new_status: Optional[str]) -> Dict:
+        """Per-status changes when an application moves from old_status to new_status"""
+        changes = {}
+        if old_status:
+            changes[old_status] = -1
+        if new_status:
+            changes[new_status] = changes.get(new_status, 0) + 1
+        return {status: delta for status, delta in changes.items() if delta}
+
+    def stage_change(self, writer, application: Dict, old_status: Optional[str], new_status: Optional[str]) -> bool:
+        """Stage the count changes on a WriteBatch or Transaction; False when nothing changed"""
+        changes = self.deltas(old_status, new_status)
+        if not changes:
+            return False
+
+        data = {'by_status': {status: firestore.Increment(delta) for status, delta in changes.items()}}
+        for field in DIMENSIONS:
+            data[f"by_{field}"] = {
+                _value(application, field): {status: firestore.Increment(delta) for status, delta in changes.items()}
+            }
+        writer.set(self.shard_ref(), data, merge=True)
+        return True
+
+    def read(self, transaction=None) -> Dict:
+        """Sum of every shard"""
+        totals = {}
+        for shard in self.db.get_all([self.shard_ref(shard) for shard in range(STATS_SHARDS)], transaction=transaction):
+            if shard.exists:
+                _add(totals, shard.to_dict() or {})
+        return totals
+
+    def count_applications(self, transaction=None) -> Dict:
+        """Authoritative counts from a scan of the applications"""
+        totals = {}
+        query = self.db.collection('candidate_applications').select(['status', *DIMENSIONS])
+        for doc in query.stream(transaction=transaction):
+            application = doc.to_dict() or {}
+            status = _value(application, 'status')
+            counts = {'by_status': {status: 1}}
+            for field in DIMENSIONS:
+                counts[f"by_{field}"] = {_value(application, field): {status: 1}}
+            _add(totals, counts)
+        return totals
+
+    def is_built(self) -> bool:
+        return self.markers.is_built(STATS_COLLECTION)
+
+    def rebuild(self) -> Tuple[Dict, Dict]:
+        """Overwrite the shards with freshly counted statistics; returns the counts before and after"""
+        def apply(transaction):
+            # Reading the shards makes a concurrent increment conflict with this transaction
+            before = self.read(transaction=transaction)
+            after = self.count_applications(transaction=transaction)
+            for shard in range(STATS_SHARDS):
+                transaction.set(self.shard_ref(shard), after if shard == 0 else {})
+            return before, after
+
+        before, after = run_transaction(self.db, apply)
+        if not self.is_built():
+            self.markers.mark_built(STATS_COLLECTION)
+        return before, after
+
+    def reconcile(self) -> Dict:
+        """Rebuild the statistics, reporting whether the stored counts had drifted"""
+        before, after = self.rebuild()
+        return {'drifted': _without_zeros(before) != _without_zeros(after), 'statistics': after}
+
+
+def summarize(counts: Dict) -> Dict:
+    """Statistics as served: zero counts dropped and an overall total added.
+
+    A count can dip below zero for a moment when a decrement lands before
+    the increment it undoes; such counts are served as zero.
+    """
+    cleaned = _without_zeros(counts, positive_only=True)
+    summary = {'total': sum(cleaned.get('by_status', {}).values()), 'by_status': cleaned.get('by_status', {})}
+    for field in DIMENSIONS:
+        summary[f"by_{field}"] = cleaned.get(f"by_{field}", {})
+    return summary
+
+
+def _without_zeros(counts: Dict, positive_only: bool = False) -> Dict:
+    cleaned = {}
+    for key, value in counts.items():
+        if isinstance(value, dict):
+            value = _without_zeros(value, positive_only)
+            if value:
+                cleaned[key] = value
+        elif value and not (positive_only and value < 0):
+            cleaned[key] = value
+    return cleaned
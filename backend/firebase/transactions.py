@@ -0,0 +1,9 @@
+# backend/firebase/transactions.py
+from firebase_admin import firestore
+
+
+def run_transaction(db, fn):
+    """Run fn(transaction) in a transaction, retrying on contention"""
+    if hasattr(db, 'run_transaction'):
+        return db.run_transaction(fn)
+    return firestore.transactional(fn)(db.transaction())
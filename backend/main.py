@@ -1,17 +1,36 @@
 # backend/main.py
+import os
+import tempfile
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+# Structured logging goes first, so records from the imports below use it too
+from utils.log import log_pipeline, RequestIdMiddleware
+log_pipeline.configure()
 
-# Import and initialize Firebase FIRST
-from firebase.firestore import initialize_firebase, db
-print("✅ Firebase initialized in main.py")
+# Firebase is initialized by the app lifespan, not at import
+from utils.lifespan import lifespan, resources
 
 # Now import your routes
 from routes.applications import router as applications_router
 from routes.notifications import router as notifications_router
+from routes.ballots import router as ballots_router
+from utils.email_dispatcher import email_dispatcher
+from utils.cache import application_cache, ballot_cache
+from utils.notification_hub import notification_hub
+from firebase.executor import firestore_executor
+from firebase.firestore import firestore_service
+from utils.search_index import application_index
+from utils.admission import write_gate, submission_limiter
+from utils.local_bus import local_bus
+from utils.submission_journal import submission_journal
+from utils.metrics import metrics, MetricsMiddleware
+from utils.serialization import CompressionMiddleware
 
 # Create FastAPI app instance
-app = FastAPI(title="UB Voting System API", version="1.0.0")
+app = FastAPI(title="UB Voting System API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -22,9 +41,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency histograms, exposed on /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Outermost, so every log record of a request carries its id
+app.add_middleware(RequestIdMiddleware)
+
 # Include routes
 app.include_router(applications_router, prefix="/api", tags=["applications"])
 app.include_router(notifications_router, prefix="/api", tags=["notifications"])
+app.include_router(ballots_router, prefix="/api", tags=["ballots"])
 
 @app.get("/")
 async def root():
@@ -32,8 +61,53 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "UB Voting System"}
+    return {
+        "status": "healthy",
+        "service": "UB Voting System",
+        "worker": resources.get_stats(),
+        "email_queue": email_dispatcher.get_metrics(),
+        "application_cache": application_cache.get_stats(),
+        "ballot_cache": ballot_cache.get_stats(),
+        "notification_streams": notification_hub.get_stats(),
+        "notification_retention": firestore_service.compactor.get_stats(),
+        "broadcasts": firestore_service.broadcasts.get_stats(),
+        "search_index": application_index.get_stats(),
+        "firestore_executor": firestore_executor.get_stats(),
+        "submission_journal": submission_journal.get_stats(),
+        "local_bus": local_bus.get_stats(),
+        "logging": log_pipeline.get_stats(),
+        "admission": {
+            "writes": write_gate.get_stats(),
+            "submissions": submission_limiter.get_stats()
+        }
+    }
 
-if __name__ == "__main__":
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def serve():
+    """Run the API, in WEB_CONCURRENCY worker processes when that is above 1.
+    
+    Each worker imports the app itself and creates its Firestore client,
+    thread pools and SMTP connections in the lifespan, so nothing holding a
+    gRPC channel crosses a process boundary. Workers exchange cache
+    invalidations over the local bus in LOCAL_BUS_DIR. Under gunicorn with
+    UvicornWorker, set LOCAL_BUS_DIR yourself; clients created before a
+    fork (e.g. with --preload) are dropped in the child and rebuilt there.
+    Uvicorn's own logging config is skipped; its records go through the
+    app's log pipeline instead.
+    """
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    
+    host = os.getenv("HOST", "0.0.0.0")
+    port = int(os.getenv("PORT", 8000))
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
+    if workers > 1:
+        os.environ.setdefault("LOCAL_BUS_DIR", os.path.join(tempfile.gettempdir(), f"ub-voting-{port}"))
+        uvicorn.run("main:app", host=host, port=port, workers=workers, log_config=None)
+    else:
+        uvicorn.run(app, host=host, port=port, log_config=None)
+
+if __name__ == "__main__":
+    serve()
\ No newline at end of file
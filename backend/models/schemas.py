@@ -1,6 +1,6 @@
 # backend/models/schemas.py
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 
 class CandidateApplication(BaseModel):
@@ -22,6 +22,26 @@ class ApplicationUpdate(BaseModel):
     reviewed_by: str
     rejection_reason: Optional[str] = None
 
+class BulkReviewItem(BaseModel):
+    application_id: str
+    status: str
+    rejection_reason: Optional[str] = None
+
+class BulkApplicationUpdate(BaseModel):
+    reviewed_by: str
+    items: List[BulkReviewItem] = Field(..., min_length=1, max_length=1000)
+
+class BulkReviewResult(BaseModel):
+    application_id: str
+    status: str
+    success: bool
+    error: Optional[str] = None
+
+class BulkReviewResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkReviewResult]
+
 class ApplicationResponse(BaseModel):
     id: str
     student_id: str
@@ -43,6 +63,26 @@ class ApplicationResponse(BaseModel):
     year_of_study: str
     faculty: str
 
+class ApplicationSummary(BaseModel):
+    """List view of an application without the long free-text answers"""
+    id: str
+    student_id: str
+    student_name: str
+    email: str
+    position: str
+    party: str
+    party_name: str
+    status: str
+    created_at: datetime
+    reviewed_at: Optional[datetime] = None
+    year_of_study: str
+    faculty: str
+
+class ApplicationSearchResponse(BaseModel):
+    total: int
+    results: List[ApplicationSummary]
+    next_page_token: Optional[str] = None
+
 class NotificationResponse(BaseModel):
     id: str
     user_id: str
@@ -52,4 +92,34 @@ class NotificationResponse(BaseModel):
     type: str
     is_read: bool
     created_at: datetime
-    related_application_id: Optional[str]
\ No newline at end of file
+    related_application_id: Optional[str]
+
+class NotificationIds(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=1000)
+
+class BroadcastRequest(BaseModel):
+    title: str = Field(..., min_length=1)
+    message: str = Field(..., min_length=1)
+    audience: str = Field(..., pattern="^(all_students|faculty|candidates)$")
+    faculty: Optional[str] = None
+
+class BallotCandidate(BaseModel):
+    application_id: str
+    student_id: str
+    student_name: str
+    party: str
+    party_name: str
+    faculty: Optional[str] = None
+    year_of_study: Optional[str] = None
+    campaign_promise: Optional[str] = None
+
+class PositionBallot(BaseModel):
+    """Approved candidates for one position, in ballot order"""
+    position: str
+    version: int
+    updated_at: Optional[datetime] = None
+    candidates: List[BallotCandidate]
+
+class BallotResponse(BaseModel):
+    version: int
+    positions: List[PositionBallot]
@@ -1,110 +1,157 @@
 # backend/routes/applications.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from firebase_admin import firestore
-from utils.email_service import email_service
-from models.schemas import CandidateApplication, ApplicationUpdate, ApplicationResponse
-from typing import List, Optional
-import asyncio
+from firebase.firestore import firestore_service, MAX_BATCH_WRITES
+from utils.email_dispatcher import email_dispatcher
+from models.schemas import (
+    CandidateApplication, ApplicationUpdate, ApplicationResponse, ApplicationSummary,
+    ApplicationSearchResponse, BulkApplicationUpdate, BulkReviewResult, BulkReviewResponse
+)
+from utils.cache import application_cache, invalidate_ballots
+from utils.pagination import encode_page_token, decode_page_token
+from utils.admission import admit_write, submission_limiter
+from utils.serialization import document_to_dict, dumps, FastJSONResponse
+from utils.lifespan import resources
+from utils.search_index import application_index
+from utils.submission_journal import submission_journal
+from utils.conditional import application_versions, make_etag, not_modified, validator_headers
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+import asyncio
+import logging
+import os
 
 router = APIRouter()
 
-def get_firestore_db():
-    """Safely get Firestore client"""
-    try:
-        return firestore.client()
-    except Exception as e:
-        print(f"❌ Error getting Firestore client: {e}")
-        raise HTTPException(status_code=500, detail="Database connection failed")
+logger = logging.getLogger(__name__)
+
+# Largest page a client can request from the list endpoint
+MAX_PAGE_SIZE = 500
+
+# Newest applications loaded into the cache by the startup warm-up
+WARMUP_PAGE_SIZE = int(os.getenv("APPLICATION_WARMUP_PAGE_SIZE", 50))
+
+# Fields a list request may project to, and the compact set sent with view=summary
+APPLICATION_FIELDS = tuple(ApplicationResponse.model_fields)
+SUMMARY_FIELDS = tuple(ApplicationSummary.model_fields)
 
-# Initialize Firestore when needed
-db = get_firestore_db()
+# Application update, users update, statistics, ballot, notification and its unread counter
+MAX_WRITES_PER_REVIEW = 6
 
-async def create_notification(notification_data: dict):
-    """Create a notification in Firestore"""
+# Application, statistics, and two notifications with their unread counters
+WRITES_PER_SUBMISSION = 6
+
+def _application_record(application: CandidateApplication, application_id: str,
+                        created_at=firestore.SERVER_TIMESTAMP) -> dict:
+    """A submitted application in Firestore format"""
+    return {
+        'id': application_id,
+        'student_id': application.studentId,
+        'student_name': application.studentName,
+        'email': application.email,
+        'position': application.position,
+        'party': application.party,
+        'party_name': application.partyName,
+        'manifesto': application.manifesto,
+        'qualifications': application.qualifications,
+        'achievements': application.achievements,
+        'campaign_promise': application.campaignPromise,
+        'status': 'pending',
+        'year_of_study': application.yearOfStudy,
+        'faculty': application.faculty,
+        'reviewed_at': None,
+        'reviewed_by': None,
+        'rejection_reason': None,
+        'created_at': created_at,
+        'updated_at': created_at
+    }
+
+def _stage_submission(write_set, application_data: dict, create: bool = False):
+    """Stage a new application together with its statistics and both notifications.
+    
+    With `create` the write fails if the application already exists, which
+    makes replaying a journaled submission safe.
+    """
+    application_id = application_data['id']
+    if create:
+        write_set.create('candidate_applications', application_id, application_data)
+    else:
+        write_set.set('candidate_applications', application_data, doc_id=application_id)
+    write_set.record_status_change(application_data, None, 'pending')
+    
+    write_set.create_notification({
+        'user_id': 'admin',
+        'user_type': 'admin',
+        'title': 'New Candidate Application',
+        'message': f"Student {application_data['student_name']} has applied for {application_data['position']} as {application_data['party_name']}.",
+        'type': 'application_submitted',
+        'related_application_id': application_id
+    })
+    write_set.create_notification({
+        'user_id': application_data['student_id'],
+        'user_type': 'student',
+        'title': 'Application Submitted',
+        'message': f"Your application for {application_data['position']} has been received and is under review.",
+        'type': 'application_submitted',
+        'related_application_id': application_id
+    })
+
+def _record_submission(application_data: dict, submitted_at: datetime):
+    """Update the cache and search index for a committed submission and queue its email"""
+    application_id = application_data['id']
+    application_cache.invalidate_application(application_id, 'pending')
+    application_index.upsert(application_id, {**application_data, 'created_at': submitted_at, 'updated_at': submitted_at})
+    logger.info("Application saved with ID: %s", application_id, extra={'sample': 'application_saved'})
+    
+    # Send email to student (in background)
     try:
-        db = get_firestore_db()  # Get fresh client
-        doc_ref = db.collection('notifications').document()
-        notification_data['id'] = doc_ref.id
-        notification_data['created_at'] = firestore.SERVER_TIMESTAMP
-        notification_data['is_read'] = False
-        
-        await doc_ref.set(notification_data)
-        return doc_ref.id
-    except Exception as e:
-        print(f"Error creating notification: {e}")
-        return None
+        email_dispatcher.send_application_submitted_email(
+            application_data['student_name'],
+            application_data['email'],
+            application_data['position'],
+            application_data['party_name']
+        )
+    except Exception as email_error:
+        logger.warning("Email sending failed: %s", email_error)
 
-@router.post("/candidate-applications", response_model=dict)
+@router.post("/candidate-applications", response_model=dict, dependencies=[Depends(admit_write)])
 async def submit_application(application: CandidateApplication):
+    """Submit an application.
+    
+    With SUBMISSION_MODE=journal the application is written to the local
+    submission journal and the response is 202 with the pre-allocated id;
+    the drainer commits it to Firestore shortly after.
+    """
+    # Each student gets a small burst of submissions, then a steady trickle
+    submission_limiter.check(application.studentId)
+    
     try:
-        db = get_firestore_db()  # Get fresh client
-        print("Received application:", application.dict())
-        
-        # Convert to Firestore format
-        application_data = {
+        application_id = firestore_service.new_document_id('candidate_applications')
+        # Identifiers only: the manifesto and contact details stay out of the log
+        logger.info("Received application", extra={
+            'sample': 'application_received',
+            'application_id': application_id,
             'student_id': application.studentId,
-            'student_name': application.studentName,
-            'email': application.email,
-            'position': application.position,
-            'party': application.party,
-            'party_name': application.partyName,
-            'manifesto': application.manifesto,
-            'qualifications': application.qualifications,
-            'achievements': application.achievements,
-            'campaign_promise': application.campaignPromise,
-            'status': 'pending',
-            'year_of_study': application.yearOfStudy,
-            'faculty': application.faculty,
-            'reviewed_at': None,
-            'reviewed_by': None,
-            'rejection_reason': None,
-            'created_at': firestore.SERVER_TIMESTAMP,
-            'updated_at': firestore.SERVER_TIMESTAMP
-        }
+            'position': application.position
+        })
+
+        if submission_journal.enabled:
+            await submission_journal.append(application_id, application.model_dump())
+            return FastJSONResponse({
+                "message": "Application accepted",
+                "application_id": application_id,
+                "status": "queued"
+            }, status_code=202)
         
-        # Create application in Firestore
-        doc_ref = db.collection('candidate_applications').document()
-        application_id = doc_ref.id
-        application_data['id'] = application_id
-        
-        # Use set() instead of add() for more control
-        doc_ref.set(application_data)
-        print(f"Application saved with ID: {application_id}")
-        
-        # Create notifications
-        notification_tasks = [
-            create_notification({
-                'user_id': 'admin',
-                'user_type': 'admin',
-                'title': 'New Candidate Application',
-                'message': f"Student {application.studentName} has applied for {application.position} as {application.partyName}.",
-                'type': 'application_submitted',
-                'related_application_id': application_id
-            }),
-            create_notification({
-                'user_id': application.studentId,
-                'user_type': 'student',
-                'title': 'Application Submitted',
-                'message': f"Your application for {application.position} has been received and is under review.",
-                'type': 'application_submitted',
-                'related_application_id': application_id
-            })
-        ]
-        
-        # Wait for notifications to be created
-        await asyncio.gather(*notification_tasks)
-        
-        # Send email to student (in background)
-        try:
-            email_service.send_application_submitted_email(
-                application.studentName,
-                application.email,
-                application.position,
-                application.partyName
-            )
-        except Exception as email_error:
-            print(f"Email sending failed: {email_error}")
+        # Stage the application and both notifications, then commit them together
+        application_data = _application_record(application, application_id)
+        write_set = firestore_service.write_set()
+        _stage_submission(write_set, application_data)
+        
+        await write_set.commit()
+        _record_submission(application_data, datetime.utcnow())
         
         return {
             "message": "Application submitted successfully", 
@@ -113,171 +160,546 @@ async def submit_application(application: CandidateApplication):
         }
         
     except Exception as e:
-        print(f"Error in submit_application: {e}")
+        logger.exception("Error in submit_application")
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+async def _commit_journaled_submissions(entries: List[dict]) -> Dict[str, Optional[str]]:
+    """Drain handler: commit journaled submissions in batches.
+    
+    A failed batch is retried one submission at a time. A submission whose
+    application already exists was committed before a crash or restart, so
+    it counts as done rather than being written twice.
+    """
+    outcomes: Dict[str, Optional[str]] = {}
+    staged = []
+    for entry in entries:
+        submitted_at = datetime.utcfromtimestamp(entry['accepted_at'])
+        try:
+            application = CandidateApplication.model_validate(entry['payload'])
+        except ValidationError as e:
+            # Only this submission fails; the rest of the batch is committed
+            outcomes[entry['id']] = f"Invalid submission: {e}"
+            continue
+        staged.append((_application_record(application, entry['id'], submitted_at), submitted_at))
+    
+    chunks = []
+    write_set = firestore_service.write_set()
+    chunk_items = []
+    for application_data, submitted_at in staged:
+        if len(write_set) + WRITES_PER_SUBMISSION > MAX_BATCH_WRITES:
+            chunks.append((write_set, chunk_items))
+            write_set = firestore_service.write_set()
+            chunk_items = []
+        _stage_submission(write_set, application_data, create=True)
+        chunk_items.append((application_data, submitted_at))
+    if chunk_items:
+        chunks.append((write_set, chunk_items))
+    
+    committed = []
+    for chunk_write_set, chunk_items in chunks:
+        try:
+            await chunk_write_set.commit()
+            committed.extend(chunk_items)
+            continue
+        except Exception as e:
+            logger.warning("Submission batch failed, retrying items individually: %s", e)
+        
+        for application_data, submitted_at in chunk_items:
+            single_write_set = firestore_service.write_set()
+            _stage_submission(single_write_set, application_data, create=True)
+            try:
+                await single_write_set.commit()
+                committed.append((application_data, submitted_at))
+            except Exception as e:
+                try:
+                    doc = await firestore_service.get_document('candidate_applications', application_data['id'])
+                    already_committed = doc.exists
+                except Exception:
+                    already_committed = False
+                outcomes[application_data['id']] = None if already_committed else str(e)
+    
+    for application_data, submitted_at in committed:
+        _record_submission(application_data, submitted_at)
+        outcomes[application_data['id']] = None
+    return outcomes
+
+submission_journal.set_handler(_commit_journaled_submissions)
+
+@router.get("/candidate-applications/journal", response_model=dict)
+async def get_submission_journal(limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)):
+    """Counts of journaled submissions per state, with the oldest pending or failed entries"""
+    try:
+        if not submission_journal.enabled:
+            return {'enabled': False}
+        return {'enabled': True, **await submission_journal.get_status(limit)}
+        
+    except Exception as e:
+        logger.exception("Error in get_submission_journal")
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+@router.get("/candidate-applications/journal/{application_id}", response_model=dict)
+async def get_journaled_submission(application_id: str):
+    """Where a queued submission stands: pending, committed or failed"""
+    try:
+        entry = await submission_journal.get(application_id) if submission_journal.enabled else None
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Submission not found in journal")
+        return entry
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error in get_journaled_submission")
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
+def _list_projection(view: str, fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Document fields a list request needs, or None for whole applications.
+    
+    `id` is the document name and `created_at` is always kept because the
+    page cursor is built from it.
+    """
+    if fields:
+        requested = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = sorted(set(requested) - set(APPLICATION_FIELDS))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    elif view == "summary":
+        requested = SUMMARY_FIELDS
+    else:
+        return None
+    return tuple(dict.fromkeys(['created_at', *(field for field in requested if field != 'id')]))
+
+async def _stream_applications_ndjson(query, fields: Tuple[str, ...]):
+    """Yield one JSON line per application as Firestore returns it"""
+    async for doc in firestore_service.stream_query(query):
+        yield dumps(document_to_dict(doc, fields)) + b"\n"
+
+def _list_response(body: bytes, next_page_token: Optional[str], headers: dict) -> Response:
+    if next_page_token:
+        headers = {**headers, 'X-Next-Page-Token': next_page_token}
+    return Response(body, media_type="application/json", headers=headers)
+
+def _application_validators(application: dict) -> Tuple[str, Optional[datetime]]:
+    """ETag and Last-Modified of a single application, from its updated_at"""
+    updated_at = application.get('updated_at')
+    return make_etag(application['id'], updated_at.isoformat() if updated_at else None), updated_at
+
 @router.get("/candidate-applications", response_model=List[ApplicationResponse])
-async def get_applications(status: Optional[str] = None):
+async def get_applications(
+    request: Request,
+    status: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    page_token: Optional[str] = None,
+    stream: bool = False,
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = None
+):
+    """List applications, newest first.
+    
+    Pass `limit` to page through the collection; the cursor for the next page
+    comes back in the X-Next-Page-Token header and is passed as `page_token`.
+    With `stream=true` the results are sent as NDJSON while Firestore returns them.
+    
+    `view=summary` returns ApplicationSummary items, and `fields=a,b,c` returns
+    only the named fields (plus `id` and `created_at`). Either way the
+    projection is applied by Firestore, so the free-text answers are not read;
+    the full application is served by GET /candidate-applications/{id}.
+    
+    Responses carry an ETag built from the collection's version marker, so
+    a matching If-None-Match (or If-Modified-Since) gets a 304 without any
+    Firestore read.
+    """
     try:
-        db = get_firestore_db()  # Get fresh client
-        collection_ref = db.collection('candidate_applications')
+        projection = _list_projection(view, fields)
+        
+        # Read the marker before the data, so a concurrent write can only make the ETag older
+        version, modified_at = application_versions.current('candidate_applications')
+        etag = make_etag(version, status, limit, page_token, projection, stream)
+        unchanged = not_modified(request, etag, modified_at)
+        if unchanged is not None:
+            return unchanged
+        headers = validator_headers(etag, modified_at)
+        
+        collection_ref = firestore_service.collection('candidate_applications')
         
         if status:
             query = collection_ref.where('status', '==', status)
         else:
             query = collection_ref
         
-        # Get documents ordered by creation date
-        docs = query.order_by('created_at', direction=firestore.Query.DESCENDING).stream()
+        # Order by creation date, with the document id breaking ties for stable cursors
+        query = query.order_by('created_at', direction=firestore.Query.DESCENDING) \
+            .order_by('__name__', direction=firestore.Query.DESCENDING)
         
-        applications_list = []
-        for doc in docs:
-            app_data = doc.to_dict()
-            app_data['id'] = doc.id
+        if page_token:
+            created_at, doc_id = decode_page_token(page_token)
+            query = query.start_after({'created_at': created_at, '__name__': doc_id})
+        if limit:
+            query = query.limit(limit)
+        if projection is not None:
+            query = query.select(projection)
+        
+        # Firestore data is trusted, so items are shaped from the documents
+        # and encoded once instead of being validated into response models
+        fields = projection or APPLICATION_FIELDS
+        if stream:
+            return StreamingResponse(
+                _stream_applications_ndjson(query, fields), media_type="application/x-ndjson", headers=headers
+            )
+        
+        cache_key = (status, limit, page_token, projection)
+        cached = application_cache.lists.get(cache_key)
+        if cached is None:
+            # Read before the query, so an invalidation during it keeps the result out of the cache
+            generation = application_cache.lists.generation
+            docs = await firestore_service.run_query(query)
             
-            # Convert Firestore timestamps to Python datetime
-            if 'created_at' in app_data:
-                app_data['created_at'] = app_data['created_at'].replace(tzinfo=None)
-            if 'updated_at' in app_data:
-                app_data['updated_at'] = app_data['updated_at'].replace(tzinfo=None) if app_data['updated_at'] else None
-            if 'reviewed_at' in app_data:
-                app_data['reviewed_at'] = app_data['reviewed_at'].replace(tzinfo=None) if app_data['reviewed_at'] else None
+            next_page_token = None
+            if limit and len(docs) == limit:
+                next_page_token = encode_page_token(docs[-1].get('created_at'), docs[-1].id)
             
-            applications_list.append(ApplicationResponse(**app_data))
+            # The encoded body is cached, so cache hits skip serialization entirely
+            cached = (dumps([document_to_dict(doc, fields) for doc in docs]), next_page_token)
+            application_cache.lists.set(cache_key, cached, generation)
         
-        return applications_list
+        return _list_response(*cached, headers)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error in get_applications: {e}")
+        logger.exception("Error in get_applications")
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
-@router.get("/candidate-applications/{application_id}", response_model=ApplicationResponse)
-async def get_application(application_id: str):
+@router.get("/candidate-applications/search", response_model=ApplicationSearchResponse)
+async def search_applications(
+    q: Optional[str] = None,
+    faculty: Optional[str] = None,
+    position: Optional[str] = None,
+    party: Optional[str] = None,
+    status: Optional[str] = None,
+    year_of_study: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    page_token: Optional[str] = None
+):
+    """Search applications by manifesto, qualifications and achievements text.
+    
+    Filters match exactly (ignoring case) and combine with the text query;
+    results are application summaries, newest first. Served from the
+    in-process index, so no Firestore reads happen per search.
+    """
     try:
-        db = get_firestore_db()  # Get fresh client
-        doc_ref = db.collection('candidate_applications').document(application_id)
-        doc = doc_ref.get()
+        await application_index.ensure_loaded()
         
-        if not doc.exists:
-            raise HTTPException(status_code=404, detail="Application not found")
+        after = None
+        if page_token:
+            created_at, doc_id = decode_page_token(page_token)
+            after = (created_at.replace(tzinfo=None), doc_id)
         
-        app_data = doc.to_dict()
-        app_data['id'] = doc.id
+        results, total, next_key = application_index.search(
+            q,
+            {'faculty': faculty, 'position': position, 'party': party,
+             'status': status, 'year_of_study': year_of_study},
+            limit=limit,
+            after=after
+        )
+        return FastJSONResponse({
+            'total': total,
+            'results': results,
+            'next_page_token': encode_page_token(*next_key) if next_key else None,
+        })
         
-        # Convert Firestore timestamps
-        if 'created_at' in app_data:
-            app_data['created_at'] = app_data['created_at'].replace(tzinfo=None)
-        if 'updated_at' in app_data:
-            app_data['updated_at'] = app_data['updated_at'].replace(tzinfo=None) if app_data['updated_at'] else None
-        if 'reviewed_at' in app_data:
-            app_data['reviewed_at'] = app_data['reviewed_at'].replace(tzinfo=None) if app_data['reviewed_at'] else None
-        
-        return ApplicationResponse(**app_data)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error in search_applications")
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+@router.get("/candidate-applications/stats", response_model=dict)
+async def get_application_statistics():
+    """Application counts overall and per status, position, faculty and party"""
+    try:
+        return await firestore_service.get_application_statistics()
         
     except Exception as e:
-        print(f"Error in get_application: {e}")
+        logger.exception("Error in get_application_statistics")
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
-@router.put("/candidate-applications/{application_id}", response_model=dict)
-async def update_application(application_id: str, update: ApplicationUpdate):
+@router.post("/candidate-applications/stats/rebuild", response_model=dict)
+async def rebuild_application_statistics():
+    """Recount the statistics from the applications, e.g. after they drift"""
     try:
-        db = get_firestore_db()  # Get fresh client
+        result = await firestore_service.rebuild_application_statistics()
+        return {"message": "Application statistics rebuilt", **result}
         
-        # Get application details first
-        doc_ref = db.collection('candidate_applications').document(application_id)
-        doc = doc_ref.get()
+    except Exception as e:
+        logger.exception("Error in rebuild_application_statistics")
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+def _stage_review(write_set, application_id: str, application_data: dict, status: str,
+                  reviewed_by: str, rejection_reason: Optional[str]):
+    """Stage a review decision together with its user update and notification.
+    
+    application_data must be the application as read in the same transaction;
+    a decision that leaves the status as it is stages nothing, so a repeated
+    review is not counted or announced twice.
+    """
+    if application_data.get('status') == status:
+        return
+    
+    # Prepare update data
+    update_data = {
+        'status': status,
+        'reviewed_by': reviewed_by,
+        'reviewed_at': firestore.SERVER_TIMESTAMP,
+        'updated_at': firestore.SERVER_TIMESTAMP
+    }
+    
+    if rejection_reason:
+        update_data['rejection_reason'] = rejection_reason
+    
+    write_set.update('candidate_applications', application_id, update_data)
+    write_set.record_status_change(application_data, application_data.get('status'), status)
+    revoked = write_set.record_ballot_change(application_id, application_data, application_data.get('status'), status) \
+        and status != "approved"
+    
+    if revoked:
+        # The candidate leaves the ballot; their profile stays for the record but is no longer active
+        write_set.update('users', application_data['student_id'], {
+            'isCandidate': False,
+            'candidateProfile.applicationStatus': status,
+            'candidateProfile.isActive': False,
+            'updated_at': firestore.SERVER_TIMESTAMP
+        })
+    
+    # Handle notifications based on status
+    if status == "approved":
+        # Update user's candidate status in users collection
+        candidate_profile = {
+            'applicationStatus': 'approved',
+            'appliedPositions': [application_data['position']],
+            'approvedPositions': [application_data['position']],
+            'applicationDate': application_data.get('created_at'),
+            'approvalDate': firestore.SERVER_TIMESTAMP,
+            'manifesto': application_data['manifesto'],
+            'party': application_data['party'],
+            'partyName': application_data['party_name'],
+            'isActive': True
+        }
         
-        if not doc.exists:
-            raise HTTPException(status_code=404, detail="Application not found")
+        # Update user document
+        write_set.update('users', application_data['student_id'], {
+            'isCandidate': True,
+            'candidateProfile': candidate_profile,
+            'updated_at': firestore.SERVER_TIMESTAMP
+        })
         
-        application_data = doc.to_dict()
+        write_set.create_notification({
+            'user_id': application_data['student_id'],
+            'user_type': 'student',
+            'title': 'Application Approved!',
+            'message': f"Congratulations! Your application for {application_data['position']} has been approved.",
+            'type': 'application_approved',
+            'related_application_id': application_id
+        })
         
-        # Prepare update data
-        update_data = {
-            'status': update.status,
-            'reviewed_by': update.reviewed_by,
-            'reviewed_at': firestore.SERVER_TIMESTAMP,
-            'updated_at': firestore.SERVER_TIMESTAMP
-        }
+    elif status == "rejected":
+        write_set.create_notification({
+            'user_id': application_data['student_id'],
+            'user_type': 'student',
+            'title': 'Application Decision',
+            'message': f"Your application for {application_data['position']} was not approved. Reason: {rejection_reason}",
+            'type': 'application_rejected',
+            'related_application_id': application_id
+        })
+
+def _record_review(application_id: str, application_data: dict, status: str):
+    """Bring the cache and search index in line with a committed review"""
+    application_cache.invalidate_application(application_id, application_data.get('status'), status)
+    if (application_data.get('status') == 'approved') != (status == 'approved'):
+        invalidate_ballots()
+    application_index.update(application_id, {'status': status, 'reviewed_at': datetime.utcnow()})
+
+def _queue_review_email(application_data: dict, status: str, rejection_reason: Optional[str]):
+    """Queue the decision email for background delivery once the decision is stored"""
+    if status == "approved":
+        try:
+            email_dispatcher.send_application_approved_email(
+                application_data['student_name'],
+                application_data['email'],
+                application_data['position'],
+                application_data['party_name']
+            )
+        except Exception as email_error:
+            logger.warning("Approval email failed: %s", email_error)
         
-        if update.rejection_reason:
-            update_data['rejection_reason'] = update.rejection_reason
-        
-        # Update application in Firestore
-        doc_ref.update(update_data)
-        
-        # Handle notifications and emails based on status
-        if update.status == "approved":
-            # Update user's candidate status in users collection
-            candidate_profile = {
-                'applicationStatus': 'approved',
-                'appliedPositions': [application_data['position']],
-                'approvedPositions': [application_data['position']],
-                'applicationDate': application_data.get('created_at'),
-                'approvalDate': firestore.SERVER_TIMESTAMP,
-                'manifesto': application_data['manifesto'],
-                'party': application_data['party'],
-                'partyName': application_data['party_name'],
-                'isActive': True
-            }
-            
-            # Update user document
-            user_ref = db.collection('users').document(application_data['student_id'])
-            user_ref.update({
-                'isCandidate': True,
-                'candidateProfile': candidate_profile,
-                'updated_at': firestore.SERVER_TIMESTAMP
-            })
-            
-            # Create notification and send email
-            await asyncio.gather(
-                create_notification({
-                    'user_id': application_data['student_id'],
-                    'user_type': 'student',
-                    'title': 'Application Approved!',
-                    'message': f"Congratulations! Your application for {application_data['position']} has been approved.",
-                    'type': 'application_approved',
-                    'related_application_id': application_id
-                })
+    elif status == "rejected":
+        try:
+            email_dispatcher.send_application_rejected_email(
+                application_data['student_name'],
+                application_data['email'],
+                application_data['position'],
+                rejection_reason or "other"
             )
-            
-            # Send email
-            try:
-                email_service.send_application_approved_email(
-                    application_data['student_name'],
-                    application_data['email'],
-                    application_data['position'],
-                    application_data['party_name']
+        except Exception as email_error:
+            logger.warning("Rejection email failed: %s", email_error)
+
+async def _warm_application_cache():
+    """Load the newest page of applications into the cache"""
+    query = firestore_service.collection('candidate_applications') \
+        .order_by('created_at', direction=firestore.Query.DESCENDING) \
+        .order_by('__name__', direction=firestore.Query.DESCENDING) \
+        .limit(WARMUP_PAGE_SIZE)
+    
+    by_id_generation = application_cache.by_id.generation
+    lists_generation = application_cache.lists.generation
+    docs = await firestore_service.run_query(query)
+    applications_list = [document_to_dict(doc, APPLICATION_FIELDS) for doc in docs]
+    for application in applications_list:
+        application_cache.by_id.set(application['id'], application, by_id_generation)
+    
+    next_page_token = None
+    if len(docs) == WARMUP_PAGE_SIZE:
+        next_page_token = encode_page_token(docs[-1].get('created_at'), docs[-1].id)
+    application_cache.lists.set(
+        (None, WARMUP_PAGE_SIZE, None, None), (dumps(applications_list), next_page_token), lists_generation
+    )
+
+resources.add_warmup("application_cache", _warm_application_cache)
+
+@router.post("/candidate-applications/bulk-review", response_model=BulkReviewResponse, dependencies=[Depends(admit_write)])
+async def bulk_review_applications(review: BulkApplicationUpdate):
+    """Approve or reject many applications in one request.
+    
+    Applications are read with one get_all per chunk, inside the transaction
+    that commits the chunk's decisions together with their notifications, and
+    emails are handed to the background dispatcher. Each item reports its own
+    outcome; deciding an application's current status again changes nothing.
+    """
+    try:
+        # One result per requested item, in request order
+        results: List[Optional[BulkReviewResult]] = [None] * len(review.items)
+        pending = []
+        seen = set()
+        for index, item in enumerate(review.items):
+            if item.application_id in seen:
+                results[index] = BulkReviewResult(
+                    application_id=item.application_id, status=item.status,
+                    success=False, error="Duplicate application id in request"
                 )
-            except Exception as email_error:
-                print(f"Approval email failed: {email_error}")
+                continue
+            seen.add(item.application_id)
+            pending.append((index, item))
+        
+        # Decisions are committed in transactions that stay under the batch write limit
+        chunk_size = max(1, MAX_BATCH_WRITES // MAX_WRITES_PER_REVIEW)
+        chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+        
+        async def review_chunk(chunk_items):
+            items = {item.application_id: item for _, item in chunk_items}
             
-        elif update.status == "rejected":
-            # Create notification and send email
-            await asyncio.gather(
-                create_notification({
-                    'user_id': application_data['student_id'],
-                    'user_type': 'student',
-                    'title': 'Application Decision',
-                    'message': f"Your application for {application_data['position']} was not approved. Reason: {update.rejection_reason}",
-                    'type': 'application_rejected',
-                    'related_application_id': application_id
-                })
-            )
+            def stage(write_set, application_id, application_data):
+                item = items[application_id]
+                _stage_review(write_set, application_id, application_data, item.status,
+                              review.reviewed_by, item.rejection_reason)
             
-            # Send email
-            try:
-                email_service.send_application_rejected_email(
-                    application_data['student_name'],
-                    application_data['email'],
-                    application_data['position'],
-                    update.rejection_reason or "other"
+            return await firestore_service.review_applications(list(items), stage)
+        
+        outcomes = await asyncio.gather(*[review_chunk(chunk_items) for chunk_items in chunks], return_exceptions=True)
+        
+        # Each item paired with its application as read in the transaction that committed it
+        committed = []
+        retry_items = []
+        for chunk_items, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                # One bad item fails its whole transaction; retry those items one by one
+                logger.warning("Bulk review batch failed, retrying items individually: %s", outcome)
+                retry_items.extend(chunk_items)
+            else:
+                committed.extend((index, item, outcome[item.application_id]) for index, item in chunk_items)
+        
+        retry_outcomes = await asyncio.gather(
+            *[review_chunk([(index, item)]) for index, item in retry_items],
+            return_exceptions=True
+        )
+        for (index, item), outcome in zip(retry_items, retry_outcomes):
+            if isinstance(outcome, Exception):
+                results[index] = BulkReviewResult(
+                    application_id=item.application_id, status=item.status,
+                    success=False, error=str(outcome)
                 )
-            except Exception as email_error:
-                print(f"Rejection email failed: {email_error}")
+            else:
+                committed.append((index, item, outcome[item.application_id]))
+        
+        for index, item, application_data in committed:
+            if application_data is None:
+                results[index] = BulkReviewResult(
+                    application_id=item.application_id, status=item.status,
+                    success=False, error="Application not found"
+                )
+                continue
+            if application_data.get('status') != item.status:
+                _record_review(item.application_id, application_data, item.status)
+                _queue_review_email(application_data, item.status, item.rejection_reason)
+            results[index] = BulkReviewResult(
+                application_id=item.application_id, status=item.status, success=True
+            )
+        
+        succeeded = sum(1 for result in results if result.success)
+        return BulkReviewResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+        
+    except Exception as e:
+        logger.exception("Error in bulk_review_applications")
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+@router.get("/candidate-applications/{application_id}", response_model=ApplicationResponse)
+async def get_application(application_id: str, request: Request):
+    """One full application; If-None-Match / If-Modified-Since are answered from its updated_at"""
+    try:
+        application = application_cache.by_id.get(application_id)
+        if application is None:
+            generation = application_cache.by_id.generation
+            doc = await firestore_service.get_document('candidate_applications', application_id)
+            
+            if not doc.exists:
+                raise HTTPException(status_code=404, detail="Application not found")
+            
+            application = document_to_dict(doc, APPLICATION_FIELDS)
+            application_cache.by_id.set(application_id, application, generation)
+        
+        etag, last_modified = _application_validators(application)
+        unchanged = not_modified(request, etag, last_modified)
+        if unchanged is not None:
+            return unchanged
+        return FastJSONResponse(application, headers=validator_headers(etag, last_modified))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error in get_application")
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+@router.put("/candidate-applications/{application_id}", response_model=dict, dependencies=[Depends(admit_write)])
+async def update_application(application_id: str, update: ApplicationUpdate):
+    try:
+        # The application is read in the transaction that stages the update and its side effects
+        def stage(write_set, doc_id, application_data):
+            _stage_review(write_set, doc_id, application_data, update.status,
+                          update.reviewed_by, update.rejection_reason)
+        
+        applications = await firestore_service.review_applications([application_id], stage)
+        application_data = applications[application_id]
+        
+        if application_data is None:
+            raise HTTPException(status_code=404, detail="Application not found")
+        
+        if application_data.get('status') != update.status:
+            _record_review(application_id, application_data, update.status)
+            _queue_review_email(application_data, update.status, update.rejection_reason)
         
         return {"message": f"Application {update.status} successfully", "application_id": application_id}
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error in update_application: {e}")
+        logger.exception("Error in update_application")
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,117 @@
+# backend/routes/ballots.py
+from fastapi import APIRouter, HTTPException, Request, Response
+from firebase.firestore import firestore_service
+from firebase.ballot import position_key
+from models.schemas import BallotResponse, PositionBallot
+from utils.cache import ballot_cache, invalidate_ballots
+from utils.conditional import make_etag, not_modified, validator_headers
+from utils.serialization import dumps
+from utils.lifespan import resources
+from typing import Dict, List, Optional
+import logging
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+def _position_ballot(ballot: Dict) -> Dict:
+    """A ballot document as served: candidates as a list ordered by party, then name"""
+    candidates = [
+        {'application_id': application_id, **candidate}
+        for application_id, candidate in (ballot.get('candidates') or {}).items()
+    ]
+    candidates.sort(key=lambda candidate: (candidate.get('party_name') or '', candidate.get('student_name') or ''))
+    updated_at = ballot.get('updated_at')
+    return {
+        'position': ballot.get('position'),
+        'version': ballot.get('version', 0),
+        'updated_at': updated_at.replace(tzinfo=None) if updated_at else None,
+        'candidates': candidates,
+    }
+
+def _encode(positions: List[Dict], body) -> tuple:
+    """Cache entry for a ballot response: (body, etag, last_modified)"""
+    versions = sorted((position_key(ballot['position']), ballot['version']) for ballot in positions)
+    modified = [ballot['updated_at'] for ballot in positions if ballot['updated_at']]
+    last_modified = max(modified) if modified else None
+    return dumps(body), make_etag(versions, last_modified), last_modified
+
+async def _load_roster() -> tuple:
+    positions = sorted(
+        (_position_ballot(ballot) for ballot in await firestore_service.get_ballots()),
+        key=lambda ballot: ballot['position'] or ''
+    )
+    return _encode(positions, {
+        'version': sum(ballot['version'] for ballot in positions),
+        'positions': positions,
+    })
+
+async def _serve(request: Request, cache_key: Optional[str], load) -> Response:
+    cached = ballot_cache.get(cache_key)
+    if cached is None:
+        # Read before loading, so an approval during the load keeps the old roster out of the cache
+        generation = ballot_cache.generation
+        cached = await load()
+        ballot_cache.set(cache_key, cached, generation)
+
+    body, etag, last_modified = cached
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged is not None:
+        return unchanged
+    return Response(body, media_type="application/json", headers=validator_headers(etag, last_modified))
+
+@router.get("/ballots", response_model=BallotResponse)
+async def get_ballots(request: Request):
+    """Approved candidates for every position.
+
+    Served from the in-process ballot cache (BALLOT_CACHE_TTL), so most
+    ballot renders cost no Firestore read; a miss reads one document per
+    position. `version` grows whenever any position's roster changes, and
+    the ETag follows it.
+    """
+    try:
+        return await _serve(request, None, _load_roster)
+
+    except Exception as e:
+        logger.exception("Error in get_ballots")
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+@router.get("/ballots/{position}", response_model=PositionBallot)
+async def get_position_ballot(position: str, request: Request):
+    """Approved candidates for one position, at the cost of one document read or none"""
+    try:
+        key = position_key(position)
+
+        async def load():
+            ballots = await firestore_service.get_ballots(position)
+            if not ballots:
+                raise HTTPException(status_code=404, detail="No ballot for this position")
+            ballot = _position_ballot(ballots[0])
+            return _encode([ballot], ballot)
+
+        return await _serve(request, key, load)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error in get_position_ballot")
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+@router.post("/ballots/rebuild", response_model=dict)
+async def rebuild_ballots():
+    """Rewrite every ballot from the approved applications, e.g. after a manual data fix"""
+    try:
+        ballots = await firestore_service.rebuild_ballots()
+        invalidate_ballots()
+        return {"message": "Ballots rebuilt", "positions": len(ballots)}
+
+    except Exception as e:
+        logger.exception("Error in rebuild_ballots")
+        raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
+
+async def _warm_ballots():
+    """Load the full roster into the cache before election-day traffic arrives"""
+    generation = ballot_cache.generation
+    ballot_cache.set(None, await _load_roster(), generation)
+
+resources.add_warmup("ballots", _warm_ballots)
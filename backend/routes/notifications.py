@@ -1,31 +1,131 @@
 # backend/routes/notifications.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from firebase.firestore import firestore_service
-from models.schemas import NotificationResponse
-from typing import List
+from firebase.broadcast import BroadcastOwned
+from models.schemas import NotificationResponse, NotificationIds, BroadcastRequest
+from utils.notification_hub import notification_hub, Subscription
+from utils.admission import admit_write
+from utils.serialization import FastJSONResponse, dumps
+from utils.pagination import encode_page_token, decode_page_token
+from utils.conditional import notification_versions, make_etag, not_modified, validator_headers
+from typing import List, Optional
+import asyncio
+import os
 
 router = APIRouter()
 
+# Fields sent per notification, in NotificationResponse order
+NOTIFICATION_FIELDS = tuple(NotificationResponse.model_fields)
+
+# Largest page of notifications a client can request
+MAX_PAGE_SIZE = 500
+
+# Seconds between keep-alive comments on an idle notification stream
+STREAM_HEARTBEAT_INTERVAL = float(os.getenv("NOTIFICATION_STREAM_HEARTBEAT", 15))
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
+async def _notification_events(request: Request, subscription: Subscription, unread_count: int):
+    """Yield Server-Sent Events for one subscriber until the client goes away"""
+    try:
+        yield "retry: 5000\n\n"
+        yield _sse("ready", {"unread_count": unread_count})
+        
+        while True:
+            if subscription.overflowed:
+                # Events were dropped; the client should refetch its inbox
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.overflowed = False
+                yield _sse("resync", {})
+            
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=STREAM_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            
+            yield _sse(event['event'], event)
+    finally:
+        notification_hub.unsubscribe(subscription)
+
 @router.get("/notifications/{user_id}", response_model=List[NotificationResponse])
-async def get_notifications(user_id: str, user_type: str):
+async def get_notifications(
+    request: Request,
+    user_id: str,
+    user_type: str,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = None
+):
+    """A user's notifications, newest first.
+    
+    With `limit` only the latest page is returned; the token for the next
+    (older) page comes back in the X-Next-Page-Token header and is passed as
+    `before`.
+    
+    The ETag comes from the user's notification version marker, which every
+    notification change bumps, so an unchanged inbox is answered with 304
+    without reading Firestore.
+    """
     try:
-        notifications_data = await firestore_service.get_user_notifications(user_id, user_type)
+        version, modified_at = notification_versions.current((user_id, user_type))
+        etag = make_etag(version, user_id, user_type, limit, before)
+        unchanged = not_modified(request, etag, modified_at)
+        if unchanged is not None:
+            return unchanged
         
-        notifications_list = []
-        for notif_data in notifications_data:
-            notifications_list.append(NotificationResponse(**notif_data))
+        cursor = decode_page_token(before) if before else None
+        notifications = await firestore_service.get_user_notifications(
+            user_id, user_type, NOTIFICATION_FIELDS, limit=limit, before=cursor
+        )
         
-        return notifications_list
+        headers = validator_headers(etag, modified_at)
+        if limit and len(notifications) == limit:
+            last = notifications[-1]
+            headers['X-Next-Page-Token'] = encode_page_token(last['created_at'], last['id'])
+        return FastJSONResponse(notifications, headers=headers)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
 
-@router.put("/notifications/{notification_id}/read", response_model=dict)
+@router.get("/notifications/{user_id}/stream")
+async def stream_notifications(user_id: str, user_type: str, request: Request):
+    """Push notification changes to the client as Server-Sent Events"""
+    # Subscribe before counting, so a notification created meanwhile is at least streamed
+    subscription = notification_hub.subscribe(user_id, user_type)
+    response = None
+    try:
+        unread_count = await firestore_service.get_unread_notifications_count(user_id, user_type)
+        response = StreamingResponse(
+            _notification_events(request, subscription, unread_count),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            # Also runs when the client leaves before the body is iterated
+            background=BackgroundTask(notification_hub.unsubscribe, subscription)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
+    finally:
+        if response is None:
+            notification_hub.unsubscribe(subscription)
+    return response
+
+@router.put("/notifications/{notification_id}/read", response_model=dict, dependencies=[Depends(admit_write)])
 async def mark_notification_read(notification_id: str):
     try:
-        await firestore_service.mark_notification_read(notification_id)
+        if not await firestore_service.mark_notification_read(notification_id):
+            raise HTTPException(status_code=404, detail="Notification not found")
         return {"message": "Notification marked as read", "notification_id": notification_id}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
 
@@ -38,11 +138,115 @@ async def get_unread_notifications_count(user_id: str, user_type: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
 
-@router.delete("/notifications/{notification_id}", response_model=dict)
+@router.delete("/notifications/{notification_id}", response_model=dict, dependencies=[Depends(admit_write)])
 async def delete_notification(notification_id: str):
     try:
-        await firestore_service.delete_notification(notification_id)
+        if not await firestore_service.delete_notification(notification_id):
+            raise HTTPException(status_code=404, detail="Notification not found")
         return {"message": "Notification deleted successfully", "notification_id": notification_id}
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
+
+@router.post("/notifications/counters/reconcile", response_model=dict)
+async def reconcile_notification_counters():
+    try:
+        result = await firestore_service.reconcile_notification_counters()
+        return {"message": "Notification counters reconciled", **result}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
+@router.post("/notifications/compact", response_model=dict)
+async def compact_notifications():
+    """Apply the notification retention policy now instead of waiting for the background job"""
+    try:
+        result = await firestore_service.compact_notifications()
+        return {"message": "Notifications compacted", **result}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
+
+@router.put("/notifications/{user_id}/read-all", response_model=dict, dependencies=[Depends(admit_write)])
+async def mark_all_notifications_read(user_id: str, user_type: str):
+    """Mark every unread notification of a user as read"""
+    try:
+        marked = await firestore_service.mark_all_notifications_read(user_id, user_type)
+        return {"message": "All notifications marked as read", "user_id": user_id, "marked": marked}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
+
+@router.post("/notifications/bulk-read", response_model=dict, dependencies=[Depends(admit_write)])
+async def mark_notifications_read(request: NotificationIds):
+    """Mark the given notifications as read; unknown and already-read ids are skipped"""
+    try:
+        changed = await firestore_service.change_notifications(list(dict.fromkeys(request.ids)), delete=False)
+        return {"message": "Notifications marked as read", "marked": [notification['id'] for notification in changed]}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
+
+@router.post("/notifications/bulk-delete", response_model=dict, dependencies=[Depends(admit_write)])
+async def delete_notifications(request: NotificationIds):
+    """Delete the given notifications; unknown ids are skipped"""
+    try:
+        changed = await firestore_service.change_notifications(list(dict.fromkeys(request.ids)), delete=True)
+        return {"message": "Notifications deleted", "deleted": [notification['id'] for notification in changed]}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
+
+@router.post("/notifications/broadcast", response_model=dict, dependencies=[Depends(admit_write)])
+async def broadcast_notification(request: BroadcastRequest):
+    """Send an announcement to every student in an audience.
+    
+    `audience` is all_students, faculty (with `faculty`) or candidates.
+    Recipients are resolved and planned before the response, which is 202;
+    the notifications are written in the background in parallel batches.
+    Follow progress on GET /notifications/broadcasts/{broadcast_id}.
+    """
+    try:
+        if request.audience == 'faculty' and not request.faculty:
+            raise HTTPException(status_code=400, detail="faculty is required for the faculty audience")
+        
+        plan = await firestore_service.broadcast_notification(
+            request.title, request.message, request.audience, request.faculty
+        )
+        return FastJSONResponse({"message": "Broadcast started", **plan}, status_code=202)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
+
+@router.get("/notifications/broadcasts/{broadcast_id}", response_model=dict)
+async def get_broadcast(broadcast_id: str):
+    """Progress of a broadcast: chunks and notifications written so far"""
+    try:
+        report = await firestore_service.broadcasts.status(broadcast_id)
+        if report is None:
+            raise HTTPException(status_code=404, detail="Broadcast not found")
+        return FastJSONResponse(report)
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
+
+@router.post("/notifications/broadcasts/{broadcast_id}/resume", response_model=dict, dependencies=[Depends(admit_write)])
+async def resume_broadcast(broadcast_id: str):
+    """Send whatever an interrupted broadcast has not delivered yet"""
+    try:
+        result = await firestore_service.broadcasts.resume(broadcast_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Broadcast not found")
+        return result
+        
+    except BroadcastOwned as e:
+        raise HTTPException(status_code=409, detail=f"Broadcast is being sent by {e}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Firestore error: {str(e)}")
@@ -0,0 +1,169 @@
+# backend/utils/admission.py
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+
+from utils.metrics import metrics
+
+ADMISSION_REJECTIONS = metrics.counter(
+    "admission_rejections_total", "Requests shed with 429 by admission control", ("gate", "reason")
+)
+
+
+def _too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=detail,
+        headers={'Retry-After': str(max(1, math.ceil(retry_after)))}
+    )
+
+
+class AdmissionGate:
+    """Global concurrency limit with a bounded wait queue.
+
+    Up to `max_concurrent` requests run at once and up to `max_queue` more
+    wait, each for at most `queue_timeout` seconds. Anything beyond that is
+    rejected straight away with 429 and Retry-After, so an overload sheds
+    requests instead of queueing them into Firestore timeouts.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float, retry_after: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self._stats = {'admitted': 0, 'queued': 0, 'rejected_queue_full': 0, 'rejected_timeout': 0}
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        return self._slots
+
+    def _reject(self, reason: str) -> HTTPException:
+        self._stats[f"rejected_{reason}"] += 1
+        ADMISSION_REJECTIONS.inc(gate=self.name, reason=reason)
+        return _too_many_requests("Server is busy, please retry shortly", self.retry_after)
+
+    @asynccontextmanager
+    async def admit(self):
+        """Hold a slot for the duration of the block, or raise a 429 HTTPException"""
+        if self.slots.locked():
+            if self.waiting >= self.max_queue:
+                raise self._reject('queue_full')
+            self._stats['queued'] += 1
+            self.waiting += 1
+            acquired = False
+            try:
+                # Unlike wait_for, timeout() awaits acquire() in this task, so a granted permit is never dropped
+                async with asyncio.timeout(self.queue_timeout):
+                    await self.slots.acquire()
+                    acquired = True
+            except BaseException as e:
+                if acquired:
+                    # Timed out or cancelled after the permit was granted; give it back
+                    self.slots.release()
+                if isinstance(e, asyncio.TimeoutError):
+                    raise self._reject('timeout')
+                raise
+            finally:
+                self.waiting -= 1
+        else:
+            await self.slots.acquire()
+
+        self._stats['admitted'] += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.slots.release()
+
+    def get_stats(self) -> Dict:
+        return {
+            **self._stats,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'max_concurrent': self.max_concurrent,
+            'max_queue': self.max_queue,
+        }
+
+
+class RateLimiter:
+    """Token bucket per key, e.g. per studentId.
+
+    Each key refills at `rate` tokens per second up to `burst`. Only the
+    `max_keys` most recently seen keys are tracked; a forgotten key simply
+    starts again with a full bucket.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, max_keys: int = 10000):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'allowed': 0, 'limited': 0}
+
+    def check(self, key: str):
+        """Take a token for `key`, raising a 429 HTTPException when the bucket is empty"""
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            self._stats['allowed' if allowed else 'limited'] += 1
+
+        if not allowed:
+            ADMISSION_REJECTIONS.inc(gate=self.name, reason='rate_limited')
+            raise _too_many_requests("Too many requests, please slow down", (1 - tokens) / self.rate)
+
+    def get_stats(self) -> Dict:
+        return {**self._stats, 'tracked_keys': len(self._buckets), 'rate': self.rate, 'burst': self.burst}
+
+# Create global instances
+write_gate = AdmissionGate(
+    "writes",
+    max_concurrent=int(os.getenv("WRITE_MAX_CONCURRENCY", 32)),
+    max_queue=int(os.getenv("WRITE_MAX_QUEUE", 128)),
+    queue_timeout=float(os.getenv("WRITE_QUEUE_TIMEOUT", 2)),
+    retry_after=float(os.getenv("WRITE_RETRY_AFTER", 2)),
+)
+submission_limiter = RateLimiter(
+    "submissions",
+    rate=float(os.getenv("SUBMISSION_RATE_PER_MINUTE", 2)) / 60,
+    burst=float(os.getenv("SUBMISSION_BURST", 3)),
+)
+
+
+async def admit_write():
+    """Route dependency that runs the request inside the global write gate"""
+    async with write_gate.admit():
+        yield
+
+
+metrics.gauge_callback(
+    "admission_in_flight", "Requests holding an admission slot", lambda: {(write_gate.name,): write_gate.in_flight}, ("gate",)
+)
+metrics.gauge_callback(
+    "admission_waiting", "Requests queued for an admission slot", lambda: {(write_gate.name,): write_gate.waiting}, ("gate",)
+)
@@ -0,0 +1,33 @@
+# backend/utils/background.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+_tasks: List[asyncio.Task] = []
+
+
+async def _repeat(name: str, interval: float, job: Callable[[], Awaitable]):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await job()
+        except Exception:
+            logger.exception("Background job %s failed", name)
+
+
+def schedule_periodic(name: str, interval: float, job: Callable[[], Awaitable]):
+    """Run a job every `interval` seconds until shutdown; a non-positive interval disables it"""
+    if interval <= 0:
+        return
+    _tasks.append(asyncio.create_task(_repeat(name, interval, job), name=name))
+    logger.info("Scheduled background job %s every %ss", name, f"{interval:g}")
+
+
+async def cancel_periodic():
+    """Stop every scheduled job"""
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,164 @@
+# backend/utils/cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from utils.conditional import Marker, application_versions
+from utils.local_bus import local_bus
+from utils.metrics import metrics
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries also expire after a fixed TTL.
+
+    Every invalidation advances the cache's generation. A miss that reads
+    `generation` before loading and passes it to set() stores nothing if
+    an invalidation happened meanwhile, so a load that started before a
+    write cannot cache what the write replaced.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {
+            'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0, 'stale_fills': 0
+        }
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> bool:
+        """Store a value; False (nothing stored) when invalidated since `generation` was read"""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self._stats['stale_fills'] += 1
+                return False
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+            return True
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(key, None) is not None:
+                self._stats['invalidations'] += 1
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """Drop every entry whose key matches the predicate"""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+                self._stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hit_ratio': round(self._stats['hits'] / lookups, 4) if lookups else 0.0,
+            }
+
+
+class ApplicationCache:
+    """Read-through cache for candidate applications.
+
+    Single applications are keyed by id; list results are keyed by
+    (status, limit, page_token, fields) so they can be dropped per status filter
+    when a write moves an application in or out of that filter.
+    """
+
+    def __init__(self):
+        ttl = float(os.getenv("APPLICATION_CACHE_TTL", 30))
+        self.by_id = TTLCache("applications_by_id", int(os.getenv("APPLICATION_CACHE_SIZE", 2000)), ttl)
+        self.lists = TTLCache("application_lists", int(os.getenv("APPLICATION_LIST_CACHE_SIZE", 128)), ttl)
+
+    def invalidate_application(self, application_id: str, *statuses: Optional[str]):
+        """Forget an application and every list that could contain it, in every worker"""
+        marker = self.drop_application(application_id, *statuses)
+        local_bus.publish('application', {'id': application_id, 'statuses': list(statuses), 'marker': marker})
+
+    def drop_application(self, application_id: str, *statuses: Optional[str],
+                         marker: Optional[Marker] = None) -> Marker:
+        """invalidate_application for this process only"""
+        marker = application_versions.bump('candidate_applications', marker)
+        self.by_id.invalidate(application_id)
+        affected = {None, *statuses}
+        self.lists.invalidate_where(lambda key: key[0] in affected)
+        return marker
+
+    def clear(self):
+        self.by_id.clear()
+        self.lists.clear()
+
+    def get_stats(self) -> Dict:
+        return {
+            'by_id': self.by_id.get_stats(),
+            'lists': self.lists.get_stats(),
+        }
+
+# Create global instances
+application_cache = ApplicationCache()
+
+# Encoded ballots keyed by position (None for the whole roster); writers clear it on approval changes
+ballot_cache = TTLCache("ballots", 64, float(os.getenv("BALLOT_CACHE_TTL", 15)))
+
+
+def invalidate_ballots():
+    """Drop every cached ballot, in every worker"""
+    ballot_cache.clear()
+    local_bus.publish('ballots', {})
+
+# Writes in other workers invalidate this worker's caches too
+local_bus.subscribe('application', lambda message: application_cache.drop_application(
+    message['id'], *message['statuses'], marker=message.get('marker')
+))
+local_bus.subscribe('ballots', lambda message: ballot_cache.clear())
+
+metrics.gauge_callback(
+    "application_cache_entries", "Entries held by each application cache",
+    lambda: {(cache.name,): cache.get_stats()['size'] for cache in (application_cache.by_id, application_cache.lists, ballot_cache)},
+    ("cache",)
+)
+metrics.gauge_callback(
+    "application_cache_hit_ratio", "Hit ratio of each application cache since startup",
+    lambda: {(cache.name,): cache.get_stats()['hit_ratio'] for cache in (application_cache.by_id, application_cache.lists, ballot_cache)},
+    ("cache",)
+)
@@ -0,0 +1,130 @@
+# backend/utils/conditional.py
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+
+# Validators are revalidated on every use rather than cached by heuristics
+CACHE_CONTROL = "private, no-cache"
+
+# A change to a list: a random token and when it happened (epoch seconds)
+Marker = Tuple[str, float]
+
+
+class VersionMarkers:
+    """Cheap version numbers for lists, bumped by the write paths.
+
+    A list's ETag is built from its marker, so a conditional request is
+    answered with 304 before any Firestore read. A bump draws a random
+    token, and the writer passes the same (token, time) to the other
+    workers over the local bus, so every worker behind the load balancer
+    serves the same ETag for the same state; when bumps cross, every
+    worker keeps the latest one. Writes on other hosts are not seen here,
+    so versions also roll over every `max_age` seconds of wall-clock time,
+    in step across workers; a 304 is then never staler than the
+    application cache already is. Only the `maxsize` most recently used
+    markers are kept; a forgotten one reads as unchanged until the next
+    rollover.
+    """
+
+    def __init__(self, name: str, max_age: float, maxsize: int = 10000):
+        self.name = name
+        self.max_age = max_age
+        self.maxsize = maxsize
+        self._markers: "OrderedDict[Hashable, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bump(self, key: Hashable, marker: Optional[Sequence] = None) -> Marker:
+        """Record that whatever `key` covers has changed; returns the marker to hand to other workers"""
+        if marker is None:
+            marker = (uuid.uuid4().hex[:12], time.time())
+        token, changed_at = marker
+        with self._lock:
+            if self._markers.get(key, (float('-inf'), '')) < (changed_at, token):
+                self._markers[key] = (changed_at, token)
+            self._markers.move_to_end(key)
+            while len(self._markers) > self.maxsize:
+                self._markers.popitem(last=False)
+        return token, changed_at
+
+    def current(self, key: Hashable) -> Tuple[str, datetime]:
+        """The marker's version string and when it last changed"""
+        now = time.time()
+        if self.max_age > 0:
+            window = int(now // self.max_age)
+            window_start = window * self.max_age
+        else:
+            window, window_start = time.time_ns(), now
+        with self._lock:
+            changed_at, token = self._markers.get(key, (window_start, '0'))
+            if key in self._markers:
+                self._markers.move_to_end(key)
+        modified_at = datetime.fromtimestamp(max(changed_at, window_start), timezone.utc)
+        return f"{token}.{window}", modified_at
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the given parts; weak because gzip may re-encode the body"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # Timestamps in responses are UTC without tzinfo
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {'ETag': etag, 'Cache-Control': CACHE_CONTROL}
+    if last_modified is not None:
+        headers['Last-Modified'] = format_datetime(_as_utc(last_modified).replace(microsecond=0), usegmt=True)
+    return headers
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> Optional[Response]:
+    """A 304 response when the request's validators still match, otherwise None.
+
+    If-None-Match wins over If-Modified-Since, as RFC 9110 requires.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or last_modified is None:
+            return None
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        # HTTP dates have whole seconds
+        matched = _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+    if not matched:
+        return None
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+# Create global instances
+_marker_age = float(os.getenv("VERSION_MARKER_MAX_AGE", os.getenv("APPLICATION_CACHE_TTL", 30)))
+application_versions = VersionMarkers("applications", _marker_age, maxsize=1)
+notification_versions = VersionMarkers("notifications", _marker_age)
@@ -0,0 +1,201 @@
+# backend/utils/email_dispatcher.py
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from utils.email_service import EmailService, email_service
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboundEmail:
+    to_email: str
+    subject: str
+    body: str
+    attempts: int = 0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    last_error: Optional[str] = None
+
+
+class EmailDispatcher:
+    """Background email sender.
+
+    Routes enqueue messages and return immediately; worker tasks drain the
+    queue on a dedicated thread pool so SMTP never blocks the event loop.
+    Each worker thread reuses the pooled, authenticated connections held by
+    the EmailService. Failed sends are retried with exponential backoff and
+    end up in a bounded dead-letter list once attempts are exhausted.
+    """
+
+    def __init__(self, service: EmailService):
+        self.service = service
+        self.worker_count = int(os.getenv("EMAIL_WORKERS", 2))
+        self.max_queue_size = int(os.getenv("EMAIL_QUEUE_SIZE", 1000))
+        self.max_attempts = int(os.getenv("EMAIL_MAX_ATTEMPTS", 5))
+        self.backoff_base = float(os.getenv("EMAIL_BACKOFF_BASE", 2.0))
+        self.backoff_max = float(os.getenv("EMAIL_BACKOFF_MAX", 300.0))
+        self.dead_letters = deque(maxlen=int(os.getenv("EMAIL_DEAD_LETTER_LIMIT", 500)))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._retry_handles = set()
+        self._stats = {
+            'enqueued': 0,
+            'sent': 0,
+            'failed_attempts': 0,
+            'retried': 0,
+            'dead_lettered': 0,
+            'dropped': 0,
+            'max_queue_depth': 0,
+        }
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        return self._queue
+
+    async def start(self):
+        """Start the worker tasks on the running event loop"""
+        if self._workers:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.worker_count,
+            thread_name_prefix="email-sender"
+        )
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"email-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info("Email dispatcher started with %d workers", self.worker_count)
+
+    async def stop(self, drain_timeout: float = 10.0):
+        """Give queued messages a chance to go out, then stop the workers"""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Email dispatcher stopped with %d messages still queued", self.queue.qsize())
+
+        for handle in self._retry_handles:
+            handle.cancel()
+        self._retry_handles.clear()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self.service.close()
+
+    def enqueue(self, to_email: str, subject: str, body: str) -> bool:
+        """Queue a message for background delivery without waiting on SMTP"""
+        if not self.service.is_configured:
+            logger.debug("Email credentials not configured. Skipping email send.")
+            return False
+
+        self._stats['enqueued'] += 1
+        return self._put(OutboundEmail(to_email=to_email, subject=subject, body=body))
+
+    def _put(self, message: OutboundEmail) -> bool:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self._stats['dropped'] += 1
+            message.last_error = "queue full"
+            self._dead_letter(message)
+            return False
+
+        self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self.queue.qsize())
+        return True
+
+    def _dead_letter(self, message: OutboundEmail):
+        self._stats['dead_lettered'] += 1
+        self.dead_letters.append(message)
+        logger.error("Email to %s moved to dead letters: %s", message.to_email, message.last_error)
+
+    def _schedule_retry(self, message: OutboundEmail):
+        delay = min(self.backoff_base * (2 ** (message.attempts - 1)), self.backoff_max)
+        self._stats['retried'] += 1
+
+        def requeue():
+            self._retry_handles.discard(handle)
+            self._put(message)
+
+        handle = asyncio.get_running_loop().call_later(delay, requeue)
+        self._retry_handles.add(handle)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await self.queue.get()
+            try:
+                message.attempts += 1
+                await loop.run_in_executor(
+                    self._executor,
+                    self.service.deliver,
+                    message.to_email,
+                    message.subject,
+                    message.body
+                )
+                self._stats['sent'] += 1
+            except Exception as e:
+                self._stats['failed_attempts'] += 1
+                message.last_error = str(e)
+                if message.attempts >= self.max_attempts:
+                    self._dead_letter(message)
+                else:
+                    logger.warning("Email to %s failed (attempt %d): %s", message.to_email, message.attempts, e)
+                    self._schedule_retry(message)
+            finally:
+                self.queue.task_done()
+
+    def get_metrics(self) -> Dict:
+        return {
+            **self._stats,
+            'queue_depth': self.queue.qsize(),
+            'pending_retries': len(self._retry_handles),
+            'dead_letter_count': len(self.dead_letters),
+            'workers': len(self._workers),
+        }
+
+    def send_application_submitted_email(self, student_name: str, student_email: str, position: str, party_name: str):
+        """Queue the application submitted confirmation email"""
+        subject, body = self.service.build_application_submitted_email(student_name, position, party_name)
+        return self.enqueue(student_email, subject, body)
+
+    def send_application_approved_email(self, student_name: str, student_email: str, position: str, party_name: str):
+        """Queue the application approved email"""
+        subject, body = self.service.build_application_approved_email(student_name, position, party_name)
+        return self.enqueue(student_email, subject, body)
+
+    def send_application_rejected_email(self, student_name: str, student_email: str, position: str, rejection_reason: str):
+        """Queue the application rejected email"""
+        subject, body = self.service.build_application_rejected_email(student_name, position, rejection_reason)
+        return self.enqueue(student_email, subject, body)
+
+# Create global instance
+email_dispatcher = EmailDispatcher(email_service)
+
+metrics.gauge_callback(
+    "email_queue_depth", "Emails waiting for a sender worker",
+    lambda: email_dispatcher.queue.qsize()
+)
+metrics.gauge_callback(
+    "email_dead_letters", "Emails that exhausted their delivery attempts",
+    lambda: len(email_dispatcher.dead_letters)
+)
+metrics.gauge_callback(
+    "email_pending_retries", "Emails waiting out a retry backoff",
+    lambda: len(email_dispatcher._retry_handles)
+)
@@ -1,8 +1,17 @@
 # backend/utils/email_service.py
 import smtplib
+import logging
 import os
+import queue
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SMTP_SEND_DURATION = metrics.histogram("smtp_send_duration_seconds", "Time to hand one message to the SMTP server")
+SMTP_SEND_FAILURES = metrics.counter("smtp_send_failures_total", "Messages the SMTP server did not accept", ("error",))
+SMTP_CONNECTIONS_OPENED = metrics.counter("smtp_connections_opened_total", "Authenticated SMTP connections opened")
 
 class EmailService:
     def __init__(self):
@@ -10,37 +19,121 @@ class EmailService:
         self.smtp_port = int(os.getenv("SMTP_PORT", 587))
         self.email = os.getenv("NOTIFICATION_EMAIL")
         self.password = os.getenv("EMAIL_PASSWORD")
-        print(f"Email service initialized with server: {self.smtp_server}")
+        self.smtp_timeout = float(os.getenv("SMTP_TIMEOUT", 30))
+        
+        # Authenticated connections kept open between messages
+        self._idle_connections = queue.LifoQueue(maxsize=int(os.getenv("SMTP_POOL_SIZE", 2)))
+        logger.info("Email service initialized with server: %s", self.smtp_server)
+    
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.email and self.password)
+    
+    def _open_connection(self) -> smtplib.SMTP:
+        """Open, secure and authenticate a new SMTP connection"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.smtp_timeout)
+        try:
+            server.starttls()
+            server.login(self.email, self.password)
+        except Exception:
+            # A half-open connection would otherwise keep its socket until garbage collection
+            server.close()
+            raise
+        SMTP_CONNECTIONS_OPENED.inc()
+        return server
+    
+    def _acquire_connection(self) -> smtplib.SMTP:
+        """Reuse an idle authenticated connection, or open a new one"""
+        try:
+            return self._idle_connections.get_nowait()
+        except queue.Empty:
+            return self._open_connection()
+    
+    def _release_connection(self, server: smtplib.SMTP):
+        """Return a healthy connection to the pool, closing it if the pool is full"""
+        try:
+            self._idle_connections.put_nowait(server)
+        except queue.Full:
+            self._close_connection(server)
+    
+    def _close_connection(self, server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def reset_after_fork(self):
+        """Forget connections inherited from the parent; their sockets belong to it"""
+        self._idle_connections = queue.LifoQueue(maxsize=self._idle_connections.maxsize)
+    
+    def close(self):
+        """Close every pooled SMTP connection"""
+        while True:
+            try:
+                server = self._idle_connections.get_nowait()
+            except queue.Empty:
+                break
+            self._close_connection(server)
+    
+    def build_message(self, to_email: str, subject: str, body: str) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = self.email
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        
+        msg.attach(MIMEText(body, 'html'))
+        return msg
+    
+    def deliver(self, to_email: str, subject: str, body: str):
+        """Send a message over a pooled connection, raising on failure.
+        
+        A pooled connection the server has since dropped is replaced once
+        before giving up.
+        """
+        msg = self.build_message(to_email, subject, body)
+        
+        try:
+            with SMTP_SEND_DURATION.time():
+                self._deliver_message(msg)
+        except Exception as e:
+            SMTP_SEND_FAILURES.inc(error=type(e).__name__)
+            raise
+    
+    def _deliver_message(self, msg: MIMEMultipart):
+        for attempt in range(2):
+            server = self._acquire_connection()
+            try:
+                server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                server.close()
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                self._close_connection(server)
+                raise
+            
+            self._release_connection(server)
+            return
     
     def send_email(self, to_email: str, subject: str, body: str) -> bool:
         """Send email notification"""
         try:
-            if not self.email or not self.password:
-                print("Email credentials not configured. Skipping email send.")
+            if not self.is_configured:
+                logger.debug("Email credentials not configured. Skipping email send.")
                 return False
-                
-            msg = MIMEMultipart()
-            msg['From'] = self.email
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'html'))
             
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email, self.password)
-            server.send_message(msg)
-            server.quit()
+            self.deliver(to_email, subject, body)
             
-            print(f"Email sent successfully to {to_email}")
+            logger.info("Email sent successfully to %s", to_email, extra={'sample': 'email_sent'})
             return True
             
         except Exception as e:
-            print(f"Email sending failed to {to_email}: {e}")
+            logger.error("Email sending failed to %s: %s", to_email, e)
             return False
     
-    def send_application_submitted_email(self, student_name: str, student_email: str, position: str, party_name: str):
-        """Send application submitted confirmation email"""
+    def build_application_submitted_email(self, student_name: str, position: str, party_name: str):
+        """Build the subject and body of the application submitted confirmation email"""
         subject = "Candidate Application Received - UB Voting System"
         body = f"""
         <h3>Dear {student_name},</h3>
@@ -49,10 +142,15 @@ class EmailService:
         <p>Your application is now under review by the election committee. You will be notified once a decision is made.</p>
         <p>Best regards,<br>UB Voting System Team</p>
         """
+        return subject, body
+    
+    def send_application_submitted_email(self, student_name: str, student_email: str, position: str, party_name: str):
+        """Send application submitted confirmation email"""
+        subject, body = self.build_application_submitted_email(student_name, position, party_name)
         return self.send_email(student_email, subject, body)
     
-    def send_application_approved_email(self, student_name: str, student_email: str, position: str, party_name: str):
-        """Send application approved email"""
+    def build_application_approved_email(self, student_name: str, position: str, party_name: str):
+        """Build the subject and body of the application approved email"""
         subject = "Candidate Application Approved - UB Voting System"
         body = f"""
         <h3>Congratulations {student_name}!</h3>
@@ -61,10 +159,15 @@ class EmailService:
         <p><strong>Party:</strong> {party_name}</p>
         <p>Best of luck with your campaign!<br>UB Voting System Team</p>
         """
+        return subject, body
+    
+    def send_application_approved_email(self, student_name: str, student_email: str, position: str, party_name: str):
+        """Send application approved email"""
+        subject, body = self.build_application_approved_email(student_name, position, party_name)
         return self.send_email(student_email, subject, body)
     
-    def send_application_rejected_email(self, student_name: str, student_email: str, position: str, rejection_reason: str):
-        """Send application rejected email"""
+    def build_application_rejected_email(self, student_name: str, position: str, rejection_reason: str):
+        """Build the subject and body of the application rejected email"""
         rejection_reasons = {
             "insufficient_qualifications": "Your qualifications and experience do not meet the requirements for this position.",
             "position_filled": "This position has already been filled by other qualified candidates.",
@@ -85,7 +188,13 @@ class EmailService:
         <p>We encourage you to gain more experience and consider applying again in future elections.</p>
         <p>Thank you for your interest in student leadership.<br>UB Voting System Team</p>
         """
+        return subject, body
+    
+    def send_application_rejected_email(self, student_name: str, student_email: str, position: str, rejection_reason: str):
+        """Send application rejected email"""
+        subject, body = self.build_application_rejected_email(student_name, position, rejection_reason)
         return self.send_email(student_email, subject, body)
 
 # Create global instance
-email_service = EmailService()
\ No newline at end of file
+email_service = EmailService()
+os.register_at_fork(after_in_child=email_service.reset_after_fork)
\ No newline at end of file
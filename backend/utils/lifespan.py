@@ -0,0 +1,163 @@
+# backend/utils/lifespan.py
+import asyncio
+import logging
+import os
+import time
+
+# Taken before the Firebase SDK is imported, so startup timings include import cost
+_imported_at = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from firebase.executor import firestore_executor
+from firebase.firestore import firestore_service, get_db
+from utils.background import schedule_periodic, cancel_periodic
+from utils.email_dispatcher import email_dispatcher
+from utils.local_bus import local_bus
+from utils.search_index import application_index
+from utils.submission_journal import submission_journal
+
+logger = logging.getLogger(__name__)
+
+
+class AppResources:
+    """Clients and background workers owned by the running app.
+
+    Nothing here connects at import time: the Firestore client is created
+    when the app starts (or on first use outside the app), and warm-up hooks
+    registered by the routes run only when FIRESTORE_WARMUP is enabled.
+    Each startup step is timed so cold-start cost per worker is visible on
+    /health.
+
+    With several workers, every worker runs start() after it has been
+    spawned or forked and joins the local bus; jobs that work on shared data
+    (compaction, reconciles, aggregate backfill, broadcast resume) run only
+    in the bus leader.
+    """
+
+    def __init__(self):
+        self.warmup_enabled = os.getenv("FIRESTORE_WARMUP", "false").lower() in ("1", "true", "yes")
+        self.timings: Dict[str, float] = {}
+        self._warmups: List[Tuple[str, Callable[[], Awaitable]]] = []
+        self._index_load: Optional[asyncio.Task] = None
+        self._backfill: Optional[asyncio.Task] = None
+
+    def add_warmup(self, name: str, hook: Callable[[], Awaitable]):
+        """Register a coroutine that fills a cache before traffic arrives"""
+        self._warmups.append((name, hook))
+
+    async def _timed(self, name: str, step: Callable[[], Awaitable]):
+        started = time.perf_counter()
+        try:
+            await step()
+        finally:
+            self.timings[name] = round(time.perf_counter() - started, 4)
+
+    async def warm_up(self):
+        """Open the gRPC channel with a tiny query, then run the registered cache warmers"""
+        await firestore_executor.run(
+            lambda: list(firestore_service.collection('candidate_applications').limit(1).stream())
+        )
+        for name, hook in self._warmups:
+            try:
+                await self._timed(f"warmup_{name}", hook)
+            except Exception as e:
+                logger.warning("Warm-up %s failed: %s", name, e)
+
+    async def _load_search_index(self):
+        try:
+            await self._timed('application_index', application_index.ensure_loaded)
+        except Exception as e:
+            logger.warning("Search index load failed, retrying on first search: %s", e)
+    
+    async def _backfill_aggregates(self):
+        try:
+            built = await firestore_service.backfill_aggregates()
+            if built:
+                logger.info("Backfilled aggregates: %s", ", ".join(built))
+        except Exception:
+            logger.exception("Aggregate backfill failed, retrying on next start")
+    
+    async def start(self):
+        self.timings['import'] = round(time.perf_counter() - _imported_at, 4)
+        started = time.perf_counter()
+
+        await self._timed('local_bus', local_bus.start)
+        await self._timed('firestore_client', lambda: firestore_executor.run(get_db))
+        await self._timed('email_dispatcher', email_dispatcher.start)
+        # Replays submissions accepted before the last shutdown
+        await self._timed('submission_journal', submission_journal.start)
+        
+        if local_bus.is_leader:
+            schedule_periodic(
+                "notification-counter-reconcile",
+                float(os.getenv("NOTIFICATION_COUNTER_RECONCILE_INTERVAL", 0)),
+                firestore_service.reconcile_notification_counters
+            )
+            schedule_periodic(
+                "notification-compaction",
+                float(os.getenv("NOTIFICATION_COMPACTION_INTERVAL", 3600)),
+                firestore_service.compact_notifications
+            )
+            schedule_periodic(
+                "application-stats-rebuild",
+                float(os.getenv("APPLICATION_STATS_REBUILD_INTERVAL", 0)),
+                firestore_service.rebuild_application_statistics
+            )
+            
+            # Counters and rosters written before incremental upkeep get one full build
+            self._backfill = asyncio.create_task(self._backfill_aggregates())
+            
+            # Broadcasts interrupted by the last shutdown pick up their remaining chunks
+            try:
+                await self._timed('broadcast_resume', firestore_service.broadcasts.resume_unfinished)
+            except Exception:
+                logger.exception("Resuming broadcasts failed")
+        
+        # The search index loads in the background; searches wait for it
+        self._index_load = asyncio.create_task(self._load_search_index())
+        schedule_periodic(
+            "application-index-refresh",
+            float(os.getenv("APPLICATION_INDEX_REFRESH_INTERVAL", 300)),
+            application_index.refresh
+        )
+        if self.warmup_enabled:
+            await self._timed('warmup', self.warm_up)
+
+        self.timings['startup'] = round(time.perf_counter() - started, 4)
+        self.timings['cold_start'] = round(time.perf_counter() - _imported_at, 4)
+        logger.info("Worker %d ready in %ss", os.getpid(), self.timings['cold_start'], extra={'timings': self.timings})
+
+    async def stop(self):
+        for task in (self._index_load, self._backfill):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        await cancel_periodic()
+        await firestore_service.broadcasts.stop()
+        # Drained submissions queue emails, so the journal stops first
+        await submission_journal.stop()
+        await email_dispatcher.stop()
+        await local_bus.stop()
+        firestore_executor.shutdown()
+
+    def get_stats(self) -> Dict:
+        return {
+            'pid': os.getpid(),
+            'leader': local_bus.is_leader,
+            'warmup_enabled': self.warmup_enabled,
+            'timings': self.timings,
+        }
+
+# Create global instance
+resources = AppResources()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await resources.start()
+    try:
+        yield
+    finally:
+        await resources.stop()
@@ -0,0 +1,199 @@
+# backend/utils/local_bus.py
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import socket
+from typing import Callable, Dict, List, Optional
+
+from utils.metrics import metrics
+from utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Directory shared by the workers of one server: bus sockets and the leader lock
+RUN_DIR_ENV = "LOCAL_BUS_DIR"
+
+# Messages are packed into datagrams of at most this many bytes
+MAX_DATAGRAM = 60000
+
+BUS_MESSAGES = metrics.counter(
+    "local_bus_messages_total", "Cache invalidation messages exchanged with other workers", ("direction",)
+)
+
+
+class _Receiver(asyncio.DatagramProtocol):
+    def __init__(self, bus: "LocalBus"):
+        self.bus = bus
+
+    def datagram_received(self, data: bytes, addr):
+        self.bus._dispatch(data)
+
+
+class LocalBus:
+    """Fan-out of cache invalidations between the worker processes of one server.
+
+    Every worker binds a Unix datagram socket in the shared run directory
+    (LOCAL_BUS_DIR). publish() sends a small message to every other
+    worker's socket; the receivers run the handlers subscribed to its
+    topic on their event loop. Messages published in one loop iteration
+    are packed into as few datagrams as possible, and a peer that has gone
+    away simply has its socket removed. Without LOCAL_BUS_DIR (a single
+    process) the bus is off and publish() does nothing.
+
+    The same directory holds the leader lock: exactly one live worker owns
+    it and runs the jobs that must not run once per worker.
+    """
+
+    def __init__(self):
+        self.run_dir: Optional[str] = os.getenv(RUN_DIR_ENV) or None
+        self._handlers: Dict[str, List[Callable[[Dict], None]]] = {}
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._sender: Optional[socket.socket] = None
+        self._path: Optional[str] = None
+        self._outbox: List[Dict] = []
+        self._flush_scheduled = False
+        self._leader_file = None
+        self._stats = {'published': 0, 'received': 0, 'datagrams_sent': 0, 'peers_removed': 0, 'send_errors': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self._transport is not None
+
+    @property
+    def is_leader(self) -> bool:
+        """True for the one worker that runs server-wide jobs (always true in a single process)"""
+        return self.run_dir is None or self._leader_file is not None
+
+    def subscribe(self, topic: str, handler: Callable[[Dict], None]):
+        """Run handler(message) whenever another worker publishes on the topic"""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def _claim_leadership(self):
+        lock = open(os.path.join(self.run_dir, "leader.lock"), "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return
+        # Released by the OS when this process exits, so a restarted worker can take over
+        self._leader_file = lock
+
+    async def start(self):
+        if self.run_dir is None or self._transport is not None:
+            return
+        os.makedirs(self.run_dir, exist_ok=True)
+        self._claim_leadership()
+
+        self._path = os.path.join(self.run_dir, f"worker-{os.getpid()}.sock")
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _Receiver(self), local_addr=self._path, family=socket.AF_UNIX
+        )
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)
+        role = "leader" if self.is_leader else "follower"
+        logger.info("Worker %d joined the local bus at %s as %s", os.getpid(), self.run_dir, role)
+
+    async def stop(self):
+        if self._transport is None:
+            return
+        self._flush()
+        self._transport.close()
+        self._transport = None
+        self._sender.close()
+        self._sender = None
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+        if self._leader_file is not None:
+            self._leader_file.close()
+            self._leader_file = None
+
+    def publish(self, topic: str, message: Dict):
+        """Queue a message for every other worker; sent at the end of this loop iteration"""
+        if self._transport is None:
+            return
+        self._stats['published'] += 1
+        self._outbox.append({'topic': topic, **message})
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _peers(self) -> List[str]:
+        own = os.path.basename(self._path)
+        return [
+            os.path.join(self.run_dir, name) for name in os.listdir(self.run_dir)
+            if name.startswith("worker-") and name.endswith(".sock") and name != own
+        ]
+
+    def _datagrams(self) -> List[bytes]:
+        datagrams = []
+        chunk: List[bytes] = []
+        size = 2
+        for message in self._outbox:
+            encoded = dumps(message)
+            if chunk and size + len(encoded) + 1 > MAX_DATAGRAM:
+                datagrams.append(b"[" + b",".join(chunk) + b"]")
+                chunk, size = [], 2
+            chunk.append(encoded)
+            size += len(encoded) + 1
+        if chunk:
+            datagrams.append(b"[" + b",".join(chunk) + b"]")
+        return datagrams
+
+    def _flush(self):
+        self._flush_scheduled = False
+        if not self._outbox or self._sender is None:
+            self._outbox = []
+            return
+        datagrams = self._datagrams()
+        BUS_MESSAGES.inc(len(self._outbox), direction='sent')
+        self._outbox = []
+
+        for peer in self._peers():
+            for datagram in datagrams:
+                try:
+                    self._sender.sendto(datagram, peer)
+                    self._stats['datagrams_sent'] += 1
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # The worker is gone; forget its socket
+                    try:
+                        os.unlink(peer)
+                        self._stats['peers_removed'] += 1
+                    except FileNotFoundError:
+                        pass
+                    break
+                except OSError as e:
+                    # A full receive buffer; the peer's caches still expire by TTL
+                    self._stats['send_errors'] += 1
+                    logger.warning("Local bus send to %s failed: %s", peer, e)
+                    break
+
+    def _dispatch(self, data: bytes):
+        try:
+            messages = json.loads(data)
+        except ValueError:
+            return
+        self._stats['received'] += len(messages)
+        BUS_MESSAGES.inc(len(messages), direction='received')
+        for message in messages:
+            for handler in self._handlers.get(message.get('topic'), ()):
+                try:
+                    handler(message)
+                except Exception:
+                    logger.exception("Local bus handler for %s failed", message.get('topic'))
+
+    def get_stats(self) -> Dict:
+        return {
+            **self._stats,
+            'enabled': self.enabled,
+            'leader': self.is_leader,
+            'run_dir': self.run_dir,
+            'peers': len(self._peers()) if self.enabled else 0,
+        }
+
+# Create global instance
+local_bus = LocalBus()
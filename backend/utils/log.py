@@ -0,0 +1,291 @@
+# backend/utils/log.py
+import atexit
+import contextvars
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from utils.metrics import metrics
+from utils.serialization import dumps
+
+# Root level, and per-logger overrides such as "routes.applications=DEBUG,uvicorn.access=WARNING"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+
+# "json" for one object per line, "text" for reading in a terminal
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+
+# Records waiting for the writer thread; beyond this they are dropped, never waited for
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+# Longest string kept in a structured field, and in the message itself
+LOG_MAX_FIELD_LENGTH = int(os.getenv("LOG_MAX_FIELD_LENGTH", 200))
+LOG_MAX_MESSAGE_LENGTH = int(os.getenv("LOG_MAX_MESSAGE_LENGTH", 2000))
+
+# Fields whose values never reach the log
+LOG_REDACT_FIELDS = {
+    name.strip().lower()
+    for name in os.getenv("LOG_REDACT_FIELDS", "password,private_key,token,secret,authorization").split(",")
+    if name.strip()
+}
+
+# Fraction of each high-volume message kept, e.g. "application_received=0.01";
+# warnings and errors are never sampled
+DEFAULT_SAMPLE_RATES = {
+    'application_received': 0.1,
+    'application_saved': 0.1,
+    'email_sent': 0.1,
+}
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+_SAFE_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+
+# Items of a list field kept, and how deep nested fields are followed
+_MAX_ITEMS = 20
+_MAX_DEPTH = 4
+
+request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+LOG_RECORDS_DROPPED = metrics.counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full"
+)
+
+
+def _parse_rates(value: str) -> Dict[str, float]:
+    rates = dict(DEFAULT_SAMPLE_RATES)
+    for item in value.split(","):
+        name, _, rate = item.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = max(0.0, min(1.0, float(rate)))
+    return rates
+
+
+LOG_SAMPLE_RATES = _parse_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+# Attributes every LogRecord has (and uvicorn's terminal-only variant of
+# the message); anything else was passed through `extra`
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    'message', 'asctime', 'request_id', 'sample', 'taskName', 'color_message'
+}
+
+
+def _clip(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}…(+{len(text) - limit} chars)"
+
+
+def scrub(key: str, value: Any, depth: int = 0) -> Any:
+    """A log-safe copy of a field: secrets redacted, long strings and lists cut short"""
+    if key.lower() in LOG_REDACT_FIELDS:
+        return "[redacted]"
+    if value is None or isinstance(value, (bool, int, float, datetime)):
+        return value
+    if isinstance(value, str):
+        return _clip(value, LOG_MAX_FIELD_LENGTH)
+    if depth >= _MAX_DEPTH:
+        return _clip(repr(value), LOG_MAX_FIELD_LENGTH)
+    if isinstance(value, dict):
+        return {str(k): scrub(str(k), v, depth + 1) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        items = [scrub(key, item, depth + 1) for item in list(value)[:_MAX_ITEMS]]
+        if len(value) > _MAX_ITEMS:
+            items.append(f"…(+{len(value) - _MAX_ITEMS} items)")
+        return items
+    return _clip(str(value), LOG_MAX_FIELD_LENGTH)
+
+
+def _fields(record: logging.LogRecord) -> Dict[str, Any]:
+    return {key: scrub(key, value) for key, value in record.__dict__.items() if key not in _RESERVED}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg, request_id and the `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': _clip(record.getMessage(), LOG_MAX_MESSAGE_LENGTH),
+        }
+        if getattr(record, 'request_id', None):
+            entry['request_id'] = record.request_id
+        entry.update(_fields(record))
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return dumps(entry).decode("utf-8")
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with the `extra` fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        if getattr(record, 'request_id', None):
+            line += f" request_id={record.request_id}"
+        for key, value in _fields(record).items():
+            line += f" {key}={value}"
+        return line
+
+
+class _Sampler(logging.Filter):
+    """Keeps a configured fraction of records logged with extra={'sample': name}"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        name = getattr(record, 'sample', None)
+        if name is None or record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(name, 1.0)
+        if rate >= 1.0:
+            return True
+        if random.random() < rate:
+            record.sample_rate = rate
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread without formatting or blocking.
+
+    Unlike the stdlib handler it does not render the message here: the
+    record keeps its args and exception, and the listener thread formats
+    it. Only the request id is taken now, while the request's context is
+    current. A full queue drops the record and counts it.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = request_id.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+class LogPipeline:
+    """Structured, non-blocking logging for the API.
+
+    Application code logs through the standard `logging` module. Records
+    are put on a bounded queue by the calling thread (or the event loop)
+    and formatted and written to stdout by a QueueListener thread, so a
+    slow terminal or log shipper never stalls a request. Uvicorn's loggers
+    are routed through the same pipeline.
+    """
+
+    def __init__(self):
+        self.sampler = _Sampler(LOG_SAMPLE_RATES)
+        self.handler = _QueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        self.handler.addFilter(self.sampler)
+        self._listener: Optional[logging.handlers.QueueListener] = None
+
+    def _writer(self) -> logging.Handler:
+        writer = logging.StreamHandler(sys.stdout)
+        writer.setFormatter(TextFormatter() if LOG_FORMAT == "text" else JsonFormatter())
+        return writer
+
+    def _start_listener(self):
+        self._listener = logging.handlers.QueueListener(self.handler.queue, self._writer())
+        self._listener.start()
+
+    def configure(self):
+        """Install the pipeline on the root logger; safe to call more than once"""
+        if self._listener is not None:
+            return
+        root = logging.getLogger()
+        root.handlers = [self.handler]
+        root.setLevel(LOG_LEVEL)
+        for item in LOG_LEVELS.split(","):
+            name, _, level = item.partition("=")
+            if name.strip() and level.strip():
+                logging.getLogger(name.strip()).setLevel(level.strip().upper())
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers = []
+            uvicorn_logger.propagate = True
+        self._start_listener()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Write out what is still queued and stop the writer thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def reset_after_fork(self):
+        """The writer thread does not survive fork; a forked worker starts its own"""
+        if self._listener is None:
+            return
+        self.handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+        self._start_listener()
+
+    def get_stats(self) -> Dict:
+        return {
+            'level': logging.getLevelName(logging.getLogger().level),
+            'format': LOG_FORMAT,
+            'queued': self.handler.queue.qsize(),
+            'dropped': self.handler.dropped,
+            'sampled_out': self.sampler.sampled_out,
+            'sample_rates': self.sampler.rates,
+        }
+
+
+class RequestIdMiddleware:
+    """ASGI middleware giving each request an id for its log records.
+
+    A well-formed X-Request-ID from the client or proxy is kept, otherwise a
+    new one is generated; either way it is echoed on the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        incoming = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        current = incoming if incoming and _SAFE_REQUEST_ID.match(incoming) else uuid.uuid4().hex[:16]
+
+        async def send_with_id(message):
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = current
+            await send(message)
+
+        token = request_id.set(current)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id.reset(token)
+
+# Create global instance
+log_pipeline = LogPipeline()
+
+os.register_at_fork(after_in_child=log_pipeline.reset_after_fork)
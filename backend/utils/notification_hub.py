@@ -0,0 +1,90 @@
+# backend/utils/notification_hub.py
+import asyncio
+import os
+from typing import Dict, Optional, Set, Tuple
+
+from utils.conditional import Marker, notification_versions
+from utils.local_bus import local_bus
+from utils.metrics import metrics
+
+
+class Subscription:
+    """One connected client's queue of pending notification events"""
+
+    def __init__(self, key: Tuple[str, str], maxsize: int):
+        self.key = key
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def push(self, event: Dict):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client fell behind; tell it to refetch instead of buffering forever
+            self.overflowed = True
+
+
+class NotificationHub:
+    """In-process pub/sub for notification changes.
+
+    Write paths publish deltas ("created", "read", "deleted") after their
+    commit succeeds, and every client subscribed to that (user_id, user_type)
+    receives them, so open inboxes no longer have to poll.
+    """
+
+    def __init__(self):
+        self.queue_size = int(os.getenv("NOTIFICATION_STREAM_QUEUE_SIZE", 100))
+        self._subscriptions: Dict[Tuple[str, str], Set[Subscription]] = {}
+        self._stats = {'published': 0, 'delivered': 0}
+
+    def subscribe(self, user_id: str, user_type: str) -> Subscription:
+        subscription = Subscription((user_id, user_type), self.queue_size)
+        self._subscriptions.setdefault(subscription.key, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscriptions.get(subscription.key)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscriptions[subscription.key]
+
+    def publish(self, user_id: str, user_type: str, event: Dict):
+        """Deliver an event to every subscriber of a user, in every worker; must run on the event loop"""
+        marker = self.deliver(user_id, user_type, event)
+        local_bus.publish('notification', {
+            'user_id': user_id, 'user_type': user_type, 'event': event, 'marker': marker
+        })
+
+    def deliver(self, user_id: str, user_type: str, event: Dict, marker: Optional[Marker] = None) -> Marker:
+        """publish() for the subscribers connected to this process only"""
+        # Every notification change passes through here, so it also retires the list's ETag
+        marker = notification_versions.bump((user_id, user_type), marker)
+        self._stats['published'] += 1
+        for subscription in self._subscriptions.get((user_id, user_type), ()):
+            subscription.push(event)
+            self._stats['delivered'] += 1
+        return marker
+
+    def get_stats(self) -> Dict:
+        return {
+            **self._stats,
+            'users': len(self._subscriptions),
+            'subscribers': sum(len(subscribers) for subscribers in self._subscriptions.values()),
+        }
+
+# Create global instance
+notification_hub = NotificationHub()
+
+# Changes committed by other workers reach this worker's streams too
+local_bus.subscribe(
+    'notification', lambda message: notification_hub.deliver(
+        message['user_id'], message['user_type'], message['event'], message.get('marker')
+    )
+)
+
+metrics.gauge_callback(
+    "notification_stream_subscribers", "Open notification event streams",
+    lambda: notification_hub.get_stats()['subscribers']
+)
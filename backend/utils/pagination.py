@@ -0,0 +1,29 @@
+# backend/utils/pagination.py
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Tuple
+
+from fastapi import HTTPException
+
+
+def encode_page_token(created_at: datetime, doc_id: str) -> str:
+    """Build an opaque cursor from the last document of a page"""
+    payload = json.dumps({'c': created_at.isoformat(), 'id': doc_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_page_token(token: str) -> Tuple[datetime, str]:
+    """Turn a page token back into the (created_at, doc id) it was built from"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(payload['c'])
+        doc_id = str(payload['id'])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid page token")
+    
+    # Firestore timestamps are UTC; responses carry them without tzinfo
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at, doc_id
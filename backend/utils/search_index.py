@@ -0,0 +1,297 @@
+# backend/utils/search_index.py
+import asyncio
+import bisect
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from firebase.firestore import firestore_service
+from models.schemas import ApplicationSummary
+from utils.local_bus import local_bus
+from utils.metrics import metrics
+from utils.serialization import document_to_dict
+
+# Free-text answers that are tokenized for search
+TEXT_FIELDS = ('manifesto', 'qualifications', 'achievements')
+
+# Fields with an exact-match (case-insensitive) filter
+HASH_FIELDS = ('faculty', 'position', 'party', 'status', 'year_of_study')
+
+# Fields kept per application and returned by a search
+SUMMARY_FIELDS = tuple(ApplicationSummary.model_fields)
+
+# Applications read per chunk while the index is loaded from Firestore
+LOAD_CHUNK_SIZE = 500
+
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'i', 'in',
+    'is', 'it', 'my', 'of', 'on', 'or', 'our', 'that', 'the', 'their', 'this', 'to', 'was',
+    'we', 'will', 'with', 'you', 'your',
+})
+
+_WORD = re.compile(r"[^\W_]+")
+
+SortKey = Tuple[datetime, str]
+
+# Summary fields that cross the local bus as ISO strings
+_DATETIME_FIELDS = ('created_at', 'updated_at', 'reviewed_at')
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased words of a text, without stop words and single characters"""
+    if not text:
+        return []
+    return [word for word in _WORD.findall(text.casefold()) if len(word) > 1 and word not in STOP_WORDS]
+
+
+def _normalize(value) -> str:
+    return str(value).strip().casefold()
+
+
+class _IndexState:
+    """The index structures; a refresh builds a new one and swaps it in"""
+
+    def __init__(self):
+        self.docs: Dict[str, Dict] = {}
+        self.keys: Dict[str, SortKey] = {}
+        self.tokens: Dict[str, FrozenSet[str]] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        self.values: Dict[str, Dict[str, Set[str]]] = {field: defaultdict(set) for field in HASH_FIELDS}
+        self.sorted_keys: Optional[List[SortKey]] = None
+
+    def add(self, doc_id: str, summary: Dict, tokens: FrozenSet[str]):
+        self.docs[doc_id] = summary
+        self.keys[doc_id] = (summary.get('created_at') or datetime.min, doc_id)
+        self.tokens[doc_id] = tokens
+        for token in tokens:
+            self.postings[token].add(doc_id)
+        for field in HASH_FIELDS:
+            if summary.get(field) is not None:
+                self.values[field][_normalize(summary[field])].add(doc_id)
+        self.sorted_keys = None
+
+    def remove(self, doc_id: str) -> Optional[Tuple[Dict, FrozenSet[str]]]:
+        summary = self.docs.pop(doc_id, None)
+        if summary is None:
+            return None
+        del self.keys[doc_id]
+        tokens = self.tokens.pop(doc_id)
+        for token in tokens:
+            _discard(self.postings, token, doc_id)
+        for field in HASH_FIELDS:
+            if summary.get(field) is not None:
+                _discard(self.values[field], _normalize(summary[field]), doc_id)
+        self.sorted_keys = None
+        return summary, tokens
+
+    def ordered(self) -> List[SortKey]:
+        if self.sorted_keys is None:
+            self.sorted_keys = sorted(self.keys.values())
+        return self.sorted_keys
+
+
+def _discard(index: Dict[str, Set[str]], key: str, doc_id: str):
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(doc_id)
+        if not ids:
+            del index[key]
+
+
+def _entry(data: Dict) -> Tuple[Dict, FrozenSet[str]]:
+    summary = {field: data.get(field) for field in SUMMARY_FIELDS}
+    tokens = frozenset(token for field in TEXT_FIELDS for token in tokenize(data.get(field)))
+    return summary, tokens
+
+
+def _parse_datetimes(data: Dict) -> Dict:
+    parsed = dict(data)
+    for field in _DATETIME_FIELDS:
+        if isinstance(parsed.get(field), str):
+            parsed[field] = datetime.fromisoformat(parsed[field])
+    return parsed
+
+
+class ApplicationIndex:
+    """In-process search index over candidate applications.
+
+    Holds an inverted index over the free-text answers, exact-match indexes
+    on the filterable fields, and a summary of each application so results
+    need no Firestore reads. It is loaded from Firestore once per worker and
+    kept current by the write paths calling upsert/update, which also reach
+    the other workers over the local bus; a periodic refresh picks up writes
+    made on other hosts. Changes made while a refresh is reading are
+    replayed onto the new index before it is swapped in.
+    """
+
+    def __init__(self):
+        self._state = _IndexState()
+        self._lock = threading.Lock()
+        self._journal: Optional[List[Tuple[str, str, Dict]]] = None
+        self._loading: Optional[asyncio.Future] = None
+        self._refreshing: Optional[asyncio.Lock] = None
+        self.loaded_at: Optional[float] = None
+        self._stats = {
+            'searches': 0, 'upserts': 0, 'updates': 0, 'remote_changes': 0, 'refreshes': 0,
+            'last_refresh_seconds': 0.0,
+        }
+
+    async def ensure_loaded(self):
+        """Load the index unless it already is; concurrent callers share one load"""
+        if self.loaded_at is not None:
+            return
+        if self._loading is None or self._loading.done():
+            self._loading = asyncio.ensure_future(self.refresh())
+        await asyncio.shield(self._loading)
+
+    async def refresh(self):
+        """Rebuild the index from Firestore and swap it in"""
+        if self._refreshing is None:
+            self._refreshing = asyncio.Lock()
+        async with self._refreshing:
+            await self._rebuild()
+
+    async def _rebuild(self):
+        started = time.perf_counter()
+        fresh = _IndexState()
+        with self._lock:
+            self._journal = []
+
+        def add_chunk(rows: List[Dict]):
+            for data in rows:
+                fresh.add(data['id'], *_entry(data))
+
+        loop = asyncio.get_running_loop()
+        query = firestore_service.collection('candidate_applications') \
+            .select(tuple(dict.fromkeys(SUMMARY_FIELDS + TEXT_FIELDS)))
+        try:
+            rows = []
+            async for doc in firestore_service.stream_query(query, chunk_size=LOAD_CHUNK_SIZE):
+                rows.append(document_to_dict(doc))
+                if len(rows) >= LOAD_CHUNK_SIZE:
+                    # Tokenizing is CPU work; keep it off the event loop
+                    await loop.run_in_executor(None, add_chunk, rows)
+                    rows = []
+            await loop.run_in_executor(None, add_chunk, rows)
+            fresh.ordered()
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            for operation, doc_id, data in self._journal:
+                self._apply(fresh, operation, doc_id, data)
+            self._journal = None
+            self._state = fresh
+            self.loaded_at = time.time()
+            self._stats['refreshes'] += 1
+            self._stats['last_refresh_seconds'] = round(time.perf_counter() - started, 4)
+
+    def _apply(self, state: _IndexState, operation: str, doc_id: str, data: Dict):
+        if operation == 'upsert':
+            state.remove(doc_id)
+            state.add(doc_id, data['summary'], frozenset(data['tokens']))
+        elif operation == 'update':
+            previous = state.remove(doc_id)
+            if previous is not None:
+                summary, tokens = previous
+                state.add(doc_id, {**summary, **{k: v for k, v in data.items() if k in SUMMARY_FIELDS}}, tokens)
+
+    def _change(self, operation: str, doc_id: str, data: Dict):
+        with self._lock:
+            self._apply(self._state, operation, doc_id, data)
+            if self._journal is not None:
+                self._journal.append((operation, doc_id, data))
+            self._stats[f"{operation}s"] += 1
+
+    def upsert(self, doc_id: str, data: Dict):
+        """Index a whole application, replacing any previous version, in every worker"""
+        # Peers get the summary and tokens rather than the long answers
+        summary, tokens = _entry({**data, 'id': doc_id})
+        entry = {'summary': summary, 'tokens': sorted(tokens)}
+        self._change('upsert', doc_id, entry)
+        local_bus.publish('application_index', {'operation': 'upsert', 'id': doc_id, 'data': entry})
+
+    def update(self, doc_id: str, changes: Dict):
+        """Apply changed summary fields (e.g. a review decision) to an indexed application, in every worker"""
+        self._change('update', doc_id, changes)
+        local_bus.publish('application_index', {'operation': 'update', 'id': doc_id, 'data': changes})
+
+    def receive(self, message: Dict):
+        """Apply a change published by another worker to this process's index only"""
+        data = message['data']
+        if message['operation'] == 'upsert':
+            data = {**data, 'summary': _parse_datetimes(data['summary'])}
+        else:
+            data = _parse_datetimes(data)
+        self._change(message['operation'], message['id'], data)
+        with self._lock:
+            self._stats['remote_changes'] += 1
+
+    def search(self, text: Optional[str] = None, filters: Optional[Dict[str, Optional[str]]] = None,
+               limit: int = 20, after: Optional[SortKey] = None) -> Tuple[List[Dict], int, Optional[SortKey]]:
+        """Matching applications, newest first.
+
+        Every word of `text` must appear in the answers; the last word also
+        matches longer words it prefixes. Returns the page of summaries, the
+        total number of matches and the key of the last result when more follow.
+        """
+        with self._lock:
+            state = self._state
+            self._stats['searches'] += 1
+
+            candidate_sets = []
+            for field, value in (filters or {}).items():
+                if value is not None:
+                    candidate_sets.append(state.values[field].get(_normalize(value), set()))
+
+            terms = tokenize(text)
+            if terms:
+                for term in terms[:-1]:
+                    candidate_sets.append(state.postings.get(term, set()))
+                last = terms[-1]
+                prefixed = [ids for token, ids in state.postings.items() if token.startswith(last)]
+                candidate_sets.append(set().union(*prefixed))
+
+            if candidate_sets:
+                candidate_sets.sort(key=len)
+                candidates = set(candidate_sets[0])
+                for ids in candidate_sets[1:]:
+                    if not candidates:
+                        break
+                    candidates &= ids
+                keys = sorted(state.keys[doc_id] for doc_id in candidates)
+            else:
+                keys = state.ordered()
+
+            # Keys ascend, so the newest page ends just before the cursor
+            end = bisect.bisect_left(keys, after) if after else len(keys)
+            page = keys[max(0, end - limit):end][::-1]
+            results = [dict(state.docs[doc_id]) for _, doc_id in page]
+            next_key = page[-1] if end > limit else None
+            return results, len(keys), next_key
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                'documents': len(self._state.docs),
+                'terms': len(self._state.postings),
+                'loaded': self.loaded_at is not None,
+                'loaded_at': self.loaded_at,
+            }
+
+# Create global instance
+application_index = ApplicationIndex()
+
+# Submissions and reviews handled by other workers reach this worker's index too
+local_bus.subscribe('application_index', application_index.receive)
+
+metrics.gauge_callback(
+    "application_index_documents", "Applications held by the in-process search index",
+    lambda: application_index.get_stats()['documents']
+)
@@ -0,0 +1,79 @@
+# backend/utils/serialization.py
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Responses smaller than this are sent uncompressed
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 5))
+
+
+def document_to_dict(doc, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Turn a Firestore snapshot into a response-ready dict.
+
+    Timestamps are sent without tzinfo, as the response models always did,
+    and `id` comes from the document name. With `fields`, only those keys
+    are kept (missing ones as None), which shapes trusted Firestore data the
+    way a response model would without validating it a second time.
+    """
+    data = doc.to_dict() or {}
+    if fields is not None:
+        data = {field: data.get(field) for field in fields}
+    for key, value in data.items():
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            data[key] = value.replace(tzinfo=None)
+    data['id'] = doc.id
+    return data
+
+
+def _default(value: Any) -> Any:
+    # Firestore returns a datetime subclass, which orjson does not encode natively
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return jsonable_encoder(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode already-shaped content as compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for content that needs no further validation.
+
+    Routes return it directly, so FastAPI skips the response_model pass;
+    the model is still declared on the route for the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZip large responses, but never Server-Sent Event streams.
+
+    The gzip responder buffers streamed bodies, which would hold events back
+    until enough of them piled up.
+    """
+
+    def __init__(self, app):
+        super().__init__(app, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_LEVEL)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "text/event-stream" in Headers(scope=scope).get("accept", ""):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,319 @@
+# backend/utils/submission_journal.py
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from utils.local_bus import local_bus
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SUBMISSIONS_JOURNALED = metrics.counter(
+    "submissions_journaled_total", "Submissions accepted into the local journal"
+)
+SUBMISSIONS_DRAINED = metrics.counter(
+    "submissions_drained_total", "Journaled submissions by drain outcome", ("outcome",)
+)
+
+# Drain handler: takes pending entries, returns an error message per id (None when committed)
+DrainHandler = Callable[[List[Dict]], Awaitable[Dict[str, Optional[str]]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    accepted_at REAL NOT NULL,
+    committed_at REAL
+);
+CREATE INDEX IF NOT EXISTS submissions_by_state ON submissions (state, seq);
+"""
+
+
+class SubmissionJournal:
+    """Local durable queue for accept-and-queue submissions.
+
+    With SUBMISSION_MODE=journal the submit route appends the application to
+    a SQLite database in WAL mode and answers 202 at once; a drainer task
+    hands pending entries to the handler registered by the routes, which
+    commits them to Firestore in batches. Entries stay pending until the
+    handler confirms them, so anything accepted before a crash or restart
+    is replayed on the next start. Entries that keep failing are marked
+    failed after `max_attempts` and stay visible on the status endpoint.
+
+    All SQLite access runs on one dedicated thread, off the event loop.
+    Several workers can share the journal: each appends to it, and whichever
+    holds the drain lock (a flock next to the database, released when its
+    process exits) is the only one that drains.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("SUBMISSION_MODE", "sync").lower() == "journal"
+        self.path = os.getenv("SUBMISSION_JOURNAL_PATH", "submission_journal.db")
+        # NORMAL survives process crashes in WAL mode; FULL also survives power loss
+        self.synchronous = os.getenv("SUBMISSION_JOURNAL_SYNC", "NORMAL").upper()
+        self.batch_size = int(os.getenv("SUBMISSION_DRAIN_BATCH", 80))
+        self.idle_interval = float(os.getenv("SUBMISSION_DRAIN_INTERVAL", 1.0))
+        self.max_attempts = int(os.getenv("SUBMISSION_MAX_ATTEMPTS", 10))
+        self.backoff_max = float(os.getenv("SUBMISSION_DRAIN_BACKOFF_MAX", 60.0))
+        # Committed entries are kept this long for the status endpoint, then purged
+        self.retention_hours = float(os.getenv("SUBMISSION_JOURNAL_RETENTION_HOURS", 24))
+
+        self.handler: Optional[DrainHandler] = None
+        self.pending_count = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._io: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drainer: Optional[asyncio.Task] = None
+        self._drain_lock = None
+        self._stats = {'accepted': 0, 'committed': 0, 'failed': 0, 'retried': 0, 'replayed': 0}
+
+    def set_handler(self, handler: DrainHandler):
+        """Register the coroutine that commits journaled submissions"""
+        self.handler = handler
+
+    def _connect(self) -> sqlite3.Connection:
+        # Other workers may hold the write lock briefly, so wait for it instead of failing
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _execute(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _try_drain_lock(self) -> bool:
+        if self._drain_lock is not None:
+            return True
+        lock = open(f"{self.path}.drain.lock", "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return False
+        self._drain_lock = lock
+        logger.info("Worker %d is draining the submission journal", os.getpid())
+        return True
+
+    def _count_pending(self) -> int:
+        return self._execute("SELECT COUNT(*) FROM submissions WHERE state = 'pending'")[0][0]
+
+    async def _run(self, fn: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._io, fn, *args)
+
+    async def start(self):
+        """Open the journal and start draining, replaying whatever is still pending"""
+        if not self.enabled or self._drainer is not None:
+            return
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="submission-journal")
+        self._conn = await self._run(self._connect)
+        self.pending_count = await self._run(self._count_pending)
+        self._stats['replayed'] = self.pending_count
+        self._wakeup = asyncio.Event()
+        self._drainer = asyncio.create_task(self._drain_loop(), name="submission-drainer")
+        logger.info("Submission journal open at %s with %d pending submissions", self.path, self.pending_count)
+
+    async def stop(self, drain_timeout: float = 10.0):
+        """Give pending submissions a chance to commit, then close the journal"""
+        if self._drainer is None:
+            return
+        deadline = time.monotonic() + drain_timeout
+        while self._drain_lock is not None and self.pending_count and not self._drainer.done() \
+                and time.monotonic() < deadline:
+            self._wakeup.set()
+            await asyncio.sleep(0.05)
+        if self._drain_lock is not None and self.pending_count:
+            logger.warning("Submission journal stopped with %d pending; they replay on next start", self.pending_count)
+
+        self._drainer.cancel()
+        await asyncio.gather(self._drainer, return_exceptions=True)
+        self._drainer = None
+        await self._run(self._conn.close)
+        self._conn = None
+        self._io.shutdown(wait=True)
+        self._io = None
+        if self._drain_lock is not None:
+            self._drain_lock.close()
+            self._drain_lock = None
+
+    def _append(self, entry_id: str, payload: str, accepted_at: float):
+        self._execute(
+            "INSERT INTO submissions (id, payload, accepted_at) VALUES (?, ?, ?)",
+            (entry_id, payload, accepted_at)
+        )
+
+    async def append(self, entry_id: str, payload: Dict) -> float:
+        """Durably record a submission for the drainer; returns its acceptance time"""
+        accepted_at = time.time()
+        await self._run(self._append, entry_id, json.dumps(payload), accepted_at)
+        self.pending_count += 1
+        self._stats['accepted'] += 1
+        SUBMISSIONS_JOURNALED.inc()
+        self.wake()
+        local_bus.publish('submission_journal', {})
+        return accepted_at
+
+    def _pending(self, limit: int) -> List[Dict]:
+        rows = self._execute(
+            "SELECT id, payload, attempts, accepted_at FROM submissions "
+            "WHERE state = 'pending' ORDER BY seq LIMIT ?",
+            (limit,)
+        )
+        return [
+            {'id': entry_id, 'payload': json.loads(payload), 'attempts': attempts, 'accepted_at': accepted_at}
+            for entry_id, payload, attempts, accepted_at in rows
+        ]
+
+    def _record(self, entries: List[Dict], outcomes: Dict[str, Optional[str]]) -> Dict[str, int]:
+        """Store drain outcomes in one transaction; counts per outcome"""
+        counts = {'committed': 0, 'retried': 0, 'failed': 0}
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                for entry in entries:
+                    error = outcomes.get(entry['id'], "No outcome reported")
+                    if error is None:
+                        counts['committed'] += 1
+                        self._conn.execute(
+                            "UPDATE submissions SET state = 'committed', error = NULL, committed_at = ? WHERE id = ?",
+                            (now, entry['id'])
+                        )
+                        continue
+                    state = 'failed' if entry['attempts'] + 1 >= self.max_attempts else 'pending'
+                    counts['failed' if state == 'failed' else 'retried'] += 1
+                    self._conn.execute(
+                        "UPDATE submissions SET state = ?, attempts = attempts + 1, error = ? WHERE id = ?",
+                        (state, error, entry['id'])
+                    )
+                if self.retention_hours > 0:
+                    self._conn.execute(
+                        "DELETE FROM submissions WHERE state = 'committed' AND committed_at < ?",
+                        (now - self.retention_hours * 3600,)
+                    )
+        return counts
+
+    async def drain_once(self) -> Dict[str, int]:
+        """Hand one batch of pending submissions to the handler and record the outcome"""
+        entries = await self._run(self._pending, self.batch_size)
+        if not entries:
+            return {'committed': 0, 'retried': 0, 'failed': 0}
+        try:
+            outcomes = await self.handler(entries)
+        except Exception as e:
+            outcomes = {entry['id']: str(e) for entry in entries}
+
+        counts = await self._run(self._record, entries, outcomes)
+        self.pending_count -= counts['committed'] + counts['failed']
+        for outcome, count in counts.items():
+            self._stats[outcome] += count
+            if count:
+                SUBMISSIONS_DRAINED.inc(count, outcome=outcome)
+        return counts
+
+    def wake(self):
+        """Have the drainer look for pending submissions now rather than at its next poll"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _wait(self):
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.idle_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _drain_loop(self):
+        failures = 0
+        while True:
+            if not await self._run(self._try_drain_lock):
+                # Another worker drains; keep the pending count current for /health
+                self.pending_count = await self._run(self._count_pending)
+                await self._wait()
+                continue
+            try:
+                counts = await self.drain_once()
+            except Exception as e:
+                logger.warning("Submission drain failed: %s", e)
+                counts = {'committed': 0, 'retried': 1, 'failed': 0}
+
+            if counts['retried'] and not counts['committed']:
+                # Firestore is struggling; back off before the next attempt
+                failures += 1
+                await asyncio.sleep(min(2 ** failures, self.backoff_max))
+                continue
+            failures = 0
+            if counts['committed'] or counts['failed']:
+                continue
+            await self._wait()
+
+    def _entry_status(self, entry_id: str) -> Optional[Dict]:
+        rows = self._execute(
+            "SELECT id, state, attempts, error, accepted_at, committed_at FROM submissions WHERE id = ?",
+            (entry_id,)
+        )
+        if not rows:
+            return None
+        entry_id, state, attempts, error, accepted_at, committed_at = rows[0]
+        return {
+            'application_id': entry_id,
+            'state': state,
+            'attempts': attempts,
+            'error': error,
+            'accepted_at': accepted_at,
+            'committed_at': committed_at,
+        }
+
+    async def get(self, entry_id: str) -> Optional[Dict]:
+        """Journal state of one submission, or None if it is unknown (or long since purged)"""
+        return await self._run(self._entry_status, entry_id)
+
+    def _summary(self, limit: int) -> Dict:
+        counts = dict(self._execute("SELECT state, COUNT(*) FROM submissions GROUP BY state"))
+        oldest = self._execute("SELECT MIN(accepted_at) FROM submissions WHERE state = 'pending'")[0][0]
+        listed = self._execute(
+            "SELECT id FROM submissions WHERE state != 'committed' ORDER BY seq LIMIT ?", (limit,)
+        )
+        return {
+            'pending': counts.get('pending', 0),
+            'committed': counts.get('committed', 0),
+            'failed': counts.get('failed', 0),
+            'oldest_pending_seconds': round(time.time() - oldest, 3) if oldest else None,
+            'entries': [self._entry_status(entry_id) for (entry_id,) in listed],
+        }
+
+    async def get_status(self, limit: int = 100) -> Dict:
+        """Counts per state and the oldest pending or failed entries"""
+        return await self._run(self._summary, limit)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self._stats,
+            'enabled': self.enabled,
+            'pending': self.pending_count,
+            'draining': self._drain_lock is not None,
+        }
+
+# Create global instance
+submission_journal = SubmissionJournal()
+
+# A submission accepted by another worker wakes this worker's drainer
+local_bus.subscribe('submission_journal', lambda message: submission_journal.wake())
+
+metrics.gauge_callback(
+    "submission_journal_pending", "Journaled submissions not yet committed to Firestore",
+    lambda: submission_journal.pending_count
+)
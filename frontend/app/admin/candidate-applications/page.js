@@ -26,7 +26,8 @@ export default function CandidateApplications() {
   const fetchApplications = async () => {
     try {
       setLoading(true);
-      const response = await fetch('http://localhost:8000/api/candidate-applications');
+      // The list only needs the summary; full answers are loaded when an application is opened
+      const response = await fetch('http://localhost:8000/api/candidate-applications?view=summary');
       
       if (response.ok) {
         const data = await response.json();
@@ -41,6 +42,20 @@ export default function CandidateApplications() {
     }
   };
 
+  const openApplication = async (applicationId) => {
+    try {
+      const response = await fetch(`http://localhost:8000/api/candidate-applications/${applicationId}`);
+
+      if (response.ok) {
+        setSelectedApplication(await response.json());
+      } else {
+        console.error('Failed to fetch application');
+      }
+    } catch (error) {
+      console.error('Error fetching application:', error);
+    }
+  };
+
   const updateApplicationStatus = async (applicationId, status, rejectionReason = '') => {
     try {
       const response = await fetch(`http://localhost:8000/api/candidate-applications/${applicationId}`, {
@@ -206,12 +221,6 @@ export default function CandidateApplications() {
                             <p>{new Date(application.created_at).toLocaleDateString()}</p>
                           </div>
                         </div>
-                        {application.campaign_promise && (
-                          <div className="mt-2">
-                            <span className="font-medium text-sm">Campaign Promise:</span>
-                            <p className="text-sm text-gray-600 line-clamp-1">{application.campaign_promise}</p>
-                          </div>
-                        )}
                       </div>
                     </div>
                   </div>
@@ -219,7 +228,7 @@ export default function CandidateApplications() {
                   {/* Actions */}
                   <div className="flex gap-2">
                     <button
-                      onClick={() => setSelectedApplication(application)}
+                      onClick={() => openApplication(application.id)}
                       className="flex items-center gap-2 px-4 py-2 bg-blue-500 text-white rounded-lg hover:bg-blue-600 transition-colors"
                     >
                       <FaEye className="text-sm" />
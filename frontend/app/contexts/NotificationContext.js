@@ -5,6 +5,9 @@ import { useAuth } from './AuthContext';
 
 const NotificationContext = createContext();
 
+// Notifications loaded into the inbox
+const PAGE_SIZE = 50;
+
 export function useNotifications() {
   return useContext(NotificationContext);
 }
@@ -33,14 +36,19 @@ export function NotificationProvider({ children }) {
       const userType = userData.role === 'admin' || userData.role === 'officer' ? 'admin' : 'student';
       const userId = userData.role === 'admin' ? 'admin' : userData.studentId;
       
-      const response = await fetch(`http://localhost:8000/api/notifications/${userId}?user_type=${userType}`);
+      // Only the latest page is loaded; the unread count comes from the server counter
+      const [response, countResponse] = await Promise.all([
+        fetch(`http://localhost:8000/api/notifications/${userId}?user_type=${userType}&limit=${PAGE_SIZE}`),
+        fetch(`http://localhost:8000/api/notifications/${userId}/unread-count?user_type=${userType}`)
+      ]);
       
       if (response.ok) {
         const data = await response.json();
         setNotifications(data);
         
-        // Calculate unread count
-        const unread = data.filter(notif => !notif.is_read).length;
+        const unread = countResponse.ok
+          ? (await countResponse.json()).unread_count
+          : data.filter(notif => !notif.is_read).length;
         setUnreadCount(unread);
         
         // Play sound if new notifications arrived
@@ -69,7 +77,7 @@ export function NotificationProvider({ children }) {
             notif.id === notificationId ? { ...notif, is_read: true } : notif
           )
         );
-        setUnreadCount(prev => Math.max(0, prev - 1));
+        // The unread count follows the stream's "read" event, so other tabs stay in step
       }
     } catch (error) {
       console.error('Error marking notification as read:', error);
@@ -79,16 +87,14 @@ export function NotificationProvider({ children }) {
   // Mark all as read
   const markAllAsRead = async () => {
     try {
-      const unreadNotifications = notifications.filter(notif => !notif.is_read);
+      const userType = userData.role === 'admin' || userData.role === 'officer' ? 'admin' : 'student';
+      const userId = userData.role === 'admin' ? 'admin' : userData.studentId;
       
-      // Mark each unread notification as read
-      await Promise.all(
-        unreadNotifications.map(notif => 
-          fetch(`http://localhost:8000/api/notifications/${notif.id}/read`, {
-            method: 'PUT'
-          })
-        )
-      );
+      // One request marks every unread notification, including ones not loaded yet
+      const response = await fetch(`http://localhost:8000/api/notifications/${userId}/read-all?user_type=${userType}`, {
+        method: 'PUT'
+      });
+      if (!response.ok) return;
       
       // Update local state
       setNotifications(prev => 
@@ -108,27 +114,68 @@ export function NotificationProvider({ children }) {
       });
       
       if (response.ok) {
-        const wasUnread = notifications.find(notif => notif.id === notificationId && !notif.is_read);
+        // The unread count follows the stream's "deleted" event
         setNotifications(prev => prev.filter(notif => notif.id !== notificationId));
-        if (wasUnread) {
-          setUnreadCount(prev => Math.max(0, prev - 1));
-        }
       }
     } catch (error) {
       console.error('Error deleting notification:', error);
     }
   };
 
-  // Poll for new notifications (real-time updates)
+  // Receive notification changes pushed by the backend (real-time updates)
   useEffect(() => {
-    if (!currentUser) return;
+    if (!currentUser || !userData) return;
     
     fetchNotifications(); // Initial fetch
     
-    // Set up polling every 30 seconds
-    const interval = setInterval(fetchNotifications, 30000);
+    const userType = userData.role === 'admin' || userData.role === 'officer' ? 'admin' : 'student';
+    const userId = userData.role === 'admin' ? 'admin' : userData.studentId;
+    
+    let interval = null;
+    const source = new EventSource(`http://localhost:8000/api/notifications/${userId}/stream?user_type=${userType}`);
+    
+    source.addEventListener('ready', (e) => {
+      setUnreadCount(JSON.parse(e.data).unread_count);
+    });
+    
+    source.addEventListener('created', (e) => {
+      const { notification } = JSON.parse(e.data);
+      setNotifications(prev => [notification, ...prev.filter(notif => notif.id !== notification.id)]);
+      setUnreadCount(prev => prev + 1);
+      playNotificationSound();
+    });
+    
+    source.addEventListener('read', (e) => {
+      const { id, was_unread } = JSON.parse(e.data);
+      setNotifications(prev => 
+        prev.map(notif => notif.id === id ? { ...notif, is_read: true } : notif)
+      );
+      if (was_unread) {
+        setUnreadCount(prev => Math.max(0, prev - 1));
+      }
+    });
+    
+    source.addEventListener('deleted', (e) => {
+      const { id, was_unread } = JSON.parse(e.data);
+      setNotifications(prev => prev.filter(notif => notif.id !== id));
+      if (was_unread) {
+        setUnreadCount(prev => Math.max(0, prev - 1));
+      }
+    });
+    
+    source.addEventListener('resync', fetchNotifications);
+    
+    // Fall back to polling every 30 seconds if the stream is unavailable
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED && !interval) {
+        interval = setInterval(fetchNotifications, 30000);
+      }
+    };
     
-    return () => clearInterval(interval);
+    return () => {
+      source.close();
+      if (interval) clearInterval(interval);
+    };
   }, [currentUser, userData]);
 
   const value = {